@@ -0,0 +1,233 @@
+"""
+Deterministic, seeded anomaly generation.
+
+Every save has an anomaly_seed. The anomalies of a system during a 48-hour
+epoch are generated from random.Random(f"{seed}:{system}:{epoch}"), so they
+can be regenerated on demand instead of being stored: the save only keeps
+what the player changed (scanned, visited, asteroids being mined...), the
+far ends of wormholes and tombstones for anomalies that were mined out.
+It also means any system's anomalies can be previewed without storing them.
+
+An epoch spawns WAVES waves of anomalies, one every 12 hours, each lasting
+its duration (48 hours, two weeks for rare wormholes) from the time it
+spawned, so a system's anomalies at a given time come from the current epoch
+and the few before it.
+
+Generated anomalies carry an "id" ("<epoch>:<wave>:<index>"). Anomalies
+without one (saves from before seeding, wormhole far ends) are stored whole.
+"""
+import random
+from time import time
+from uuid import UUID
+
+EPOCH = 48 * 3600
+WAVES = 4
+WAVE_INTERVAL = EPOCH // WAVES
+MAX_ANOMALIES = 12
+LONGEST_DURATION = 14 * 24 * 3600
+
+# Fields every generated anomaly gets from its seed, and the state it starts in
+DERIVED_FIELDS = ("type", "timestamp", "duration", "wormhole_id", "is_origin", "destination_system")
+INITIAL_STATE = {"visited": False, "scanned": False}
+
+# Anomaly spawn counts by security level
+ANOMALY_COUNTS = {
+    "Secure": (1, 2),
+    "Contested": (2, 3),
+    "Unsecure": (2, 4),
+    "Wild": (3, 6),
+}
+
+# Common: 50% chance, Uncommon: 30% chance, Rare: 15% chance, Very Rare: 5% chance
+RARITY_WEIGHTS = {
+    "Common": 50,
+    "Uncommon": 30,
+    "Rare": 15,
+    "VeryRare": 5
+}
+
+# Anomaly rarities (applies to all security levels where they can spawn)
+ANOMALY_RARITIES = {
+    "AT": "Common",
+    "BF": "Common",
+    "AL": "Uncommon",
+    "CM": "Uncommon",
+    "DH": "Uncommon",
+    "SP": "Uncommon",
+    "MT": "Uncommon",
+    "AA": "Rare",
+    "FO": "Rare",
+    "AN": "Rare",
+    "VX": "VeryRare"
+}
+
+# Which anomalies can appear in each security level
+SECURITY_ANOMALIES = {
+    "Secure": ["AT", "AL", "CM", "BF", "SP", "WH"],
+    "Contested": ["AT", "AL", "AA", "CM", "BF", "DH", "SP", "MT"],
+    "Unsecure": ["AT", "AL", "AA", "CM", "BF", "DH", "SP", "MT", "WH"],
+    "Wild": ["AT", "AL", "AA", "AN", "VX", "CM", "BF", "DH", "SP", "MT", "FO", "WH"],
+}
+
+# Wormhole rarity varies by security
+WORMHOLE_RARITY = {
+    "Wild": "Uncommon",
+    "Unsecure": "Rare",
+    "Secure": "VeryRare",
+}
+
+
+def _weighted_pool(system_security):
+    pool = []
+    for anomaly_type in SECURITY_ANOMALIES.get(system_security, []):
+        if anomaly_type == "WH":
+            rarity = WORMHOLE_RARITY[system_security]
+        else:
+            rarity = ANOMALY_RARITIES.get(anomaly_type, "Common")
+        pool.extend([anomaly_type] * RARITY_WEIGHTS[rarity])
+    return pool
+
+
+POOLS = {security: _weighted_pool(security) for security in SECURITY_ANOMALIES}
+
+
+def new_seed():
+    """A fresh anomaly seed for a new (or upgraded) save"""
+    return random.SystemRandom().getrandbits(63)
+
+
+def epoch_of(timestamp):
+    return int(timestamp // EPOCH)
+
+
+def generate_anomalies(system_name, system_security, rng=random, timestamp=None):
+    """Generate random anomalies for a star system based on security level
+
+    Args:
+        system_name: Name of the system to generate anomalies for
+        system_security: Security level of the system
+        rng: Random source (the global random module, or a seeded random.Random)
+        timestamp: Spawn time of the anomalies (defaults to now)
+    """
+    if timestamp is None:
+        timestamp = time()
+    pool = POOLS.get(system_security)
+    if not pool:
+        return []
+
+    anomalies = []
+    for _ in range(rng.randint(*ANOMALY_COUNTS[system_security])):
+        anomaly_type = rng.choice(pool)
+
+        # 5% chance for 2-week wormhole, 95% chance for 48-hour wormhole
+        if anomaly_type == "WH" and rng.random() < 0.05:
+            duration = LONGEST_DURATION
+        else:
+            duration = 48 * 3600
+
+        anomaly = {
+            "type": anomaly_type,
+            "visited": False,
+            "scanned": False,
+            "timestamp": timestamp,
+            "duration": duration,
+        }
+        if anomaly_type == "WH":
+            anomaly["wormhole_id"] = str(UUID(int=rng.getrandbits(128), version=4))
+            anomaly["is_origin"] = True  # This is the origin end
+            anomaly["destination_system"] = None  # Set by the caller (or AnomalySeeder)
+        anomalies.append(anomaly)
+    return anomalies
+
+
+class AnomalySeeder:
+    """Generates, compacts and expands a save's seeded anomalies
+
+    Args:
+        systems: The system_data.json dict ({name: {"SecurityLevel": ...}})
+    """
+
+    def __init__(self, systems):
+        self.security = {name: system.get("SecurityLevel", "Secure") for name, system in systems.items()}
+        # Wormholes never lead into Core systems
+        self.destinations = [name for name, security in self.security.items() if security != "Core"]
+
+    def epoch_anomalies(self, seed, system, epoch):
+        """All anomalies a system spawns during one epoch, in spawn order"""
+        security = self.security.get(system)
+        if security not in POOLS:
+            return []
+        rng = random.Random(f"{seed}:{system}:{epoch}")
+        anomalies = []
+        for wave in range(WAVES):
+            spawned = generate_anomalies(system, security, rng, epoch * EPOCH + wave * WAVE_INTERVAL)
+            for index, anomaly in enumerate(spawned):
+                anomaly["id"] = f"{epoch}:{wave}:{index}"
+                if anomaly["type"] == "WH":
+                    destination = rng.choice(self.destinations)
+                    while destination == system:
+                        destination = rng.choice(self.destinations)
+                    anomaly["destination_system"] = destination
+            anomalies.extend(spawned)
+        return anomalies
+
+    def anomalies_at(self, seed, system, now):
+        """Anomalies present in a system at a given time (up to MAX_ANOMALIES, oldest first)
+
+        Nothing is stored, so this also serves to preview distant systems.
+        """
+        first = epoch_of(now - LONGEST_DURATION)
+        present = [
+            anomaly
+            for epoch in range(first, epoch_of(now) + 1)
+            for anomaly in self.epoch_anomalies(seed, system, epoch)
+            if anomaly["timestamp"] <= now < anomaly["timestamp"] + anomaly["duration"]
+        ]
+        return present[:MAX_ANOMALIES]
+
+    def compact(self, anomalies):
+        """Stored form of an anomaly map: seeded anomalies shrink to the state the player changed
+
+        Seeded anomalies the player hasn't touched are dropped entirely; they
+        are regenerated when the system is next visited.
+        """
+        stored = {}
+        for system, entries in anomalies.items():
+            kept = []
+            for anomaly in entries:
+                if "id" not in anomaly:
+                    kept.append(anomaly)
+                    continue
+                delta = {key: value for key, value in anomaly.items()
+                         if key not in DERIVED_FIELDS and INITIAL_STATE.get(key, INITIAL_STATE) != value}
+                if len(delta) > 1:
+                    kept.append(delta)
+            if kept:
+                stored[system] = kept
+        return stored
+
+    def expand(self, seed, anomalies):
+        """Rebuild full anomalies from a compacted map, in place
+
+        Deltas whose anomaly can no longer be generated (the system data
+        changed) are dropped.
+        """
+        for system, entries in list(anomalies.items()):
+            generated = {}
+            expanded = []
+            for entry in entries:
+                if "id" not in entry or "type" in entry:
+                    expanded.append(entry)
+                    continue
+                epoch = int(entry["id"].split(":", 1)[0])
+                if epoch not in generated:
+                    generated[epoch] = {a["id"]: a for a in self.epoch_anomalies(seed, system, epoch)}
+                anomaly = generated[epoch].get(entry["id"])
+                if anomaly is not None:
+                    anomaly.update(entry)
+                    expanded.append(anomaly)
+            if expanded:
+                anomalies[system] = expanded
+            else:
+                del anomalies[system]
+        return anomalies
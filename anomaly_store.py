@@ -0,0 +1,196 @@
+"""
+Expiry-indexed anomaly store.
+
+Anomalies live in the save as {system: [anomaly, ...]} and each one expires
+at timestamp + duration. Checking expiry system by system only cleans up the
+systems the player comes back to, so anomalies (and wormhole pairs) in every
+other system stayed in the save forever and the save kept growing.
+
+AnomalyStore indexes the save's anomalies in one min-heap ordered by expiry
+time across all systems. evict_expired() pops only what has expired, so each
+anomaly costs O(log n) once over its lifetime, and a call with nothing to do
+is a single comparison. Anomalies removed some other way (a depleted asteroid
+field, for instance) leave a stale heap entry that is skipped when it comes up.
+
+Scanned systems are kept in a set next to the save's scanned_systems list, so
+"has this system been scanned?" no longer searches the list.
+
+Seeded anomalies (see anomaly_seed) that were mined out leave a tombstone in
+data["cleared_anomalies"] ({system: {id: expiry}}) so they aren't generated
+again; tombstones go through the same heap and are dropped when they expire.
+
+The store works on data["anomalies"], data["wormhole_pairs"],
+data["scanned_systems"] and data["cleared_anomalies"] in place.
+"""
+import heapq
+from itertools import count
+from time import time
+
+DEFAULT_DURATION = 48 * 3600
+
+
+def expires_at(anomaly):
+    """Time an anomaly expires, or None for anomalies without a timestamp (they never expire)"""
+    timestamp = anomaly.get("timestamp")
+    if timestamp is None:
+        return None
+    return timestamp + anomaly.get("duration", DEFAULT_DURATION)
+
+
+class AnomalyStore:
+    """Expiry heap and scanned-system set over one save's anomalies
+
+    Call bind(data) before use; it reindexes only when a different save dict
+    (or a replaced anomaly map) is passed in.
+    """
+
+    def __init__(self):
+        self._data = None
+        self._anomalies = None
+        self._heap = []
+        self._order = count()
+        self._cleared = {}
+        self._scanned = set()
+        self.evicted = 0
+
+    def bind(self, data):
+        """Index a save's anomalies; cheap if data is already indexed"""
+        data.setdefault("anomalies", {})
+        data.setdefault("wormhole_pairs", {})
+        data.setdefault("scanned_systems", [])
+        data.setdefault("cleared_anomalies", {})
+        if data is self._data and data["anomalies"] is self._anomalies:
+            return self
+        self._data = data
+        self._anomalies = data["anomalies"]
+        self._cleared = data["cleared_anomalies"]
+        self._heap = [
+            (expiry, next(self._order), system, anomaly)
+            for system, anomalies in self._anomalies.items()
+            for anomaly in anomalies
+            if (expiry := expires_at(anomaly)) is not None
+        ]
+        # Tombstones are heap entries holding the anomaly id instead of the anomaly
+        self._heap.extend((expiry, next(self._order), system, anomaly_id)
+                          for system, cleared in self._cleared.items()
+                          for anomaly_id, expiry in cleared.items())
+        heapq.heapify(self._heap)
+        self._scanned = set(data["scanned_systems"])
+
+        # Pairs whose wormholes expired before the store existed were never removed
+        now = time()
+        pairs = data["wormhole_pairs"]
+        for wormhole_id in [wid for wid, pair in pairs.items()
+                            if pair.get("timestamp", now) + pair.get("duration", DEFAULT_DURATION) <= now]:
+            del pairs[wormhole_id]
+        return self
+
+    def anomalies_in(self, system):
+        return self._anomalies.get(system, [])
+
+    def add(self, system, anomaly):
+        """Add an anomaly to a system and to the expiry index"""
+        self._anomalies.setdefault(system, []).append(anomaly)
+        expiry = expires_at(anomaly)
+        if expiry is not None:
+            heapq.heappush(self._heap, (expiry, next(self._order), system, anomaly))
+
+    def merge(self, system, anomalies, limit=None):
+        """Add the anomalies a system doesn't have yet, matched by id
+
+        Used for seeded anomalies: ones already present, or mined out, are
+        skipped, and the system never grows past limit anomalies.
+
+        Returns:
+            list: The anomalies that were added
+        """
+        present = {anomaly.get("id") for anomaly in self.anomalies_in(system)}
+        cleared = self._cleared.get(system, {})
+        added = []
+        for anomaly in anomalies:
+            if limit is not None and len(self.anomalies_in(system)) >= limit:
+                break
+            if anomaly["id"] in present or anomaly["id"] in cleared:
+                continue
+            self.add(system, anomaly)
+            added.append(anomaly)
+        return added
+
+    def has_wormhole(self, system, wormhole_id):
+        return any(anomaly.get("wormhole_id") == wormhole_id for anomaly in self.anomalies_in(system))
+
+    def remove(self, system, anomaly):
+        """Remove an anomaly (mined out) before it expires
+
+        Seeded anomalies leave a tombstone so they aren't generated again.
+        The anomaly's own heap entry goes stale and is skipped later.
+        """
+        anomalies = self._anomalies.get(system, [])
+        for index, other in enumerate(anomalies):
+            if other is anomaly:
+                del anomalies[index]
+                break
+        else:
+            return False
+        expiry = expires_at(anomaly)
+        if "id" in anomaly and expiry is not None:
+            self._cleared.setdefault(system, {})[anomaly["id"]] = expiry
+            heapq.heappush(self._heap, (expiry, next(self._order), system, anomaly["id"]))
+        return True
+
+    def next_expiry(self):
+        """Earliest expiry time still in the index, or None"""
+        return self._heap[0][0] if self._heap else None
+
+    def evict_expired(self, now=None):
+        """Remove every anomaly (in any system) that has expired by now
+
+        Expired wormholes also drop their wormhole_pairs entry, and systems
+        left without anomalies are removed from the map.
+
+        Returns:
+            int: Number of anomalies removed
+        """
+        if now is None:
+            now = time()
+        heap = self._heap
+        removed = 0
+        while heap and heap[0][0] <= now:
+            _, _, system, anomaly = heapq.heappop(heap)
+            if isinstance(anomaly, str):
+                cleared = self._cleared.get(system, {})
+                cleared.pop(anomaly, None)
+                if not cleared:
+                    self._cleared.pop(system, None)
+                continue
+            anomalies = self._anomalies.get(system)
+            if not anomalies:
+                continue
+            for index, other in enumerate(anomalies):
+                if other is anomaly:
+                    del anomalies[index]
+                    break
+            else:
+                # Already removed (mined out, replaced)
+                continue
+            removed += 1
+            if anomaly.get("type") == "WH":
+                self._data["wormhole_pairs"].pop(anomaly.get("wormhole_id"), None)
+            if not anomalies:
+                del self._anomalies[system]
+        self.evicted += removed
+        return removed
+
+    def is_scanned(self, system):
+        return system in self._scanned
+
+    def mark_scanned(self, system):
+        """Record that a system has been scanned; returns False if it already was"""
+        if system in self._scanned:
+            return False
+        self._scanned.add(system)
+        self._data["scanned_systems"].append(system)
+        return True
+
+    def __len__(self):
+        return sum(len(anomalies) for anomalies in self._anomalies.values())
@@ -0,0 +1,77 @@
+#!/bin/python3
+"""
+Seeded anomaly benchmark: size of the stored anomaly map after weeks of
+simulated play when every generated anomaly is stored against storing only
+the changes made to seeded ones, plus the cost of regenerating a system's
+anomalies (a preview) and of expanding the stored map when a save loads.
+
+Each game hour the player visits a few random systems; a third of the visits
+scan the system (marking its anomalies scanned) and a few anomalies get
+visited and partly mined.
+
+Run from the repository root:
+    python benchmarks/bench_anomaly_seed.py
+"""
+import json
+import os
+import random
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from anomaly_seed import AnomalySeeder, MAX_ANOMALIES
+from anomaly_store import AnomalyStore
+from save_engine import encode_section
+
+ROOT = Path(__file__).resolve().parent.parent
+WEEKS = 4
+VISITS_PER_HOUR = 4
+SEED = 12345
+START = 1_750_000_000.0
+
+
+def play(seeder, systems):
+    rng = random.Random(7)
+    data = {"anomalies": {}, "wormhole_pairs": {}, "scanned_systems": [], "cleared_anomalies": {}}
+    store = AnomalyStore().bind(data)
+    sizes = []
+    for week in range(WEEKS):
+        for hour in range(7 * 24):
+            now = START + (week * 7 * 24 + hour) * 3600
+            store.evict_expired(now)
+            for system in rng.sample(systems, VISITS_PER_HOUR):
+                store.merge(system, seeder.anomalies_at(SEED, system, now), MAX_ANOMALIES)
+                anomalies = store.anomalies_in(system)
+                if rng.random() < 1 / 3:
+                    for anomaly in anomalies:
+                        anomaly["scanned"] = True
+                    store.mark_scanned(system)
+                    if anomalies and rng.random() < 0.3:
+                        anomalies[0]["visited"] = True
+                        anomalies[0]["asteroids"] = [{"ore": "Korrelite Ore", "quantity": 64, "mined": 12}]
+        sizes.append((len(encode_section(data["anomalies"])),
+                      len(encode_section(seeder.compact(data["anomalies"])))))
+    return data, sizes
+
+
+if __name__ == "__main__":
+    with open(ROOT / "system_data.json", 'r') as f:
+        all_systems = json.load(f)
+    seeder = AnomalySeeder(all_systems)
+    systems = seeder.destinations
+
+    data, sizes = play(seeder, systems)
+    print(f"{WEEKS} weeks, {VISITS_PER_HOUR} system visits per game hour")
+    print("  week   every anomaly stored   seeded deltas")
+    for week, (full, compact) in enumerate(sizes, 1):
+        print(f"  {week:4}   {full / 1024:17.1f} KB {compact / 1024:11.1f} KB  ({full / compact:4.1f}x smaller)")
+
+    now = START + WEEKS * 7 * 24 * 3600
+    wild = next(name for name in systems if seeder.security[name] == "Wild")
+    preview = min(timeit.repeat(lambda: seeder.anomalies_at(SEED, wild, now), number=200, repeat=5)) / 200
+    stored = json.dumps(seeder.compact(data["anomalies"]))
+    expand = min(timeit.repeat(lambda: seeder.expand(SEED, json.loads(stored)), number=5, repeat=5)) / 5
+    print(f"Preview a system's anomalies: {preview * 1e6:.0f} us")
+    print(f"Expand the stored anomalies on load: {expand * 1000:.2f} ms")
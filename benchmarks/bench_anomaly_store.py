@@ -0,0 +1,123 @@
+#!/bin/python3
+"""
+Anomaly store benchmark: weeks of simulated play, visiting a few random
+systems every game hour. Each visit cleans up expired anomalies and generates
+new ones (a tenth of them wormholes, paired with another system), the way
+manage_system_anomalies does.
+
+The old cleanup only looks at the visited system, so the anomaly map and the
+wormhole pairs grow with every system ever visited; AnomalyStore evicts
+expired anomalies everywhere from its expiry heap. Also times the "has this
+system been scanned?" check on the scanned_systems list against the store's
+set.
+
+Run from the repository root:
+    python benchmarks/bench_anomaly_store.py
+"""
+import json
+import os
+import random
+import sys
+import timeit
+from pathlib import Path
+from time import perf_counter
+from uuid import UUID
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from anomaly_store import AnomalyStore
+from save_engine import encode_section
+
+ROOT = Path(__file__).resolve().parent.parent
+WEEKS = 6
+VISITS_PER_HOUR = 4
+START = 1_750_000_000.0
+
+
+def new_anomalies(rng, now):
+    anomalies = []
+    for _ in range(rng.randint(1, 4)):
+        anomaly = {"type": "WH" if rng.random() < 0.1 else rng.choice(["AT", "AL", "CM", "BF", "SP"]),
+                   "visited": False, "scanned": False, "timestamp": now,
+                   "duration": rng.choice([24, 48, 72]) * 3600}
+        if anomaly["type"] == "WH":
+            anomaly["wormhole_id"] = str(UUID(int=rng.getrandbits(128)))
+        anomalies.append(anomaly)
+    return anomalies
+
+
+def pair_wormholes(rng, data, systems, system, anomalies, add):
+    for anomaly in anomalies:
+        if anomaly["type"] == "WH":
+            destination = rng.choice(systems)
+            add(destination, dict(anomaly, destination_system=system))
+            data["wormhole_pairs"][anomaly["wormhole_id"]] = {
+                "system1": system, "system2": destination,
+                "timestamp": anomaly["timestamp"], "duration": anomaly["duration"]}
+
+
+def old_visit(rng, data, systems, system, now):
+    kept = []
+    for anomaly in data["anomalies"].get(system, []):
+        if now - anomaly["timestamp"] < anomaly["duration"]:
+            kept.append(anomaly)
+        elif anomaly["type"] == "WH":
+            data["wormhole_pairs"].pop(anomaly["wormhole_id"], None)
+    created = new_anomalies(rng, now)
+    kept.extend(created)
+    data["anomalies"][system] = kept
+    pair_wormholes(rng, data, systems, system, created,
+                   lambda dest, anomaly: data["anomalies"].setdefault(dest, []).append(anomaly))
+    if system not in data["scanned_systems"]:
+        data["scanned_systems"].append(system)
+
+
+def store_visit(rng, data, systems, system, now, store):
+    store.bind(data).evict_expired(now)
+    created = new_anomalies(rng, now)
+    for anomaly in created:
+        store.add(system, anomaly)
+    pair_wormholes(rng, data, systems, system, created, store.add)
+    store.mark_scanned(system)
+
+
+def play(systems, visit):
+    rng = random.Random(7)
+    data = {"anomalies": {}, "wormhole_pairs": {}, "scanned_systems": []}
+    per_week = []
+    elapsed = 0.0
+    for week in range(WEEKS):
+        for hour in range(7 * 24):
+            now = START + (week * 7 * 24 + hour) * 3600
+            for system in rng.sample(systems, VISITS_PER_HOUR):
+                start = perf_counter()
+                visit(rng, data, systems, system, now)
+                elapsed += perf_counter() - start
+        count = sum(len(anomalies) for anomalies in data["anomalies"].values())
+        size = len(encode_section(data["anomalies"])) + len(encode_section(data["wormhole_pairs"]))
+        per_week.append((count, len(data["wormhole_pairs"]), size))
+    return data, per_week, elapsed / (WEEKS * 7 * 24 * VISITS_PER_HOUR)
+
+
+if __name__ == "__main__":
+    with open(ROOT / "system_data.json", 'r') as f:
+        systems = list(json.load(f))
+
+    store = AnomalyStore()
+    _, old_weeks, old_visit_time = play(systems, old_visit)
+    data, new_weeks, new_visit_time = play(systems, lambda *args: store_visit(*args, store))
+
+    print(f"{WEEKS} weeks, {VISITS_PER_HOUR} system visits per game hour, {len(systems)} systems")
+    print("         per-system cleanup                 expiry heap")
+    print("  week   anomalies   pairs    size           anomalies   pairs    size")
+    for week, (old, new) in enumerate(zip(old_weeks, new_weeks), 1):
+        print(f"  {week:4}   {old[0]:9} {old[1]:7} {old[2] / 1024:6.0f} KB      "
+              f"{new[0]:9} {new[1]:7} {new[2] / 1024:6.0f} KB")
+    print(f"  visit    {old_visit_time * 1e6:8.1f} us                      {new_visit_time * 1e6:8.1f} us")
+
+    scanned = data["scanned_systems"]
+    last = scanned[-1]
+    number = 100_000
+    in_list = min(timeit.repeat(lambda: last in scanned, number=number, repeat=5)) / number
+    in_set = min(timeit.repeat(lambda: store.is_scanned(last), number=number, repeat=5)) / number
+    print(f"Scanned check ({len(scanned)} systems): list {in_list * 1e9:.0f} ns, set {in_set * 1e9:.0f} ns")
@@ -0,0 +1,107 @@
+#!/bin/python3
+"""
+Benchmark for the combat projectile/enemy bookkeeping.
+
+Simulates the per-frame work of unified_combat_round for a 40-ship
+crystalline den (bursts of 3 projectiles per entity) using the old
+list-of-objects approach and the array-backed store in combat_state.
+
+Run from the repository root:
+    python benchmarks/bench_combat.py
+"""
+import os
+import random
+import sys
+from time import perf_counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from combat_state import ProjectileStore, EnemyRoster
+
+FLEET_SIZE = 40
+FRAMES = 2000
+DELTA = 0.033
+
+
+class _LegacyProjectile:
+    def __init__(self, target_position, speed=1.0):
+        self.target_position = target_position
+        self.speed = speed
+        self.progress = 0.0
+
+    def update(self, delta_time):
+        self.progress += delta_time * self.speed
+        return self.progress >= 1.0
+
+
+def make_den(seed):
+    rng = random.Random(seed)
+    return [{"name": f"Crystalline Entity {i}", "hull_hp": 400, "shield_hp": 200,
+             "damage": rng.randint(20, 40)} for i in range(FLEET_SIZE)]
+
+
+def run_legacy(seed):
+    rng = random.Random(seed)
+    enemies = make_den(seed)
+    alive = list(enemies)
+    projectiles = []
+    hits = 0
+    for frame in range(FRAMES):
+        alive = [s for s in alive if s.get('hull_hp', 0) > 0 or s.get('shield_hp', 0) > 0]
+        if not alive:
+            break
+        cap = len(alive) * 3
+        for _ in range(min(len(alive) * 3, cap - len(projectiles))):
+            projectiles.append(_LegacyProjectile(rng.randint(1, 9), rng.uniform(0.5, 0.8)))
+        completed = [p for p in projectiles if p.update(DELTA)]
+        for proj in completed:
+            if proj.target_position == 5:
+                avg = sum(e['damage'] for e in alive) / len(alive)
+                hits += int(avg)
+            projectiles.remove(proj)
+        if frame % 10 == 0:
+            alive[rng.randrange(len(alive))]['hull_hp'] -= 40
+            alive[rng.randrange(len(alive))]['shield_hp'] = 0
+    return hits
+
+
+def run_arrays(seed):
+    rng = random.Random(seed)
+    roster = EnemyRoster(make_den(seed))
+    alive = roster.ships
+    projectiles = ProjectileStore()
+    hits = 0
+    for frame in range(FRAMES):
+        roster.refresh()
+        if not alive:
+            break
+        cap = roster.alive_count * 3
+        for _ in range(min(roster.alive_count * 3, cap - len(projectiles))):
+            projectiles.spawn(rng.randint(1, 9), rng.uniform(0.5, 0.8))
+        for target in projectiles.advance(DELTA):
+            if target == 5:
+                hits += int(roster.avg_damage)
+        if frame % 10 == 0:
+            alive[rng.randrange(len(alive))]['hull_hp'] -= 40
+            alive[rng.randrange(len(alive))]['shield_hp'] = 0
+            roster.mark_dirty()
+    return hits
+
+
+def bench(label, func, repeats=5):
+    best = float('inf')
+    result = None
+    for i in range(repeats):
+        start = perf_counter()
+        result = func(1234)
+        best = min(best, perf_counter() - start)
+    per_frame_us = best / FRAMES * 1e6
+    print(f"  {label:<22} {best * 1000:8.2f} ms total  {per_frame_us:7.2f} us/frame  (hits={result})")
+    return best
+
+
+if __name__ == "__main__":
+    print(f"Combat bookkeeping: {FLEET_SIZE}-ship crystalline den, {FRAMES} frames")
+    legacy = bench("list of Projectile", run_legacy)
+    arrays = bench("ProjectileStore", run_arrays)
+    print(f"  speedup: {legacy / arrays:.2f}x")
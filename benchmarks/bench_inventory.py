@@ -0,0 +1,90 @@
+#!/bin/python3
+"""
+Inventory benchmark: the crafting menu's material checks done the old way
+(read inventory and storage for each material and add them up, and merge
+both dicts for the item list) against Inventory's combined total index,
+plus the cost of keeping the index up to date on every change and a check
+that a failed multi-item debit leaves nothing changed.
+
+Run from the repository root:
+    python benchmarks/bench_inventory.py
+"""
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from inventory import Inventory, InsufficientItems
+
+ITEMS = 2000
+RECIPES = 200
+MATERIALS = 6
+
+
+def old_has(data, materials):
+    for mat_name, mat_qty in materials.items():
+        inventory_qty = data.get('inventory', {}).get(mat_name, 0)
+        storage_qty = data.get('storage', {}).get(mat_name, 0)
+        if inventory_qty + storage_qty < mat_qty:
+            return False
+    return True
+
+
+def old_totals(data):
+    all_items = {}
+    for item_name, quantity in data.get('inventory', {}).items():
+        all_items[item_name] = all_items.get(item_name, 0) + quantity
+    for item_name, quantity in data.get('storage', {}).items():
+        all_items[item_name] = all_items.get(item_name, 0) + quantity
+    return all_items
+
+
+if __name__ == "__main__":
+    rng = random.Random(5)
+    names = [f"Item {i}" for i in range(ITEMS)]
+    data = {
+        "inventory": {name: rng.randint(1, 50) for name in rng.sample(names, ITEMS // 2)},
+        "storage": {name: rng.randint(1, 500) for name in rng.sample(names, ITEMS // 2)},
+    }
+    recipes = [{name: rng.randint(1, 40) for name in rng.sample(names, MATERIALS)} for _ in range(RECIPES)]
+
+    expected = [old_has(data, recipe) for recipe in recipes]
+    expected_totals = old_totals(data)
+    items = Inventory().bind(data)
+    assert [items.has(recipe) for recipe in recipes] == expected
+    assert items.totals() == expected_totals
+
+    old = min(timeit.repeat(lambda: [old_has(data, recipe) for recipe in recipes], number=200, repeat=5)) / 200
+    new = min(timeit.repeat(lambda: [items.has(recipe) for recipe in recipes], number=200, repeat=5)) / 200
+    print(f"Material checks for {RECIPES} recipes: {old * 1e6:.0f} us -> {new * 1e6:.0f} us")
+
+    old = min(timeit.repeat(lambda: old_totals(data), number=200, repeat=5)) / 200
+    new = min(timeit.repeat(items.totals, number=200, repeat=5)) / 200
+    print(f"Combined totals of {ITEMS} items: {old * 1e6:.0f} us -> {new * 1e6:.0f} us")
+
+    plain = dict(data["inventory"])
+    changes = [(rng.choice(names), rng.randint(1, 5)) for _ in range(10_000)]
+
+    def credit_plain():
+        for item, quantity in changes:
+            plain[item] = plain.get(item, 0) + quantity
+
+    def credit_indexed():
+        for item, quantity in changes:
+            items.credit("inventory", item, quantity)
+
+    old = min(timeit.repeat(credit_plain, number=10, repeat=5)) / 10 / len(changes)
+    new = min(timeit.repeat(credit_indexed, number=10, repeat=5)) / 10 / len(changes)
+    print(f"One credit: {old * 1e9:.0f} ns on a plain dict -> {new * 1e9:.0f} ns with the index kept up to date")
+
+    before = {name: dict(data[name]) for name in ("inventory", "storage")}
+    totals = items.totals()
+    try:
+        items.take({**recipes[0], "Unobtainium": 1}, 2)
+    except InsufficientItems:
+        pass
+    assert {name: dict(data[name]) for name in ("inventory", "storage")} == before
+    assert items.totals() == totals
+    print("Failed multi-item debit rolled back")
@@ -0,0 +1,73 @@
+#!/bin/python3
+"""
+Market benchmark: how long one price tick takes for items.json and for
+larger synthetic item lists (NumPy when installed, the array fallback
+otherwise), what rendering the buy list costs against converting the
+items.json price strings with int(), a long-run check that untouched prices
+stay near their listed price and that trades move them, and the size of the
+price history ring buffer.
+
+Run from the repository root:
+    python benchmarks/bench_market.py
+"""
+import json
+import os
+import statistics
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import market
+from market import HISTORY, Market
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+SIZES = [1000, 2000, 5000]
+
+if __name__ == "__main__":
+    with open(os.path.join(ROOT, "items.json"), 'r') as f:
+        items_data = {item['name']: item for item in json.load(f)['items']}
+
+    backend = "numpy" if market.numpy is not None else "array('d') fallback"
+    print(f"Price tick ({backend})")
+    prices = Market(items_data, seed=1)
+    elapsed = min(timeit.repeat(prices.tick, number=1000, repeat=5)) / 1000
+    print(f"  {len(prices.names):>6} items (items.json)  {elapsed * 1e6:7.1f} us")
+    for size in SIZES:
+        synthetic = {f"Item {i}": {"buy_price": str(10 + i % 90), "sell_price": str(5 + i % 40)} for i in range(size)}
+        big = Market(synthetic, seed=2)
+        elapsed = min(timeit.repeat(big.tick, number=100, repeat=5)) / 100
+        print(f"  {size:>6} items               {elapsed * 1e6:7.1f} us")
+
+    buyable = [(name, info) for name, info in items_data.items() if info.get('buy_price')]
+
+    def old_render():
+        return sorted(f"{name} - {int(info['buy_price'])} CR" for name, info in buyable)
+
+    def new_render():
+        return sorted(f"{name} - {prices.buy_price(name)} CR" for name, _ in buyable)
+
+    old = min(timeit.repeat(old_render, number=2000, repeat=5)) / 2000
+    new = min(timeit.repeat(new_render, number=2000, repeat=5)) / 2000
+    print(f"Buy list prices ({len(buyable)} items): {old * 1e6:.1f} us fixed -> {new * 1e6:.1f} us dynamic")
+
+    # A week of ticks: untouched prices wander around the listed price
+    drift = Market(items_data, seed=3)
+    drift.tick(7 * 24 * 60)
+    ratios = [drift.buy_price(name) / int(info['buy_price']) for name, info in buyable]
+    print(f"After a week of ticks: buy price / listed {min(ratios):.2f}..{max(ratios):.2f} "
+          f"(mean {statistics.fmean(ratios):.3f})")
+
+    traded = Market(items_data, seed=4)
+    name = buyable[0][0]
+    before = traded.buy_price(name)
+    traded.record_trade(name, 1000, buying=True)
+    traded.tick(10)
+    peak = traded.buy_price(name)
+    traded.tick(HISTORY)
+    print(f"Buying 1000x {name}: {before} CR -> {peak} CR after 10 ticks -> {traded.buy_price(name)} CR "
+          f"after {HISTORY} more")
+
+    history = traded.history(name)
+    assert len(history) == HISTORY and history[-1] == traded.buy_price(name)
+    print(f"History ring buffer: last {HISTORY} ticks per item")
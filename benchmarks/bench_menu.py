@@ -0,0 +1,114 @@
+#!/bin/python3
+"""
+Menu benchmark: what one keypress costs in a 5-entry and a 5,000-entry
+menu with the old display_menu (previous content and every option reprinted
+on each arrow key) against the paged MenuView window drawn with
+draw_changed_lines: time per keypress, characters written to the terminal
+and lines rewritten, plus typing a filter one character at a time and
+backing it out.
+
+Terminal output goes to an in-memory stream.
+
+Run from the repository root:
+    python benchmarks/bench_menu.py
+"""
+import io
+import os
+import sys
+import timeit
+from contextlib import redirect_stdout
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from menu_view import MenuView
+from screen_buffer import clear_screen, draw_changed_lines, screen_frame
+
+SIZES = [5, 5000]
+WINDOW = 30
+PREVIOUS = "".join(f"  Previous screen line {i}\033[K\n" for i in range(8))
+HEADER = PREVIOUS.split("\n")[:-1] + ["", "=" * 60, "  Select item:\033[K", "=" * 60, ""]
+FILTER = "item 12"
+
+
+def old_display(options, selected):
+    with screen_frame():
+        clear_screen()
+        print(PREVIOUS, end='')
+        print()
+        print("=" * 60)
+        print("  Select item:\033[K")
+        print("=" * 60)
+        print()
+        for i, option in enumerate(options):
+            if i == selected:
+                print(f"  > {option}\033[K")
+            else:
+                print(f"    {option}\033[K")
+        print()
+        print("  Use ↑/↓ arrows to navigate, Enter to select\033[K")
+
+
+def new_lines(view):
+    lines = list(HEADER)
+    rows = view.rows()
+    for i, is_selected in rows:
+        lines.append(f"  > {view.options[i]}\033[K" if is_selected else f"    {view.options[i]}\033[K")
+    lines.extend([""] * (view.window - max(len(rows), 1) + 1))
+    lines.append(f"  {len(view.matches)} match(es) | ↑/↓ navigate, Enter to select\033[K")
+    return lines
+
+
+def per_key(run, presses):
+    out = io.StringIO()
+    with redirect_stdout(out):
+        elapsed = min(timeit.repeat(run, number=1, repeat=3)) / presses
+    return elapsed, len(out.getvalue()) / 3 / presses
+
+
+if __name__ == "__main__":
+    presses = 200
+    for size in SIZES:
+        options = [f"Item {i} - {i * 7 % 900} CR (Salvage) [Have: {i % 40}]" for i in range(size)] + ["Back"]
+
+        def run_old():
+            selected = 0
+            for _ in range(presses):
+                selected = (selected + 1) % len(options)
+                old_display(options, selected)
+
+        def run_new():
+            view = MenuView(options, WINDOW)
+            shown = new_lines(view)
+            for _ in range(presses):
+                view.move(1)
+                lines = new_lines(view)
+                draw_changed_lines(lines, shown)
+                shown = lines
+
+        old, old_chars = per_key(run_old, presses)
+        new, new_chars = per_key(run_new, presses)
+        print(f"{size:>5} options, one arrow key: {old * 1e6:8.0f} us, {old_chars:8.0f} chars -> "
+              f"{new * 1e6:4.0f} us, {new_chars:4.0f} chars")
+
+        view = MenuView(options, WINDOW)
+        shown = new_lines(view)
+        view.move(1)
+        with redirect_stdout(io.StringIO()):
+            rewritten = draw_changed_lines(new_lines(view), shown)
+        print(f"      lines rewritten per move within a page: {rewritten}")
+
+        def type_filter():
+            view = MenuView(options, WINDOW)
+            for char in FILTER:
+                view.type(char)
+                new_lines(view)
+            for _ in FILTER:
+                view.backspace()
+                new_lines(view)
+
+        typed = min(timeit.repeat(type_filter, number=5, repeat=3)) / 5 / (2 * len(FILTER))
+        view = MenuView(options, WINDOW)
+        for char in FILTER:
+            view.type(char)
+        print(f"      filter '{FILTER}' typed and backed out: {typed * 1e6:.0f} us per key "
+              f"({len(view.matches)} match(es))")
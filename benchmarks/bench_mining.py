@@ -0,0 +1,65 @@
+#!/bin/python3
+"""
+Headless mining benchmark: how fast the seeded mining engine plays blasts,
+how long optimizing the intensity policy for one ore / ship / skill /
+security combination takes, and a check that a seed always replays the same
+session. Also compares the per-blast event check (rebuilding the odds and
+rolling each event against one draw from the precomputed table) and the
+event frequencies the two give.
+
+Run from the repository root:
+    python benchmarks/bench_mining.py
+"""
+import os
+import random
+import sys
+import timeit
+from collections import Counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from mining import (EVENT_TABLE, FIRE_INTERVAL, draw_event, event_chances, event_table, mining_efficiency,
+                    optimize, simulate, threshold_policy)
+
+ORE = "Korrelite Ore"
+MINUTES = 10
+
+if __name__ == "__main__":
+    efficiency = mining_efficiency("Miner", 102, 5)
+    policy = threshold_policy(5, 1, 50)
+
+    first = simulate(policy, ORE, efficiency, 5, "Wild", MINUTES, seed=42)
+    assert first == simulate(policy, ORE, efficiency, 5, "Wild", MINUTES, seed=42)
+
+    blasts = MINUTES * 60 / FIRE_INTERVAL
+    session = min(timeit.repeat(lambda: simulate(policy, ORE, efficiency, 5, "Wild", MINUTES, seed=1),
+                                number=20, repeat=5)) / 20
+    print(f"{MINUTES}-minute session ({blasts:.0f} blasts): {session * 1000:.2f} ms "
+          f"({session / blasts * 1e6:.1f} us per blast)")
+
+    elapsed = min(timeit.repeat(lambda: optimize(ORE, efficiency, 5, "Wild"), number=1, repeat=3))
+    results = optimize(ORE, efficiency, 5, "Wild")
+    print(f"Optimize one combination ({len(results)} policies): {elapsed * 1000:.0f} ms")
+    for result in results[:3]:
+        print(f"  {result['policy'].name:<22} {result['ore_per_minute']:6.1f} ore/min "
+              f"(+/- {result['stdev']:.1f}), {result['explosion_rate'] * 100:.1f}% exploded")
+
+    # Event check per blast: rebuilding the odds and rolling each event in turn,
+    # against one draw from the precomputed table
+    def rolled(rng):
+        for event_type, chance in event_chances(ORE, "Wild", "AL").items():
+            if rng.random() < chance:
+                return event_type
+        return None
+
+    rng = random.Random(9)
+    table = event_table(ORE, "Wild", "AL")
+    old = min(timeit.repeat(lambda: rolled(rng), number=100_000, repeat=5)) / 100_000
+    new = min(timeit.repeat(lambda: draw_event(event_table(ORE, "Wild", "AL"), rng), number=100_000, repeat=5)) / 100_000
+    print(f"Event check per blast: {old * 1e6:.2f} us -> {new * 1e6:.2f} us ({len(EVENT_TABLE)} precomputed tables)")
+
+    draws = 200_000
+    for name, check in (("rolled", rolled), ("table", lambda r: draw_event(table, r))):
+        counts = Counter(check(rng) for _ in range(draws))
+        print(f"  {name:<7}" + "  ".join(f"{event}: {counts[event] / draws:.4f}"
+                                      for event in (*event_chances(ORE, "Wild", "AL"), None)))
@@ -0,0 +1,67 @@
+#!/bin/python3
+"""
+Refinery benchmark: refining a stack of Metal Scraps with the old per-unit
+loop (one roll per scrap, then a linear weighted pick per success) against
+refinery.refine()'s binomial and multinomial draws, plus a check that both
+give the same distribution (mean and spread of every material over many
+refines of a small stack).
+
+Run from the repository root (Python 3.12+, like the game):
+    python benchmarks/bench_refinery.py
+"""
+import os
+import random
+import statistics
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from refinery import SCRAP_MATERIALS, SCRAP_SUCCESS_CHANCE, refine, refine_all
+
+STACKS = [1_000, 50_000, 1_000_000]
+TRIALS = 4000
+TRIAL_STACK = 500
+
+
+def old_refine(amount, rng):
+    materials_gained = {}
+    for _ in range(amount):
+        if rng.random() < SCRAP_SUCCESS_CHANCE:
+            total_weight = sum(weight for _, weight in SCRAP_MATERIALS)
+            rand = rng.randint(1, total_weight)
+            cumulative = 0
+            for mat, weight in SCRAP_MATERIALS:
+                cumulative += weight
+                if rand <= cumulative:
+                    materials_gained[mat] = materials_gained.get(mat, 0) + 1
+                    break
+    return materials_gained
+
+
+def spread(refiner, rng):
+    samples = [refiner(TRIAL_STACK, rng) for _ in range(TRIALS)]
+    return {mat: (statistics.fmean(s.get(mat, 0) for s in samples),
+                  statistics.stdev(s.get(mat, 0) for s in samples))
+            for mat, _ in SCRAP_MATERIALS}
+
+
+if __name__ == "__main__":
+    rng = random.Random(3)
+    print("Metal Scraps refining")
+    for amount in STACKS:
+        number = 1 if amount > 100_000 else 5
+        old = min(timeit.repeat(lambda: old_refine(amount, rng), number=number, repeat=3)) / number
+        new = min(timeit.repeat(lambda: refine("Metal Scraps", amount, rng), number=200, repeat=3)) / 200
+        print(f"  {amount:>9} scraps  {old * 1000:9.2f} ms -> {new * 1000:6.3f} ms  ({old / new:,.0f}x)")
+
+    inventory = {"Metal Scraps": 250_000, "Korrelite Ore": 8_000, "Water Ice": 3_000, "Hull Plating": 4}
+    everything = min(timeit.repeat(lambda: refine_all(dict(inventory), rng), number=200, repeat=3)) / 200
+    print(f"  refine everything ({sum(inventory.values()) - 4} units) {everything * 1000:.3f} ms")
+
+    print(f"Distribution over {TRIALS} refines of {TRIAL_STACK} scraps (mean / stdev)")
+    old = spread(old_refine, random.Random(1))
+    new = spread(lambda amount, r: refine("Metal Scraps", amount, r)[0], random.Random(2))
+    for mat, _ in SCRAP_MATERIALS:
+        print(f"  {mat:<10}  per unit {old[mat][0]:6.2f} / {old[mat][1]:5.2f}   "
+              f"sampled {new[mat][0]:6.2f} / {new[mat][1]:5.2f}")
@@ -0,0 +1,155 @@
+#!/bin/python3
+"""
+Save benchmark: the old save_data (json.dump with indent=4, written in place)
+against save_engine.SaveEngine on a synthetic late-game save.
+
+The late-game save has anomalies in every non-Core system, a long scanned
+systems list, hundreds of queued manufacturing jobs and a full inventory and
+storage - the state a long-running save accumulates. Three cases are timed:
+a save where only the credits changed (the usual case after a trade), a save
+where nothing changed (e.g. saving again after leaving a menu), and a first
+save of a fresh engine. The credits case is also timed with the append-only
+journal enabled, together with loading the save back (replaying the journal).
+
+Run from the repository root:
+    python benchmarks/bench_save.py
+"""
+import json
+import os
+import random
+import sys
+import tempfile
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from save_engine import SaveEngine
+
+ROOT = Path(__file__).resolve().parent.parent
+REPEAT = 5
+NUMBER = 20
+
+
+def late_game_save(seed=1):
+    """A save with the sections a long-running game accumulates"""
+    rng = random.Random(seed)
+    with open(ROOT / "system_data.json", 'r') as f:
+        systems = json.load(f)
+    with open(ROOT / "crafting.json", 'r') as f:
+        recipes = json.load(f)
+    with open(ROOT / "items.json", 'r') as f:
+        items = [item["name"] for item in json.load(f)["items"]]
+
+    now = 1_750_000_000.0
+    anomalies = {}
+    for name, system in systems.items():
+        if system.get("SecurityLevel") == "Core":
+            continue
+        anomalies[name] = [{
+            "type": rng.choice(["AT", "AL", "CM", "BF", "SP", "MT", "DH", "AA"]),
+            "visited": rng.random() < 0.3,
+            "scanned": rng.random() < 0.5,
+            "timestamp": now - rng.uniform(0, 48 * 3600),
+            "duration": 48 * 3600,
+        } for _ in range(rng.randint(1, 6))]
+
+    stations = [station["Name"] for system in systems.values() for station in system.get("Stations", [])]
+    jobs = {}
+    for station in rng.sample(stations, 12):
+        recipe = rng.choice(recipes)
+        jobs[station] = [{
+            "item": recipe["name"],
+            "station": station,
+            "start_time": now + i * recipe.get("time", 1),
+            "craft_time": recipe.get("time", 0),
+            "type": recipe.get("type", "item"),
+            "quantity": rng.randint(1, 20),
+        } for i in range(50)]
+
+    return {
+        "v": 4,
+        "player_name": "Benchmark",
+        "credits": 12_345_678,
+        "current_system": "The Citadel",
+        "docked_at": "The Citadel",
+        "ships": [{
+            "id": f"ship-{i}",
+            "name": "stratos",
+            "nickname": f"Ship {i}",
+            "hull_hp": 200,
+            "shield_hp": 200,
+            "modules_installed": [],
+        } for i in range(25)],
+        "active_ship": 0,
+        "inventory": {item: rng.randint(1, 5000) for item in items},
+        "storage": {item: rng.randint(1, 50000) for item in items},
+        "skills": {"combat": 40, "combat_xp": 10, "piloting": 35, "piloting_xp": 3,
+                   "mining": 50, "mining_xp": 700},
+        "standing": {"Core Sec": 5, "Syndicate": -2, "Trade Union": 4, "Mining Guild": 6,
+                     "Lycentia": 0, "Forakus": 1, "Kavani": 0},
+        "tutorial_progress": {"completed": True},
+        "destination": "",
+        "anomalies": anomalies,
+        "scanned_systems": list(anomalies),
+        "manufacturing_jobs": jobs,
+        "anomaly_seed": seed,
+        "cleared_anomalies": {},
+        "wormhole_pairs": {},
+    }
+
+
+def legacy_save(path, data):
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=4)
+
+
+def best(func):
+    return min(timeit.repeat(func, number=NUMBER, repeat=REPEAT)) / NUMBER
+
+
+if __name__ == "__main__":
+    data = late_game_save()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy_path = Path(tmp) / "legacy" / "save.json"
+        legacy_path.parent.mkdir()
+        engine = SaveEngine(tmp)
+        journaled = SaveEngine(tmp, use_journal=True)
+
+        legacy_save(legacy_path, data)
+        engine.save("engine", data)
+        journaled.save("journal", data)
+        old_size = legacy_path.stat().st_size
+        new_size = engine.save_path("engine").stat().st_size
+        assert engine.load("engine") == data
+
+        print(f"Late-game save: {len(data['anomalies'])} systems with anomalies, "
+              f"{sum(len(j) for j in data['manufacturing_jobs'].values())} jobs, "
+              f"{len(data['inventory'])} item types")
+        print(f"  size on disk       old {old_size / 1024:8.1f} KB  new {new_size / 1024:8.1f} KB")
+
+        def bump_credits(save):
+            data["credits"] += 1
+            save()
+
+        legacy = best(lambda: bump_credits(lambda: legacy_save(legacy_path, data)))
+        changed = best(lambda: bump_credits(lambda: engine.save("engine", data)))
+        unchanged = best(lambda: engine.save("engine", data))
+        first = best(lambda: SaveEngine(tmp).save("engine", data))
+        journal = best(lambda: bump_credits(lambda: journaled.save("journal", data)))
+        load_legacy = best(lambda: json.loads(legacy_path.read_text()))
+        load_journal = best(lambda: SaveEngine(tmp).load("journal"))
+        assert SaveEngine(tmp).load("journal") == data
+
+        print(f"  legacy save_data   {legacy * 1000:8.2f} ms")
+        print(f"  credits changed    {changed * 1000:8.2f} ms  ({legacy / changed:5.1f}x)")
+        print(f"  nothing changed    {unchanged * 1000:8.2f} ms  ({legacy / unchanged:5.1f}x)")
+        print(f"  fresh engine       {first * 1000:8.2f} ms  ({legacy / first:5.1f}x)")
+        journal_bytes = journaled.journal_path("journal").stat().st_size / journaled.appends
+        print(f"  journal append     {journal * 1000:8.2f} ms  ({legacy / journal:5.1f}x)"
+              f"  {journal_bytes:.0f} bytes written per save vs {new_size / 1024:.0f} KB")
+        print(f"  legacy load        {load_legacy * 1000:8.2f} ms")
+        print(f"  load + replay      {load_journal * 1000:8.2f} ms  "
+              f"({journaled.appends} records, {journaled.compactions} compactions)")
+        print(f"  engine writes {engine.writes}, skipped {engine.skipped}")
@@ -0,0 +1,100 @@
+#!/bin/python3
+"""
+Save codec benchmark: on-disk size and encode/decode throughput of the old
+pretty-printed save.json against save_codec's compressed save.dat, for a
+small (new game), medium (a few hundred systems explored) and very large
+(every system explored, many times over) save. Also times upgrading a
+version 1 save.
+
+Throughput is given in MB/s of compact JSON, so the columns are comparable
+across formats. Encode/decode cover the in-memory work only; the save engine
+adds one atomic file write on top.
+
+Run from the repository root:
+    python benchmarks/bench_save_codec.py
+"""
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import save_codec
+from bench_save import late_game_save
+from save_engine import SaveEngine
+
+REPEAT = 5
+
+
+def small_save():
+    data = late_game_save()
+    data.update(credits=2500, ships=data["ships"][:1], inventory={}, storage={},
+                anomalies={}, scanned_systems=[], manufacturing_jobs={},
+                wormhole_pairs={})
+    return data
+
+
+def medium_save():
+    data = late_game_save()
+    systems = list(data["anomalies"])[:300]
+    data["anomalies"] = {name: data["anomalies"][name] for name in systems}
+    data["scanned_systems"] = systems
+    data["manufacturing_jobs"] = dict(list(data["manufacturing_jobs"].items())[:3])
+    return data
+
+
+def very_large_save():
+    data = late_game_save()
+    # Long-lived wormholes and never-revisited systems pile up extra entries
+    data["anomalies"] = {name: anomalies * 4 for name, anomalies in data["anomalies"].items()}
+    data["manufacturing_jobs"] = {station: jobs * 10 for station, jobs in data["manufacturing_jobs"].items()}
+    return data
+
+
+def best(func, number):
+    return min(timeit.repeat(func, number=number, repeat=REPEAT)) / number
+
+
+def measure(name, data):
+    encoded = SaveEngine.encode(data)
+    compact_mb = sum(len(enc) for enc in encoded.values()) / 1e6
+    legacy = json.dumps(data, indent=4)
+    packed, _ = save_codec.pack_sections(encoded, data["v"])
+    number = max(1, int(2 / max(compact_mb, 0.01)))
+
+    legacy_save = best(lambda: json.dumps(data, indent=4), number)
+    legacy_load = best(lambda: json.loads(legacy), number)
+    codec_save = best(lambda: save_codec.pack_sections(SaveEngine.encode(data), data["v"]), number)
+    codec_load = best(lambda: save_codec.upgrade(save_codec.decode(packed)), number)
+    assert save_codec.decode(packed) == data
+
+    print(f"{name} save ({compact_mb * 1000:.1f} KB of compact JSON)")
+    print(f"  on disk    save.json {len(legacy) / 1024:9.1f} KB   save.dat {len(packed) / 1024:9.1f} KB"
+          f"  ({len(legacy) / len(packed):5.1f}x smaller)")
+    print(f"  save       save.json {compact_mb / legacy_save:9.1f} MB/s  save.dat {compact_mb / codec_save:9.1f} MB/s"
+          f"  ({codec_save * 1000:.2f} ms)")
+    print(f"  load       save.json {compact_mb / legacy_load:9.1f} MB/s  save.dat {compact_mb / codec_load:9.1f} MB/s"
+          f"  ({codec_load * 1000:.2f} ms)")
+
+
+if __name__ == "__main__":
+    for name, build in (("Small", small_save), ("Medium", medium_save), ("Very large", very_large_save)):
+        measure(name, build())
+
+    old = very_large_save()
+    old["v"] = 1
+    for section in ("storage", "standing", "anomalies", "scanned_systems", "manufacturing_jobs"):
+        del old[section]
+    text = json.dumps(old, indent=4)
+
+    def load_v1():
+        data = json.loads(text)
+        save_codec.upgrade(data)
+        return data
+
+    upgraded = load_v1()
+    assert upgraded["v"] == save_codec.SAVE_VERSION and "manufacturing_jobs" in upgraded
+    print(f"Upgrade version 1 save.json -> version {save_codec.SAVE_VERSION}: "
+          f"{best(load_v1, 10) * 1000:.2f} ms (load included)")
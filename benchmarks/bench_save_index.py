@@ -0,0 +1,44 @@
+#!/bin/python3
+"""
+Save list benchmark: building the continue/delete screen's save list from the
+save index against reading every save in full, for slots holding new-game
+saves and slots holding very large late-game saves.
+
+With the index the listing time should not depend on how large the saves are.
+
+Run from the repository root:
+    python benchmarks/bench_save_index.py
+"""
+import os
+import sys
+import tempfile
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_save_codec import small_save, very_large_save
+from save_engine import SaveEngine
+
+SLOTS = 8
+REPEAT = 5
+
+
+def read_every_save(engine):
+    return [(name, engine.load(name)) for name, _ in engine.list_saves()]
+
+
+if __name__ == "__main__":
+    print(f"Listing {SLOTS} save slots (best of {REPEAT})")
+    for label, build in (("new-game saves", small_save), ("very large saves", very_large_save)):
+        data = build()
+        with tempfile.TemporaryDirectory() as tmp:
+            engine = SaveEngine(tmp)
+            for slot in range(SLOTS):
+                data["player_name"] = f"Pilot {slot}"
+                engine.save(f"slot{slot}", data)
+
+            indexed = min(timeit.repeat(lambda: SaveEngine(tmp).list_saves(), number=10, repeat=REPEAT)) / 10
+            full = min(timeit.repeat(lambda: read_every_save(SaveEngine(tmp)), number=1, repeat=REPEAT))
+            assert all(summary for _, summary in SaveEngine(tmp).list_saves())
+        print(f"  {label:<17} index {indexed * 1000:7.2f} ms   reading every save {full * 1000:9.2f} ms")
@@ -0,0 +1,87 @@
+#!/bin/python3
+"""
+SQLite save store benchmark on the synthetic late-game save: cost of typical
+saves (credits, one inventory item, one anomaly scanned, a job queued) with
+row-level updates in save.db against rewriting save.dat, JSON import/export,
+and the indexed queries. In the game the save is already loaded and scanning
+it is the faster answer; the index only wins over loading save.db (export)
+and then scanning, which is what a tool reading save.db would otherwise do.
+
+Run from the repository root:
+    python benchmarks/bench_save_sqlite.py
+"""
+import os
+import sys
+import tempfile
+import timeit
+from time import perf_counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_save import late_game_save
+from save_engine import SaveEngine
+from save_sqlite import SqliteSaveStore
+
+NUMBER = 10
+
+
+def best(func, number=NUMBER):
+    return min(timeit.repeat(func, number=number, repeat=3)) / number
+
+
+if __name__ == "__main__":
+    data = late_game_save()
+    system = next(name for name, anomalies in data["anomalies"].items() if anomalies)
+    station = next(iter(data["manufacturing_jobs"]))
+    item = next(iter(data["inventory"]))
+
+    def credits():
+        data["credits"] += 1
+
+    def inventory():
+        data["inventory"][item] += 1
+
+    def scan():
+        anomaly = data["anomalies"][system][0]
+        anomaly["scanned"] = not anomaly["scanned"]
+
+    def queue_job():
+        jobs = data["manufacturing_jobs"][station]
+        jobs.append(dict(jobs[-1], start_time=jobs[-1]["start_time"] + 1))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        packed = SaveEngine(tmp)
+        sqlite = SaveEngine(tmp, use_sqlite=True)
+        packed.save("packed", data)
+        start = perf_counter()
+        sqlite.save("sqlite", data)
+        print(f"Import late-game save into save.db: {(perf_counter() - start) * 1000:.1f} ms, "
+              f"{sqlite.sqlite_path('sqlite').stat().st_size / 1024:.0f} KB "
+              f"(save.dat {packed.save_path('packed').stat().st_size / 1024:.0f} KB)")
+
+        print("Save after one change         save.dat     save.db")
+        for label, change in (("credits", credits), ("inventory item", inventory),
+                              ("anomaly scanned", scan), ("job queued", queue_job)):
+            old = best(lambda: (change(), packed.save("packed", data)))
+            new = best(lambda: (change(), sqlite.save("sqlite", data)))
+            print(f"  {label:<26} {old * 1000:8.2f} ms {new * 1000:8.2f} ms")
+
+        store = SqliteSaveStore(sqlite.sqlite_path("sqlite"))
+        assert store.export() == data
+        print(f"Export save.db to a save dict: {best(store.export, 3) * 1000:.1f} ms")
+
+        now = 1_750_000_000.0 + 3600
+
+        def finished_scan():
+            return [(s, job) for s, jobs in data["manufacturing_jobs"].items() for job in jobs
+                    if job["start_time"] + job["craft_time"] <= now]
+
+        assert len(store.jobs_finished_by(now)) == len(finished_scan())
+        print("Queries               loaded scan  export + scan    index")
+        print(f"  jobs finished by now     {best(finished_scan, 100) * 1e3:8.3f} ms "
+              f"{best(lambda: (store.export(), finished_scan()), 3) * 1e3:10.3f} ms "
+              f"{best(lambda: store.jobs_finished_by(now), 100) * 1e3:8.3f} ms")
+        print(f"  system scanned?          {best(lambda: system in data['scanned_systems'], 100) * 1e3:8.3f} ms "
+              f"{best(lambda: (store.export(), system in data['scanned_systems']), 3) * 1e3:10.3f} ms "
+              f"{best(lambda: store.is_scanned(system), 100) * 1e3:8.3f} ms")
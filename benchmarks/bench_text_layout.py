@@ -0,0 +1,90 @@
+#!/bin/python3
+"""
+Microbenchmarks for the text_layout helpers against the old uncached versions.
+
+Each helper is called with the kind of arguments a combat/mining frame
+passes it, many times over, the way the render loops do.
+
+Run from the repository root:
+    python benchmarks/bench_text_layout.py
+"""
+import os
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import text_layout
+from colors import get_color
+
+NUMBER = 20000
+
+
+def legacy_strip_ansi(text):
+    ansi_escape = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
+    return ansi_escape.sub('', text)
+
+
+def legacy_box_line(content, width=60, border_color=None, text_color=None):
+    padding_needed = width - len(legacy_strip_ansi(content)) - 2
+    formatted_content = content
+    if text_color:
+        formatted_content = f"{get_color(text_color)}{content}{get_color('reset')}"
+    if border_color:
+        line = f"{get_color(border_color)}║{get_color('reset')}"
+        line += f"  {formatted_content}{' ' * padding_needed}"
+        line += f"{get_color(border_color)}║{get_color('reset')}"
+        return line
+    return f"║  {formatted_content}{' ' * padding_needed}║"
+
+
+def legacy_wrap_text(text, max_width=60):
+    words = text.split()
+    lines, current_line, current_length = [], [], 0
+    for word in words:
+        space_needed = len(word) + (1 if current_line else 0)
+        if current_length + space_needed <= max_width:
+            current_line.append(word)
+            current_length += space_needed
+        else:
+            if current_line:
+                lines.append(' '.join(current_line))
+            current_line, current_length = [word], len(word)
+    if current_line:
+        lines.append(' '.join(current_line))
+    return '\n'.join(lines)
+
+
+def legacy_health_bar(current, maximum, width, color="green"):
+    filled = 0 if maximum == 0 else int((current / maximum) * width)
+    colors = {"green": "\033[32m", "cyan": "\033[36m", "yellow": "\033[33m", "red": "\033[31m"}
+    return f"{colors.get(color, chr(27) + '[32m')}{'█' * filled}\033[0m{'░' * (width - filled)}"
+
+
+SHIELD_TEXT = f"Shield: \033[36m{'█' * 8}\033[0m{'░' * 4} 160/200"
+DESCRIPTION = ("A sturdy mining vessel favoured by independent prospectors across "
+               "the outer sectors, trading firepower for cargo space and stability.")
+
+CASES = [
+    ("strip_ansi", lambda: legacy_strip_ansi(SHIELD_TEXT),
+     lambda: text_layout.strip_ansi(SHIELD_TEXT)),
+    ("visual width", lambda: len(legacy_strip_ansi(SHIELD_TEXT)),
+     lambda: text_layout.visual_width(SHIELD_TEXT)),
+    ("box_line", lambda: legacy_box_line("Damage Dealt: 1234", 60, border_color="green", text_color="yellow"),
+     lambda: text_layout.box_line("Damage Dealt: 1234", 60, border_color="green", text_color="yellow")),
+    ("wrap_text", lambda: legacy_wrap_text(DESCRIPTION, 56),
+     lambda: text_layout.wrap_text(DESCRIPTION, 56)),
+    ("create_health_bar", lambda: legacy_health_bar(163, 200, 12, "cyan"),
+     lambda: text_layout.create_health_bar(163, 200, 12, "cyan")),
+]
+
+
+if __name__ == "__main__":
+    print(f"Text layout helpers, {NUMBER} calls each (best of 5)")
+    for name, legacy, cached in CASES:
+        assert legacy() == cached(), name
+        old = min(timeit.repeat(legacy, number=NUMBER, repeat=5))
+        new = min(timeit.repeat(cached, number=NUMBER, repeat=5))
+        print(f"  {name:<18} old {old / NUMBER * 1e6:6.2f} us  new {new / NUMBER * 1e6:6.2f} us"
+              f"  ({old / new:5.1f}x)")
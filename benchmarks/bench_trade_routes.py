@@ -0,0 +1,76 @@
+#!/bin/python3
+"""
+Trade route benchmark: building the station-to-station distance table
+(one breadth-first search per station system, as find_nearest_by_security
+walks the map, against the planner's single all-sources pass), checked to
+agree, and how long ranking the trade loops takes from a few systems, cold
+(distances and station prices not yet computed) and warm.
+
+Run from the repository root:
+    python benchmarks/bench_trade_routes.py
+"""
+import json
+import os
+import sys
+import time
+from collections import deque
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from market import Market
+from trade_routes import UNREACHABLE, TradePlanner
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+STARTS = ["The Citadel", "Ab Finjeo", "Aban"]
+HOLDINGS = {"Korrelite Ore": 60, "Metal Scraps": 300, "Axnit Ore": 12, "Water Ice": 40}
+
+
+def bfs_rows(systems, station_systems):
+    rows = []
+    for source in station_systems:
+        visited = {source: 0}
+        queue = deque([source])
+        while queue:
+            system = queue.popleft()
+            for neighbor in systems[system].get("Connections", []):
+                if neighbor not in visited:
+                    visited[neighbor] = visited[system] + 1
+                    queue.append(neighbor)
+        rows.append(bytes(visited.get(target, UNREACHABLE) for target in station_systems))
+    return rows
+
+
+if __name__ == "__main__":
+    with open(os.path.join(ROOT, "system_data.json"), 'r') as f:
+        systems = json.load(f)
+    with open(os.path.join(ROOT, "items.json"), 'r') as f:
+        items_data = {item['name']: item for item in json.load(f)['items']}
+
+    planner = TradePlanner(systems)
+    count = len(planner.station_systems)
+
+    start = time.perf_counter()
+    expected = bfs_rows(systems, planner.station_systems)
+    old = time.perf_counter() - start
+    start = time.perf_counter()
+    rows = planner.distances()
+    new = time.perf_counter() - start
+    assert [bytes(row) for row in rows] == expected
+    print(f"Distances between {count} station systems: {old:.2f} s (BFS per system) -> {new:.2f} s (all at once)")
+
+    prices = Market(items_data, seed=1)
+    fresh = TradePlanner(systems)
+    start = time.perf_counter()
+    plans = fresh.plan(STARTS[0], HOLDINGS, prices)
+    print(f"First plan from {STARTS[0]} (distances and station prices included): "
+          f"{(time.perf_counter() - start) * 1000:.0f} ms")
+
+    for system in STARTS:
+        start = time.perf_counter()
+        plans = planner.plan(system, HOLDINGS, prices)
+        elapsed = time.perf_counter() - start
+        best = plans[0] if plans else None
+        summary = (f"best +{best['gain']} CR over selling here in {best['jumps']} jumps "
+                   f"({' -> '.join(f'{action} @ {station}' for station, _, action in best['stops'])})"
+                   if best else "no plans")
+        print(f"  from {system:<12} {elapsed * 1000:6.1f} ms  {summary}")
@@ -0,0 +1,125 @@
+#!/bin/python3
+"""
+Turret mining loop benchmark: CPU time of a 30-minute turret mining session
+with the old loop (the whole screen reprinted and Discord presence refreshed
+every 100 ms, which re-reads the settings and parses system_data.json)
+against the fixed fire tick with diff rendering (the loop wakes only for the
+beam animation's frames, three a second, rewrites the lines that changed and
+refreshes presence when the mining state changes).
+
+The CPU cost of each kind of wakeup is measured on a sample and scaled to
+the session; terminal output goes to an in-memory stream.
+
+Run from the repository root:
+    python benchmarks/bench_turret_mining.py
+"""
+import io
+import json
+import os
+import sys
+import time
+from contextlib import redirect_stdout
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from mining import FIRE_INTERVAL
+from screen_buffer import capture_frame, draw_changed_lines, screen_frame
+
+ROOT = Path(__file__).resolve().parent.parent
+SESSION = 30 * 60
+OLD_TICK = 0.1
+BEAM_FRAME_INTERVAL = 1 / 3
+SAMPLE = 300
+TURRETS = ["Mining Laser I", "Mining Laser I", "Mining Laser II"]
+
+
+def presence():
+    """What update_discord_presence(data, "mining") does before talking to Discord"""
+    settings = json.dumps({"adaptive_discord_presence": True, "ambiance_volume": 100})
+    json.loads(settings)
+    with open(ROOT / "system_data.json", 'r') as f:
+        json.load(f)
+
+
+def screen(now, remaining_ore, stability):
+    print("=" * 60 + "\033[K")
+    print("  MINING ASTEROID  [TURRET MODE]\033[K")
+    print("=" * 60 + "\033[K")
+    print("\033[K")
+    print("  Ore: Korrelite Ore\033[K")
+    print("  Ship: Ozark (Miner)\033[K")
+    print("  Mining Skill: Level 5  |  Turret Efficiency: +40%\033[K")
+    print("\033[K")
+    print(f"  Ore Remaining: {int(remaining_ore)}/96 ({remaining_ore / 96 * 100:.1f}%)\033[K")
+    print(f"  Asteroid Stability: \033[32m{stability:.1f}%\033[0m\033[K")
+    filled = int(stability / 100 * 40)
+    print(f"  [\033[32m{'█' * filled}{'░' * (40 - filled)}\033[0m]\033[K")
+    print("\033[K")
+    print("  Mining Turrets:\033[K")
+    for i, name in enumerate(TURRETS):
+        print(f"  [{chr(ord('a') + i)}] Turret {i + 1} ({name}): Power 3 (Medium)\033[K")
+    print("\033[K")
+    beam_dots = "." * (int(now / BEAM_FRAME_INTERVAL) % 4)
+    print(f"  Mining beam active{beam_dots:<3}  {len(TURRETS)} turret(s) firing continuously\033[K")
+    print("\033[K")
+    print("  [ESC] Stop mining\033[K")
+
+
+def ore_at(now):
+    # Ore and stability move on each fire tick, as they do while mining
+    ticks = int(now / FIRE_INTERVAL)
+    return 96 - (ticks % 60) * 1.5, 100 - (ticks % 20) * 4.5
+
+
+def old_wakeup(now):
+    with screen_frame():
+        print("\033[H", end="", flush=True)
+        presence()
+        screen(now, *ore_at(now))
+        print("\033[J", end="", flush=True)
+
+
+def new_wakeup(now, shown):
+    with capture_frame() as frame:
+        screen(now, *ore_at(now))
+    lines = frame.getvalue().split("\n")
+    draw_changed_lines(lines, shown)
+    return lines
+
+
+def measure(wakeup_times, wakeup):
+    """CPU seconds and characters written for a sample of wakeups"""
+    out = io.StringIO()
+    start = time.process_time()
+    with redirect_stdout(out):
+        wakeup(wakeup_times)
+    return time.process_time() - start, len(out.getvalue())
+
+
+if __name__ == "__main__":
+    old_wakeups = int(SESSION / OLD_TICK)
+    new_wakeups = int(SESSION / BEAM_FRAME_INTERVAL)
+
+    def run_old(times):
+        for now in times:
+            old_wakeup(now)
+
+    def run_new(times):
+        shown = None
+        presence()
+        for now in times:
+            shown = new_wakeup(now, shown)
+
+    old_cpu, old_chars = measure([i * OLD_TICK for i in range(SAMPLE)], run_old)
+    new_cpu, new_chars = measure([i * BEAM_FRAME_INTERVAL for i in range(SAMPLE)], run_new)
+    old_total = old_cpu / SAMPLE * old_wakeups
+    new_total = new_cpu / SAMPLE * new_wakeups
+
+    print(f"Turret mining session of {SESSION // 60} minutes")
+    print(f"  wakeups            {old_wakeups:8} -> {new_wakeups:6}")
+    print(f"  presence refreshes {old_wakeups:8} -> {1:6}")
+    print(f"  characters drawn   {old_chars / SAMPLE * old_wakeups / 1024:6.0f} KB -> "
+          f"{new_chars / SAMPLE * new_wakeups / 1024:4.0f} KB")
+    print(f"  CPU time           {old_total:7.1f} s -> {new_total:5.2f} s "
+          f"({old_total / SESSION * 100:.1f}% -> {new_total / SESSION * 100:.2f}% of one core)")
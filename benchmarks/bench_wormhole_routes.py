@@ -0,0 +1,92 @@
+#!/bin/python3
+"""
+Wormhole routing benchmark: the old breadth-first find_route_to_destination
+(a full search on every screen redraw) against WormholeRouter's cached route
+trees, and keeping those trees up to date as wormholes are scanned and
+collapse (incremental repair) against rebuilding them.
+
+Run from the repository root:
+    python benchmarks/bench_wormhole_routes.py
+"""
+import json
+import os
+import random
+import sys
+import timeit
+from collections import deque
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from wormhole_routes import WormholeRouter, CACHED_TREES
+
+ROOT = Path(__file__).resolve().parent.parent
+REPEAT = 5
+
+
+def bfs_route(start_system, end_system, all_systems_data):
+    """find_route_to_destination before the router (gates only)"""
+    if start_system == end_system:
+        return [start_system]
+    visited = {start_system}
+    queue = deque([(start_system, [start_system])])
+    while queue:
+        current, path = queue.popleft()
+        system_info = all_systems_data.get(current)
+        if not system_info:
+            continue
+        for neighbor in system_info.get("Connections", []):
+            if neighbor == end_system:
+                return path + [neighbor]
+            if neighbor not in visited:
+                visited.add(neighbor)
+                queue.append((neighbor, path + [neighbor]))
+    return None
+
+
+def best(func, number):
+    return min(timeit.repeat(func, number=number, repeat=REPEAT)) / number
+
+
+if __name__ == "__main__":
+    with open(ROOT / "system_data.json", 'r') as f:
+        systems = json.load(f)
+    rng = random.Random(3)
+    names = list(systems)
+    reachable = WormholeRouter(systems)._build(names[0])[0]
+    start = names[0]
+    end = max(reachable, key=reachable.get)
+
+    router = WormholeRouter(systems)
+    assert len(router.route(start, end, 0)) == len(bfs_route(start, end, systems))
+    print(f"Route across the galaxy ({len(bfs_route(start, end, systems)) - 1} jumps)")
+    print(f"  breadth-first search      {best(lambda: bfs_route(start, end, systems), 20) * 1000:8.3f} ms")
+    print(f"  cached route tree         {best(lambda: router.route(start, end, 0), 2000) * 1000:8.3f} ms")
+
+    # Scanned wormholes appearing and collapsing, with CACHED_TREES start systems cached
+    starts = rng.sample(list(reachable), CACHED_TREES)
+    edges = [((f"wh-{i}", "x"), rng.choice(names), rng.choice(names), 1e12) for i in range(200)]
+
+    def churn(incremental):
+        router = WormholeRouter(systems)
+        for system in starts:
+            router.route(system, end, 0)
+        for key, system, destination, expires_at in edges:
+            router.add_edge(key, system, destination, expires_at)
+            if not incremental:
+                router._trees.clear()
+            for system in starts:
+                router.route(system, end, 0)
+        for key, *_ in edges:
+            router.remove_edge(key)
+            if not incremental:
+                router._trees.clear()
+            for system in starts:
+                router.route(system, end, 0)
+        return router
+
+    incremental = best(lambda: churn(True), 1) / (2 * len(edges))
+    rebuilt = best(lambda: churn(False), 1) / (2 * len(edges))
+    print(f"Wormhole scanned or collapsed, {CACHED_TREES} cached route trees")
+    print(f"  rebuild the trees         {rebuilt * 1000:8.3f} ms")
+    print(f"  repair the trees          {incremental * 1000:8.3f} ms")
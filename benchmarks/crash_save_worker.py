@@ -0,0 +1,104 @@
+#!/bin/python3
+"""
+Kill test for the background save worker (POSIX only).
+
+A child process submits a burst of late-game saves through a SaveWorker,
+bumping the credits by one per save and reporting each submit on stdout. The
+parent kills it in the middle of the burst and then checks save.dat:
+
+    SIGKILL  save.dat must still be a complete, parseable save, no newer than
+             the last submit and at most `max_delay` seconds of saves behind
+             (plus WRITE_TIME for the write itself to land).
+    SIGTERM  the child flushes like the game does (exit_game), so save.dat
+             must hold the last save submitted before the signal.
+
+Run from the repository root:
+    python benchmarks/crash_save_worker.py
+"""
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from save_engine import SaveEngine, SaveWorker
+
+BURST = 60
+KILL_AFTER = 25
+DEBOUNCE = 0.05
+MAX_DELAY = 0.2
+WRITE_TIME = 0.1
+START_CREDITS = 1000
+
+
+def child(saves_dir):
+    from bench_save import late_game_save
+
+    worker = SaveWorker(SaveEngine(saves_dir), debounce=DEBOUNCE, max_delay=MAX_DELAY)
+
+    def on_sigterm(sig, frame):
+        worker.close()
+        sys.exit(0)
+    signal.signal(signal.SIGTERM, on_sigterm)
+
+    data = late_game_save()
+    data["credits"] = START_CREDITS
+    for i in range(BURST):
+        data["credits"] = START_CREDITS + i
+        worker.submit("crash", data)
+        print(i, time.monotonic(), flush=True)
+        time.sleep(0.01)
+    worker.close()
+
+
+def run(sig):
+    with tempfile.TemporaryDirectory() as tmp:
+        proc = subprocess.Popen([sys.executable, __file__, "--child", tmp],
+                                stdout=subprocess.PIPE, text=True)
+        last = None
+        submitted = []
+        for line in proc.stdout:
+            index, submitted_at = line.split()
+            last = (int(index), float(submitted_at))
+            submitted.append(last[1])
+            if last[0] + 1 >= KILL_AFTER:
+                break
+        killed_at = time.monotonic()
+        proc.send_signal(sig)
+        proc.wait()
+
+        engine = SaveEngine(tmp)
+        path = engine.save_path("crash")
+        if not path.exists():
+            return f"no save.dat written after {last[0] + 1} submits"
+        leftovers = len(list(path.parent.iterdir())) - 1
+        saved = engine.load("crash")["credits"] - START_CREDITS
+        assert list(path.parent.iterdir()) == [path], "load() left temp files behind"
+
+    # How long the oldest save that did not reach the disk had been queued
+    behind = killed_at - submitted[saved + 1] if saved < last[0] else 0.0
+    if sig == signal.SIGTERM:
+        assert saved >= last[0], f"SIGTERM lost saves: on disk {saved}, submitted {last[0]}"
+    else:
+        assert saved <= last[0] + 1, f"save from the future: {saved} > {last[0] + 1}"
+        # The oldest lost save was queued no more than max_delay (and a write) before the kill
+        assert behind <= MAX_DELAY + WRITE_TIME, \
+            f"save on disk is {behind * 1000:.0f} ms behind (max_delay {MAX_DELAY * 1000:.0f} ms)"
+    return (f"submitted {last[0] + 1}, on disk #{saved + 1}, "
+            f"{max(0, last[0] - saved)} lost ({behind * 1000:.0f} ms behind), "
+            f"temp files cleaned up on load: {leftovers}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3 and sys.argv[1] == "--child":
+        child(sys.argv[2])
+        sys.exit(0)
+    if os.name == 'nt':
+        print("Signals needed for this test are POSIX only")
+        sys.exit(0)
+
+    for sig in (signal.SIGKILL, signal.SIGTERM):
+        print(f"{sig.name:<8} {run(sig)}")
@@ -0,0 +1,162 @@
+"""
+Recording and deterministic replay of combat encounters.
+
+A recording holds everything an encounter depends on: the RNG seed, the enemy
+fleet and save data it started from, and every clock read and player input
+made on the game thread, each stamped with its offset from the start of the
+encounter. Replaying feeds the same clock values and inputs back in the same
+order, so with the same seed the encounter plays out identically - which makes
+recorded fights usable as benchmark and regression fixtures.
+
+This module only deals with the event log and its file format; main.py owns
+installing the hooks around enemy_encounter (see record_encounter and
+replay_combat there).
+"""
+import json
+import threading
+from copy import deepcopy
+from time import perf_counter, sleep, strftime
+
+RECORDING_FORMAT = 1
+
+# Event kinds recorded on the game thread
+CLOCK = "time"         # time() reads
+NUMPAD_KEY = "numpad"  # get_numpad_key() results (real-time combat input)
+MENU_KEY = "key"       # get_key() results (arrow menus)
+TEXT_INPUT = "input"   # input() results (prompts such as "Press Enter...")
+
+
+class ReplayDivergence(Exception):
+    """Raised when a replay asks for a different event than was recorded"""
+
+
+class CombatRecording:
+    """Seed, starting state and timestamped event log of one encounter"""
+
+    def __init__(self, seed, enemy_fleet, system, data, app_version=None):
+        self.seed = seed
+        self.enemy_fleet = deepcopy(enemy_fleet)
+        self.system = deepcopy(system)
+        self.data = deepcopy(data)
+        self.app_version = app_version
+        self.recorded_at = strftime('%Y-%m-%d %H:%M:%S')
+        self.events = []        # [kind, seconds since start, value]
+        self.outcome = None
+        self.final_state = None
+
+    def to_dict(self):
+        return {
+            "format": RECORDING_FORMAT,
+            "app_version": self.app_version,
+            "recorded_at": self.recorded_at,
+            "seed": self.seed,
+            "enemy_fleet": self.enemy_fleet,
+            "system": self.system,
+            "data": self.data,
+            "events": self.events,
+            "outcome": self.outcome,
+            "final_state": self.final_state,
+        }
+
+    @classmethod
+    def from_dict(cls, d):
+        if d.get("format") != RECORDING_FORMAT:
+            raise ValueError(f"Unsupported combat recording format: {d.get('format')}")
+        rec = cls(d["seed"], d["enemy_fleet"], d["system"], d["data"], d.get("app_version"))
+        rec.recorded_at = d.get("recorded_at")
+        rec.events = d["events"]
+        rec.outcome = d.get("outcome")
+        rec.final_state = d.get("final_state")
+        return rec
+
+    def save(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'r') as f:
+            return cls.from_dict(json.load(f))
+
+
+def summarize_state(data):
+    """The parts of the save an encounter changes, used to check a replay's result"""
+    ship_idx = data.get("active_ship", 0)
+    ships = data.get("ships", [])
+    ship = ships[ship_idx] if 0 <= ship_idx < len(ships) else {}
+    return {
+        "hull_hp": ship.get("hull_hp"),
+        "shield_hp": ship.get("shield_hp"),
+        "credits": data.get("credits"),
+        "skills": dict(data.get("skills", {})),
+    }
+
+
+class CombatRecorder:
+    """Wraps game-thread I/O functions so their results are logged
+
+    Calls from other threads (e.g. the music monitor) and calls nested inside
+    another wrapped call pass straight through unlogged, so the log contains
+    exactly the calls a replay will have to answer.
+    """
+
+    def __init__(self, recording):
+        self.recording = recording
+        self._thread = threading.current_thread()
+        self._start = perf_counter()
+        self._depth = 0
+
+    def wrap(self, kind, func):
+        def recorded(*args, **kwargs):
+            if threading.current_thread() is not self._thread or self._depth:
+                return func(*args, **kwargs)
+            self._depth += 1
+            try:
+                value = func(*args, **kwargs)
+            finally:
+                self._depth -= 1
+            self.recording.events.append([kind, round(perf_counter() - self._start, 6), value])
+            return value
+        return recorded
+
+
+class CombatReplayer:
+    """Answers game-thread I/O calls from a recording's event log
+
+    Args:
+        recording: CombatRecording to play back
+        realtime: If True, each event is delayed until its recorded offset so
+            the fight runs at the original pace; otherwise it runs flat out.
+    """
+
+    def __init__(self, recording, realtime=False):
+        self.recording = recording
+        self.realtime = realtime
+        self._thread = threading.current_thread()
+        self._pos = 0
+        self._start = perf_counter()
+
+    @property
+    def finished(self):
+        return self._pos >= len(self.recording.events)
+
+    def next_event(self, kind):
+        if self.finished:
+            raise ReplayDivergence(f"Recording ran out of events (wanted '{kind}')")
+        rec_kind, offset, value = self.recording.events[self._pos]
+        if rec_kind != kind:
+            raise ReplayDivergence(
+                f"Event {self._pos}: replay wanted '{kind}' but recording has '{rec_kind}'")
+        self._pos += 1
+        if self.realtime:
+            wait = offset - (perf_counter() - self._start)
+            if wait > 0:
+                sleep(wait)
+        return value
+
+    def wrap(self, kind, func):
+        def replayed(*args, **kwargs):
+            if threading.current_thread() is not self._thread:
+                return func(*args, **kwargs)
+            return self.next_event(kind)
+        return replayed
@@ -0,0 +1,128 @@
+"""
+Array-backed state for the real-time combat loop.
+
+Projectiles are kept as a structure of arrays (target, speed, landing time)
+ordered by the clock time they land at. A frame update is then just a clock
+advance plus a binary search: the projectiles that landed are always a prefix
+of the arrays and are cut off with one slice instead of being removed one by
+one. Progress is derived from the landing time only when the UI asks for it.
+Enemy aggregates (alive count, damage sum) are maintained incrementally as
+ships die instead of being recomputed every frame.
+"""
+from array import array
+from bisect import bisect_right
+
+
+class ProjectileStore:
+    """Structure-of-arrays store for in-flight enemy projectiles"""
+
+    def __init__(self):
+        self.clock = 0.0              # Seconds of round time simulated so far
+        self.target = array('b')      # Grid position (1-9) each projectile is aimed at
+        self.speed = array('d')       # Progress per second
+        self.land_at = array('d')     # Clock time the projectile lands (sorted ascending)
+
+    def __len__(self):
+        return len(self.target)
+
+    def __bool__(self):
+        return len(self.target) > 0
+
+    def spawn(self, target_position, speed):
+        """Add a new projectile heading for target_position"""
+        land_at = self.clock + 1.0 / speed
+        idx = bisect_right(self.land_at, land_at)
+        self.target.insert(idx, target_position)
+        self.speed.insert(idx, speed)
+        self.land_at.insert(idx, land_at)
+
+    def clear(self):
+        """Drop every in-flight projectile"""
+        del self.target[:]
+        del self.speed[:]
+        del self.land_at[:]
+
+    def advance(self, delta_time):
+        """Move every projectile forward and remove the ones that landed
+
+        Returns:
+            array: Target positions of the projectiles that landed this frame
+        """
+        self.clock += delta_time
+        landed_count = bisect_right(self.land_at, self.clock)
+        landed = self.target[:landed_count]
+        if landed_count:
+            del self.target[:landed_count]
+            del self.speed[:landed_count]
+            del self.land_at[:landed_count]
+        return landed
+
+    def progress(self):
+        """Progress (0.0 = just fired, 1.0 = landed) of every projectile, in store order"""
+        clock = self.clock
+        return [1.0 - (t - clock) * s for t, s in zip(self.land_at, self.speed)]
+
+    def targeted_positions(self, min_progress=0.0):
+        """Set of grid positions targeted by projectiles at least min_progress along"""
+        return {t for t, p in zip(self.target, self.progress()) if p >= min_progress}
+
+    def closest(self, count):
+        """(progress, target) pairs of the count projectiles furthest along"""
+        pairs = sorted(zip(self.progress(), self.target), reverse=True)
+        return pairs[:count]
+
+
+def is_enemy_alive(enemy):
+    """An enemy is alive while it has any hull or shield left"""
+    return enemy.get('hull_hp', 0) > 0 or enemy.get('shield_hp', 0) > 0
+
+
+class EnemyRoster:
+    """Alive enemies of a combat round with running aggregates
+
+    ``ships`` is a plain list so it can be handed to code that expects the old
+    ``alive_enemies`` list. Call ``mark_dirty`` after applying damage; dead
+    ships are then pruned on the next ``refresh`` and the damage sum is
+    adjusted by only the ships that died.
+    """
+
+    def __init__(self, enemies):
+        self.ships = [ship for ship in enemies if is_enemy_alive(ship)]
+        self.damage_sum = sum(ship.get('damage', 0) for ship in self.ships)
+        self._dirty = False
+
+    def __len__(self):
+        return len(self.ships)
+
+    @property
+    def alive_count(self):
+        return len(self.ships)
+
+    @property
+    def avg_damage(self):
+        """Average damage of the alive enemies (0 if none are left)"""
+        return self.damage_sum / len(self.ships) if self.ships else 0
+
+    def mark_dirty(self):
+        """Flag that damage was applied and some ships may have died"""
+        self._dirty = True
+
+    def refresh(self):
+        """Prune dead ships if anything was damaged since the last refresh
+
+        The list is filtered in place so references held elsewhere stay valid.
+
+        Returns:
+            int: Number of ships removed
+        """
+        if not self._dirty:
+            return 0
+        self._dirty = False
+
+        dead = [ship for ship in self.ships if not is_enemy_alive(ship)]
+        if not dead:
+            return 0
+        for ship in dead:
+            self.damage_sum -= ship.get('damage', 0)
+        self.ships[:] = [ship for ship in self.ships if is_enemy_alive(ship)]
+        return len(dead)
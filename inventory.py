@@ -0,0 +1,227 @@
+"""
+Items held across the save's locations ("inventory" and "storage").
+
+The save keeps one {item: quantity} dict per location, and crafting,
+assembly, transfers and the marketplace used to read both and add them up
+(or merge them into a new dict) every time they needed a total. Inventory
+wraps each location in a Counter that reports every change, so the
+combined total of every item is kept up to date as a third Counter and
+"how many do I have?" is a single lookup.
+
+The wrapped locations replace the plain dicts in the save in place. They
+are still dicts with the same keys and quantities, so they serialize to
+the existing save layout, and code that assigns or deletes entries
+directly keeps the totals right. Entries are removed (not left at zero)
+when a quantity runs out.
+
+transaction() groups changes: if anything inside raises, every change made
+inside it is undone.
+"""
+from collections import Counter
+from contextlib import contextmanager
+from copy import deepcopy
+
+LOCATIONS = ("inventory", "storage")
+
+
+class InsufficientItems(ValueError):
+    """Raised when a debit asks for more of an item than a location (or all of them) holds"""
+
+
+class Location(Counter):
+    """One location's items; every change is reported to its Inventory"""
+
+    def __init__(self, owner, name, items=None):
+        super().__init__()
+        self.owner = owner
+        self.name = name
+        if items:
+            dict.update(self, items)
+
+    def __setitem__(self, item, quantity):
+        before = dict.get(self, item)
+        dict.__setitem__(self, item, quantity)
+        self.owner._changed(self, item, before, quantity)
+
+    def __delitem__(self, item):
+        if item in self:
+            before = dict.__getitem__(self, item)
+            dict.__delitem__(self, item)
+            self.owner._changed(self, item, before, None)
+
+    def pop(self, item, *default):
+        if item in self:
+            quantity = dict.__getitem__(self, item)
+            del self[item]
+            return quantity
+        if default:
+            return default[0]
+        raise KeyError(item)
+
+    def popitem(self):
+        if not self:
+            raise KeyError("popitem(): location is empty")
+        item = next(reversed(self))
+        return item, self.pop(item)
+
+    def setdefault(self, item, default=None):
+        if item not in self:
+            self[item] = default
+        return dict.__getitem__(self, item)
+
+    def clear(self):
+        for item in list(self):
+            del self[item]
+
+    def update(self, *args, **kwds):
+        for item, quantity in Counter(*args, **kwds).items():
+            self[item] = self.get(item, 0) + quantity
+
+    def subtract(self, *args, **kwds):
+        for item, quantity in Counter(*args, **kwds).items():
+            self[item] = self.get(item, 0) - quantity
+
+    def copy(self):
+        return Counter(self)
+
+    def __reduce__(self):
+        return dict, (dict(self),)
+
+    def __deepcopy__(self, memo):
+        return deepcopy(dict(self), memo)
+
+
+class Inventory:
+    """Per-location item Counters of one save, with a combined total index
+
+    Call bind(data) before use; it reindexes only when a different save dict
+    (or a replaced location dict) is passed in.
+    """
+
+    def __init__(self):
+        self._data = None
+        self._locations = {}
+        self._total = Counter()
+        self._journal = None
+
+    def bind(self, data):
+        """Index a save's items; cheap if data is already indexed"""
+        if data is self._data and all(data.get(name) is self._locations.get(name) for name in LOCATIONS):
+            return self
+        self._data = data
+        self._locations = {}
+        self._total = Counter()
+        for name in LOCATIONS:
+            location = data[name] = Location(self, name, data.get(name))
+            self._locations[name] = location
+            for item, quantity in location.items():
+                self._total[item] += quantity
+        self._total = +self._total
+        return self
+
+    def _changed(self, location, item, before, after):
+        if self._locations.get(location.name) is not location:
+            # A location of a save this inventory no longer indexes
+            return
+        if self._journal is not None:
+            self._journal.append((location, item, before))
+        total = self._total.get(item, 0) + (after or 0) - (before or 0)
+        if total:
+            dict.__setitem__(self._total, item, total)
+        else:
+            dict.pop(self._total, item, None)
+
+    def __getitem__(self, location):
+        return self._locations[location]
+
+    def count(self, item, location=None):
+        """Quantity of an item in one location, or in all of them"""
+        if location is None:
+            return self._total.get(item, 0)
+        return self._locations[location].get(item, 0)
+
+    def totals(self):
+        """{item: quantity} over every location"""
+        return dict(self._total)
+
+    def has(self, requirements, times=1):
+        """True if every location together holds requirements ({item: quantity}) times over"""
+        held = self._total.get
+        for item, quantity in requirements.items():
+            if held(item, 0) < quantity * times:
+                return False
+        return True
+
+    def max_times(self, requirements):
+        """How many times over every location together holds requirements"""
+        return min((self._total.get(item, 0) // quantity for item, quantity in requirements.items() if quantity > 0),
+                   default=0)
+
+    def credit(self, location, item, quantity):
+        """Add quantity of an item to a location"""
+        if quantity:
+            items = self._locations[location]
+            items[item] = dict.get(items, item, 0) + quantity
+
+    def debit(self, location, item, quantity):
+        """Remove quantity of an item from a location
+
+        Raises:
+            InsufficientItems: The location holds fewer than quantity
+        """
+        items = self._locations[location]
+        held = items.get(item, 0)
+        if held < quantity:
+            raise InsufficientItems(f"{location} has {held}x {item}, {quantity} needed")
+        if held == quantity:
+            del items[item]
+        elif quantity:
+            items[item] = held - quantity
+
+    def take(self, requirements, times=1, order=LOCATIONS):
+        """Remove requirements ({item: quantity}) times over, from the locations in order
+
+        Nothing is removed unless everything can be.
+
+        Returns:
+            dict: {location: {item: quantity taken}}
+        """
+        taken = {}
+        with self.transaction():
+            for item, quantity in requirements.items():
+                needed = quantity * times
+                if self._total.get(item, 0) < needed:
+                    raise InsufficientItems(f"{self._total.get(item, 0)}x {item} held, {needed} needed")
+                for location in order:
+                    amount = min(needed, self.count(item, location))
+                    if amount:
+                        self.debit(location, item, amount)
+                        taken.setdefault(location, {})[item] = amount
+                        needed -= amount
+        return taken
+
+    def move(self, item, quantity, source, destination):
+        """Move quantity of an item from one location to another"""
+        with self.transaction():
+            self.debit(source, item, quantity)
+            self.credit(destination, item, quantity)
+
+    @contextmanager
+    def transaction(self):
+        """Undo every change made inside the block if it raises (nested blocks join the outer one)"""
+        if self._journal is not None:
+            yield self
+            return
+        self._journal = []
+        try:
+            yield self
+        except BaseException:
+            journal, self._journal = self._journal, None
+            for location, item, before in reversed(journal):
+                if before is None:
+                    del location[item]
+                else:
+                    location[item] = before
+            raise
+        finally:
+            self._journal = None
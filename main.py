@@ -5,19 +5,41 @@ A text-based recreation of the Roblox game Starscape by Zolar Keth
 import math
 import random
 import signal
+import statistics
 import sys
 import json
 import os
 import platform
+import shutil
 import subprocess
 import threading
+from contextlib import contextmanager
 from pathlib import Path
-from io import StringIO
-from time import sleep, time
+from time import sleep, time, strftime, localtime
 from uuid import uuid4
 from urllib.request import urlopen, Request
 from urllib.error import URLError, HTTPError
 from colors import set_color, set_background_color, reset_color, get_color, get_background_color
+from combat_state import ProjectileStore, EnemyRoster
+from save_engine import SaveEngine, SaveWorker
+from save_codec import SAVE_VERSION
+from anomaly_store import AnomalyStore
+from anomaly_seed import AnomalySeeder, MAX_ANOMALIES, new_seed
+from wormhole_routes import WormholeRouter, known_wormholes
+from trade_routes import TradePlanner, DEFAULT_CARGO_LIMIT, DEFAULT_MAX_JUMPS
+from manufacturing import ManufacturingQueue, station_slots
+from inventory import Inventory, InsufficientItems
+from market import Market
+from mining import (FIRE_INTERVAL, TURRET_EFFICIENCY_BONUS, INTENSITY_NAMES, ORE_XP, DEFAULT_ORE_XP,
+                    ORE_SOURCES, DEFAULT_SOURCE, mining_efficiency, blast, event_table, draw_event,
+                    event_outcome, optimize, yield_table)
+from refinery import REFINING_RULES, SCRAP_ITEM, SCRAP_SUCCESS_CHANCE, refine, refine_all
+from screen_buffer import screen_frame, capture_frame, clear_screen, draw_changed_lines
+from text_layout import visual_width, box_line, wrap_text, create_health_bar
+from menu_view import MenuView, MIN_WINDOW
+from perf_stats import PerfMonitor
+from combat_replay import (CombatRecording, CombatRecorder, CombatReplayer, ReplayDivergence,
+                           summarize_state, CLOCK, NUMPAD_KEY, MENU_KEY, TEXT_INPUT)
 
 # Discord Rich Presence support
 try:
@@ -46,7 +68,7 @@ if not DISCORD_AVAILABLE or not MUSIC_AVAILABLE:
 
 # Version codes
 APP_VERSION_CODE = "0.1.3.3"  # 0.1.x = alpha; 0.2.x = beta; 1.x = release
-SAVE_VERSION_CODE = 2         # Save format version code
+SAVE_VERSION_CODE = SAVE_VERSION  # Save format version code (older saves are migrated by save_codec)
 
 # Color codes
 CORE_COLOR = "\033[1;32m"     # lime
@@ -62,6 +84,32 @@ DISCORD_CLIENT_ID = "1469089302578200799"
 # Global Discord RPC instance
 discord_rpc = None
 
+# Global save engine (tracks what each save last wrote to disk) and the
+# background worker that performs its writes
+save_engine = SaveEngine()
+save_worker = SaveWorker(save_engine)
+
+# Expiry index over the loaded save's anomalies (rebinds when another save is loaded)
+anomaly_store = AnomalyStore()
+
+# Seeded anomaly generator over system_data.json, built on first use
+anomaly_seeder = None
+
+# Routes over gates and known wormholes, with cached route trees
+wormhole_router = None
+
+# Trade loop planner with station-to-station distances, built on first use
+trade_planner = None
+
+# Completion heap and per-group totals over the loaded save's manufacturing jobs
+manufacturing_queue = ManufacturingQueue()
+
+# Per-location item counts of the loaded save, with a combined total per item
+player_inventory = Inventory()
+
+# Dynamic marketplace prices over items.json, built on first use
+market = None
+
 # Global combat tracker for preventing keyboard interrupt during combat
 in_combat = False
 
@@ -82,6 +130,8 @@ class MusicManager:
         self._mode = None          # 'ambiance' | 'battle' | 'vex' | 'intro' | 'menu' | None
         self._ambiance_queue = []
         self._battle_queue   = []
+        # Own RNG so track shuffling never advances the (possibly seeded) global one
+        self._rng = random.Random()
         self._monitor_thread = None
         self._stop_monitor   = False
         # Per-mode volumes (0.0–1.0); loaded from settings on first use
@@ -113,12 +163,12 @@ class MusicManager:
         """Return the next ambiance path, refilling & reshuffling when empty."""
         if not self._ambiance_queue:
             pool = self._AMBIANCE_FILES.copy()
-            random.shuffle(pool)
+            self._rng.shuffle(pool)
             # Avoid immediately repeating the track that just finished
             if self._current_track and len(pool) > 1:
                 just_played = self._current_track
                 while pool[0] == just_played:
-                    random.shuffle(pool)
+                    self._rng.shuffle(pool)
             self._ambiance_queue = pool
         return self._ambiance_queue.pop(0)
 
@@ -126,11 +176,11 @@ class MusicManager:
         """Return the next battle path, cycling randomly."""
         if not self._battle_queue:
             pool = self._BATTLE_FILES.copy()
-            random.shuffle(pool)
+            self._rng.shuffle(pool)
             if self._current_track and len(pool) > 1:
                 just_played = self._current_track
                 while pool[0] == just_played:
-                    random.shuffle(pool)
+                    self._rng.shuffle(pool)
             self._battle_queue = pool
         return self._battle_queue.pop(0)
 
@@ -266,6 +316,9 @@ class MusicManager:
 # Global music instance
 music = MusicManager()
 
+# Global frame-time instrumentation (enabled from settings)
+perf = PerfMonitor()
+
 
 def resource_path(relative_path):
     """Get absolute path to resource, works for dev and for PyInstaller"""
@@ -714,22 +767,45 @@ fi
 
 def read_data(save_name):
     """Load game data from save file"""
-    save_path = Path.home() / ".starscape_text_adventure" / "saves" / save_name / "save.json"
+    # Make sure saves still queued in the background worker are on disk first
+    save_worker.flush()
+    data = save_engine.load(save_name)
+    if data is not None and "anomaly_seed" in data:
+        # Saves hold only what changed about seeded anomalies; regenerate the rest
+        get_anomaly_seeder().expand(data["anomaly_seed"], data["anomalies"])
+    return data
 
-    if not save_path.exists():
-        return None
 
-    with open(save_path, 'r') as f:
-        return json.load(f)
+def save_data(save_name, data):
+    """Save game data to file
+
+    The data is snapshotted immediately and written by the background save
+    worker; bursts of saves are coalesced and unchanged saves are skipped.
+    Seeded anomalies are stored as the changes made to them.
+    """
+    if "anomaly_seed" in data:
+        data = dict(data, anomalies=get_anomaly_seeder().compact(data["anomalies"]))
+    save_worker.submit(save_name, data)
 
 
-def save_data(save_name, data):
-    """Save game data to file"""
-    save_path = Path.home() / ".starscape_text_adventure" / "saves" / save_name / "save.json"
-    save_path.parent.mkdir(parents=True, exist_ok=True)
+def get_anomaly_seeder():
+    """The AnomalySeeder for system_data.json, loaded on first use"""
+    global anomaly_seeder
+    if anomaly_seeder is None:
+        try:
+            with open(resource_path('system_data.json'), 'r') as f:
+                anomaly_seeder = AnomalySeeder(json.load(f))
+        except (OSError, ValueError):
+            anomaly_seeder = AnomalySeeder({})
+    return anomaly_seeder
 
-    with open(save_path, 'w') as f:
-        json.dump(data, f, indent=4)
+
+def get_market():
+    """The marketplace's current prices, built from items.json on first use"""
+    global market
+    if market is None:
+        market = Market(load_items_data(), now=time())
+    return market.advance(time())
 
 
 def get_key():
@@ -743,10 +819,16 @@ def get_key():
                 return 'up'
             elif key == b'P':  # Down arrow
                 return 'down'
+            elif key == b'I':  # Page Up
+                return 'pageup'
+            elif key == b'Q':  # Page Down
+                return 'pagedown'
         elif key == b'\r':  # Enter
             return 'enter'
         elif key == b'\x1b':  # Escape
             return 'esc'
+        elif key == b'\x08':  # Backspace
+            return 'backspace'
         else:
             # Return the actual character
             try:
@@ -769,9 +851,14 @@ def get_key():
                         return 'up'
                     elif ch3 == 'B':  # Down arrow
                         return 'down'
+                    elif ch3 in ('5', '6'):  # Page Up / Page Down (ESC [ 5 ~ / ESC [ 6 ~)
+                        sys.stdin.read(1)
+                        return 'pageup' if ch3 == '5' else 'pagedown'
                 return 'esc'
             elif ch == '\n' or ch == '\r':  # Enter
                 return 'enter'
+            elif ch in ('\x7f', '\x08'):  # Backspace
+                return 'backspace'
             else:
                 # Return the actual character (lowercased)
                 return ch.lower()
@@ -780,61 +867,120 @@ def get_key():
     return None
 
 
-def clear_screen():
-    """Clear the terminal screen"""
-    os.system('cls' if os.name == 'nt' else 'clear')
+def menu_header(title_, previous_content=""):
+    """Screen lines above a menu's options: previous content, then the title"""
+    with capture_frame() as frame:
+        # Re-print previous content if it exists
+        if previous_content:
+            print(previous_content, end='')
+            print()  # Add spacing between content and menu
 
+        title(title_)
+        print()
+    return frame.getvalue().split("\n")[:-1]
 
-def capture_screen_content(func, *args, **kwargs):
-    """Capture the output of a function without displaying it"""
-    old_stdout = sys.stdout
-    sys.stdout = StringIO()
 
-    try:
-        func(*args, **kwargs)
-        output = sys.stdout.getvalue()
-    finally:
-        sys.stdout = old_stdout
+def menu_window(header):
+    """Option rows that fit on the terminal below header (and the menu's footer)"""
+    return max(MIN_WINDOW, shutil.get_terminal_size((80, 24)).lines - len(header) - 3)
 
-    return output
 
+def menu_lines(header, view, filtering=False):
+    """Screen lines of a menu: header, the page of options holding the selection, footer"""
+    lines = list(header)
+    rows = view.rows()
+    for i, is_selected in rows:
+        if is_selected:
+            lines.append(f"  > {view.options[i]}\033[K")
+        else:
+            lines.append(f"    {view.options[i]}\033[K")
+    if not rows:
+        lines.append("    (no matches)\033[K")
+    # Keep the footer in place while filtering shortens the list
+    lines.extend([""] * (view.window - max(len(rows), 1)))
+    lines.append("")
+
+    typing = ", type to filter" if filtering else ""
+    if view.query:
+        lines.append(f"  Filter: {view.query}_ ({len(view.matches)} of {len(view.options)}) | "
+                     f"Backspace/ESC to clear, Enter to select\033[K")
+    elif view.is_paged():
+        top = view.top()
+        shown_to = min(top + view.window, len(view.matches))
+        lines.append(f"  {top + 1}-{shown_to} of {len(view.matches)} | ↑/↓ navigate, PgUp/PgDn page, "
+                     f"Enter to select{typing}\033[K")
+    else:
+        lines.append(f"  Use ↑/↓ arrows to navigate, Enter to select{typing}\033[K")
+    return lines
 
-def display_menu(title_, options, selected_index, previous_content=""):
-    """Display menu with highlighted selection, preserving previous content"""
-    clear_screen()
 
-    # Re-print previous content if it exists
-    if previous_content:
-        print(previous_content, end='')
-        print()  # Add spacing between content and menu
+def draw_menu(lines, shown_lines=None):
+    """Draw menu lines, rewriting only those that differ from shown_lines
 
-    title(title_)
-    print()
+    Falls back to a full redraw when the menu is taller or wider than the
+    terminal, since scrolled or wrapped lines are no longer where the diff
+    expects them.
 
-    for i, option in enumerate(options):
-        if i == selected_index:
-            print(f"  > {option}\033[K")
-        else:
-            print(f"    {option}\033[K")
+    Returns:
+        list: The lines now on screen
+    """
+    size = shutil.get_terminal_size((80, 24))
+    if len(lines) >= size.lines or any(visual_width(line) > size.columns for line in lines):
+        shown_lines = None
+    draw_changed_lines(lines, shown_lines)
+    return lines
 
-    print()
-    print("  Use ↑/↓ arrows to navigate, Enter to select\033[K")
+
+def display_menu(title_, options, selected_index, previous_content="", shown_lines=None):
+    """Display menu with highlighted selection, preserving previous content
+
+    Only the page of options holding the selection is drawn, and only the
+    lines that differ from shown_lines (what the last call returned) are
+    rewritten.
+
+    Returns:
+        list: The lines now on screen
+    """
+    header = menu_header(title_, previous_content)
+    view = MenuView(options, menu_window(header))
+    view.position = selected_index
+    return draw_menu(menu_lines(header, view), shown_lines)
 
 
 def arrow_menu(title, options, previous_content=""):
-    """Display menu with arrow key navigation, return selected index"""
-    selected = 0
+    """Display menu with arrow key navigation, return selected index
+
+    Typing filters the options (Backspace and ESC undo it) and PgUp/PgDn
+    move a page at a time. Moving the selection rewrites just the two lines
+    that changed, however long the list is.
+    """
+    header = menu_header(title, previous_content)
+    view = MenuView(options, menu_window(header))
+    shown_lines = None
 
     while True:
-        display_menu(title, options, selected, previous_content)
+        shown_lines = draw_menu(menu_lines(header, view, filtering=True), shown_lines)
         key = get_key()
 
         if key == 'up':
-            selected = (selected - 1) % len(options)
+            view.move(-1)
         elif key == 'down':
-            selected = (selected + 1) % len(options)
+            view.move(1)
+        elif key == 'pageup':
+            view.page(-1)
+        elif key == 'pagedown':
+            view.page(1)
+        elif key == 'backspace':
+            view.backspace()
+        elif key == 'esc':
+            view.clear_filter()
         elif key == 'enter':
-            return selected
+            if view.selected() is not None:
+                # Leave the cursor below the menu for whatever is printed next
+                print()
+                return view.selected()
+        elif key and len(key) == 1 and key.isprintable():
+            view.type(key)
 
 
 def tabbed_interface(tab_names, tab_functions, initial_tab=0):
@@ -957,7 +1103,9 @@ def default_data():
         "destination": "",  # Current navigation destination
         "anomalies": {},  # Discovered anomalies per system: {system_name: [anomaly1, anomaly2, ...]}
         "scanned_systems": [],  # List of systems that have been scanned for anomalies
-        "manufacturing_jobs": {},  # Active manufacturing jobs per station: {station_name: [job1, job2, ...]}
+        "manufacturing_jobs": {},  # Active manufacturing batches per station: {station_name: [batch1, batch2, ...]}
+        "anomaly_seed": new_seed(),  # Seed anomalies are generated from: (seed, system, 48-hour epoch)
+        "cleared_anomalies": {},  # Seeded anomalies mined out before they expired: {system_name: {id: expiry}}
     }
 
 
@@ -990,37 +1138,6 @@ def load_crafting_data():
     return {recipe['name']: recipe for recipe in crafting_data}
 
 
-def wrap_text(text, max_width=60):
-    """Wrap text to a maximum width, breaking only at word boundaries"""
-    if not text:
-        return ""
-
-    words = text.split()
-    lines = []
-    current_line = []
-    current_length = 0
-
-    for word in words:
-        word_length = len(word)
-        # +1 for the space before the word (except for first word)
-        space_needed = word_length + (1 if current_line else 0)
-
-        if current_length + space_needed <= max_width:
-            current_line.append(word)
-            current_length += space_needed
-        else:
-            if current_line:
-                lines.append(' '.join(current_line))
-            current_line = [word]
-            current_length = word_length
-
-    if current_line:
-        lines.append(' '.join(current_line))
-
-    return '\n'.join(lines)
-
-
-
 def get_ship_stats(ship_name):
     """Get ship stats from ships.json by ship name"""
     ships = load_ships_data()
@@ -1487,7 +1604,129 @@ def spawn_next_wave(fleet):
 
 
 def enemy_encounter(enemy_fleet, system, save_name, data, previous_content=""):
-    """Handle initial enemy encounter - choice to fight, run, or ignore"""
+    """Handle initial enemy encounter - choice to fight, run, or ignore
+
+    When "Record combat encounters" is on in settings, the encounter runs under
+    a fixed RNG seed and its inputs are recorded for replay_combat().
+    """
+    if get_settings().get("record_combat", False):
+        return record_encounter(enemy_fleet, system, save_name, data, previous_content)
+    return _run_enemy_encounter(enemy_fleet, system, save_name, data, previous_content)
+
+
+@contextmanager
+def _swapped_globals(replacements):
+    """Temporarily replace module-level names (same trick settings_screen uses for get_key)"""
+    module_globals = globals()
+    missing = object()
+    saved = {name: module_globals.get(name, missing) for name in replacements}
+    module_globals.update(replacements)
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            if value is missing:
+                module_globals.pop(name, None)
+            else:
+                module_globals[name] = value
+
+
+def _recordings_dir():
+    return Path.home() / ".starscape_text_adventure" / "recordings"
+
+
+def record_encounter(enemy_fleet, system, save_name, data, previous_content=""):
+    """Run an encounter under a fresh RNG seed while recording every clock read and input
+
+    The recording is written to ~/.starscape_text_adventure/recordings/ and can
+    be re-run with replay_combat().
+    """
+    seed = random.randrange(2 ** 32)
+    recording = CombatRecording(seed, enemy_fleet, system, data, app_version=APP_VERSION_CODE)
+    recorder = CombatRecorder(recording)
+
+    random.seed(seed)
+    try:
+        with _swapped_globals({
+            "time": recorder.wrap(CLOCK, time),
+            "get_numpad_key": recorder.wrap(NUMPAD_KEY, get_numpad_key),
+            "get_key": recorder.wrap(MENU_KEY, get_key),
+            "input": recorder.wrap(TEXT_INPUT, input),
+        }):
+            result = _run_enemy_encounter(enemy_fleet, system, save_name, data, previous_content)
+    finally:
+        random.seed()  # Back to an unpredictable sequence for the rest of the session
+
+    recording.outcome = result
+    recording.final_state = summarize_state(data)
+    try:
+        path = _recordings_dir() / f"combat-{recording.recorded_at.replace(' ', '_').replace(':', '')}.json"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        recording.save(path)
+    except OSError:
+        pass
+    return result
+
+
+class _SilentMusic:
+    """Stand-in for the music manager during headless replays"""
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: None
+
+
+def replay_combat(recording_path, realtime=False):
+    """Re-run a recorded encounter headlessly and check it ends the same way
+
+    Args:
+        recording_path: Path to a recording written by record_encounter()
+        realtime: Replay at the recorded pace instead of as fast as possible
+
+    Returns:
+        dict with the replayed outcome, whether it matched the recording,
+        the number of events replayed and the wall time taken
+    """
+    recording = CombatRecording.load(recording_path)
+    replayer = CombatReplayer(recording, realtime=realtime)
+    data = recording.data
+    noop = lambda *args, **kwargs: None
+
+    old_stdout = sys.stdout
+    start = time()
+    random.seed(recording.seed)
+    try:
+        with open(os.devnull, 'w') as devnull, _swapped_globals({
+            "time": replayer.wrap(CLOCK, time),
+            "get_numpad_key": replayer.wrap(NUMPAD_KEY, get_numpad_key),
+            "get_key": replayer.wrap(MENU_KEY, get_key),
+            "input": replayer.wrap(TEXT_INPUT, input),
+            "sleep": noop,
+            "clear_screen": noop,
+            "save_data": noop,
+            "update_discord_presence": noop,
+            "music": _SilentMusic(),
+        }):
+            sys.stdout = devnull
+            result = _run_enemy_encounter(recording.enemy_fleet, recording.system,
+                                          "__replay__", data)
+    finally:
+        sys.stdout = old_stdout
+        random.seed()
+
+    final_state = summarize_state(data)
+    return {
+        "outcome": result,
+        "matched": (result == recording.outcome and final_state == recording.final_state
+                    and replayer.finished),
+        "expected_outcome": recording.outcome,
+        "final_state": final_state,
+        "expected_final_state": recording.final_state,
+        "events": len(recording.events),
+        "elapsed": time() - start,
+    }
+
+
+def _run_enemy_encounter(enemy_fleet, system, save_name, data, previous_content=""):
+    """Encounter screen and choice handling (see enemy_encounter)"""
     clear_screen()
 
     if previous_content:
@@ -1542,48 +1781,39 @@ def enemy_encounter(enemy_fleet, system, save_name, data, previous_content=""):
 
     print()
 
-    content_buffer = StringIO()
-    old_stdout = sys.stdout
-    sys.stdout = content_buffer
-
-    # Get screen content
-    import io
-    temp_buffer = io.StringIO()
-    sys.stdout = temp_buffer
-
-    # Print the encounter info again to capture it
-    print("=" * 60)
-    print("  ", end="")
-    set_color("red")
-    set_color("blinking")
-    set_color("reverse")
-    print(" ⚠ HOSTILE CONTACT ⚠ \033[K")
-    reset_color()
-    print("=" * 60)
-    print()
-    print(f"  Fleet Type: {enemy_fleet['type']}\033[K")
+    # Print the encounter info again to capture it for the menu's previous content
+    with capture_frame() as frame:
+        print("=" * 60)
+        print("  ", end="")
+        set_color("red")
+        set_color("blinking")
+        set_color("reverse")
+        print(" ⚠ HOSTILE CONTACT ⚠ \033[K")
+        reset_color()
+        print("=" * 60)
+        print()
+        print(f"  Fleet Type: {enemy_fleet['type']}\033[K")
 
-    if enemy_fleet.get("encounter_type") == "wave_group":
-        print(f"  Encounter Type: Multi-wave assault\033[K")
-        print(f"  Expected Waves: {enemy_fleet['total_waves']}\033[K")
+        if enemy_fleet.get("encounter_type") == "wave_group":
+            print(f"  Encounter Type: Multi-wave assault\033[K")
+            print(f"  Expected Waves: {enemy_fleet['total_waves']}\033[K")
 
-    print(f"  Initial Ships: {len([s for s in enemy_fleet['ships'] if s.get('wave', 1) == 1])} ships\033[K")
-    print(f"  Threat Level: ", end="")
-    if threat_ratio < 0.3:
-        print("LOW\033[K")
-    elif threat_ratio < 0.7:
-        print("MODERATE\033[K")
-    elif threat_ratio < 1.2:
-        print("HIGH\033[K")
-    else:
-        print("EXTREME\033[K")
-    if enemy_fleet["warp_disruptor"]:
+        print(f"  Initial Ships: {len([s for s in enemy_fleet['ships'] if s.get('wave', 1) == 1])} ships\033[K")
+        print(f"  Threat Level: ", end="")
+        if threat_ratio < 0.3:
+            print("LOW\033[K")
+        elif threat_ratio < 0.7:
+            print("MODERATE\033[K")
+        elif threat_ratio < 1.2:
+            print("HIGH\033[K")
+        else:
+            print("EXTREME\033[K")
+        if enemy_fleet["warp_disruptor"]:
+            print()
+            print("  ⚠ WARP DISRUPTOR DETECTED ⚠\033[K")
         print()
-        print("  ⚠ WARP DISRUPTOR DETECTED ⚠\033[K")
-    print()
 
-    encounter_content = temp_buffer.getvalue()
-    sys.stdout = old_stdout
+    encounter_content = frame.getvalue()
 
     options = ["Fight!", "Attempt to Escape", "Ignore and Tank Damage"]
     choice = arrow_menu("What will you do?", options, previous_content + encounter_content)
@@ -1768,7 +1998,7 @@ def perform_evasive_maneuvers_turn(player_ship, piloting_skill, data):
 
 
 def get_numpad_key(timeout=0.05):
-    """Get numpad key press (1-9) with timeout
+    """Get numpad key press (1-9) with timeout (None waits for a key)
 
     Returns:
         int: Numpad number (4-9 as integers) or regular keys 1-9 for movement
@@ -1777,7 +2007,7 @@ def get_numpad_key(timeout=0.05):
     if os.name == 'nt':  # Windows
         import msvcrt
         start = time()
-        while time() - start < timeout:
+        while timeout is None or time() - start < timeout:
             if msvcrt.kbhit():
                 key = msvcrt.getch()
 
@@ -1788,6 +2018,8 @@ def get_numpad_key(timeout=0.05):
                     return 'tab'
                 elif key == b' ':  # Space bar
                     return ' '
+                elif key == b'`':  # Performance HUD toggle
+                    return '`'
                 elif key == b'\x00' or key == b'\xe0':  # Arrow or numpad
                     key2 = msvcrt.getch()
                     # Arrow keys
@@ -1867,6 +2099,8 @@ def get_numpad_key(timeout=0.05):
                     return 'tab'
                 elif ch == ' ':  # Space bar
                     return ' '
+                elif ch == '`':  # Performance HUD toggle
+                    return '`'
                 elif ch in '123456789':
                     if ch in '123':  # These can be movement keys too
                         return ch
@@ -1932,47 +2166,6 @@ def calculate_arrow_position(current_pos, arrow_direction):
     return grid[new_row][new_col]
 
 
-def strip_ansi(text):
-    """Remove ANSI color codes from text for length calculation"""
-    import re
-    ansi_escape = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
-    return ansi_escape.sub('', text)
-
-
-def box_line(content, width=60, border_color=None, text_color=None):
-    """Format a line to fit exactly in a box with proper padding
-
-    Args:
-        content: The text content (may contain ANSI codes)
-        width: Interior width of the box (default 60 for standard box)
-        border_color: Color for the border characters (║) - optional
-        text_color: Color for the text content - optional
-
-    Returns:
-        Formatted string: "║  content..." with proper padding "  ║"
-    """
-    # Strip ANSI codes to calculate actual display length
-    display_text = strip_ansi(content)
-    actual_length = len(display_text)
-
-    # Calculate padding needed (account for the 2 spaces at start: "║  ")
-    padding_needed = width - actual_length - 2
-
-    # Apply text color if specified
-    formatted_content = content
-    if text_color:
-        formatted_content = f"{get_color(text_color)}{content}{get_color('reset')}"
-
-    # Build the line with optional border color
-    if border_color:
-        line = f"{get_color(border_color)}║{get_color('reset')}"
-        line += f"  {formatted_content}{' ' * padding_needed}"
-        line += f"{get_color(border_color)}║{get_color('reset')}"
-        return line
-    else:
-        return f"║  {formatted_content}{' ' * padding_needed}║"
-
-
 def is_warship(ship_name):
     """Check if a ship is a warship.
 
@@ -2820,9 +3013,13 @@ def unified_combat_round(player_ship, alive_enemies, combo, firing_mode, player_
     warp_energy_cost_percent = 0.6  # 60% of current energy
 
     # Projectile system - scale with fleet size and power
-    projectiles = []
+    projectiles = ProjectileStore()
     next_projectile_spawn = time() + 0.5  # First projectiles spawn after half second
 
+    # Alive enemies with running alive-count / damage-sum aggregates
+    roster = EnemyRoster(alive_enemies)
+    alive_enemies = roster.ships
+
     # Calculate fleet power and size for scaling
     fleet_size = len(alive_enemies)
     avg_enemy_damage = sum(enemy.get('damage', 50) for enemy in alive_enemies) / max(1, fleet_size)
@@ -2881,6 +3078,7 @@ def unified_combat_round(player_ship, alive_enemies, combo, firing_mode, player_
 
     start_time = time()
     last_update = start_time
+    frame_stats = perf.recorder("combat", frame_budget=0.066)  # 33ms input window + 33ms sleep
 
     # Make sure we have valid target
     if current_target_idx >= len(alive_enemies):
@@ -2891,11 +3089,12 @@ def unified_combat_round(player_ship, alive_enemies, combo, firing_mode, player_
         current_time = time()
         delta_time = current_time - last_update
         last_update = current_time
+        frame_stats.frame_start()
 
-        # Continuously check which enemies are still alive (HP > 0)
+        # Prune enemies killed since the last frame (HP > 0 check only runs after damage)
         # This allows us to detect mid-round when the last enemy dies
-        alive_enemies = [ship for ship in alive_enemies if ship.get('hull_hp', 0) > 0 or ship.get('shield_hp', 0) > 0]
-        alive_enemy_count = len(alive_enemies)
+        roster.refresh()
+        alive_enemy_count = roster.alive_count
 
         # Validate target index after filtering - prevent index out of range crashes
         if alive_enemy_count > 0 and current_target_idx >= alive_enemy_count:
@@ -2946,16 +3145,13 @@ def unified_combat_round(player_ship, alive_enemies, combo, firing_mode, player_
                     base_speed = 0.4 if fleet_size <= 3 else 0.5 if fleet_size <= 7 else 0.6
                     speed = random.uniform(base_speed, base_speed + 0.3)
 
-                projectiles.append(Projectile(target_pos, speed))
+                projectiles.spawn(target_pos, speed)
                 projectiles_spawned += 1
 
             next_projectile_spawn = current_time + projectile_spawn_interval
 
-        # Update projectiles
-        completed_projectiles = []
-        for proj in projectiles:
-            if proj.update(delta_time):
-                completed_projectiles.append(proj)
+        # Update projectiles (landed ones are removed in the same pass)
+        landed_targets = projectiles.advance(delta_time)
 
         # Update player movement
         if is_moving:
@@ -2964,14 +3160,14 @@ def unified_combat_round(player_ship, alive_enemies, combo, firing_mode, player_
                 is_moving = False
 
         # Check hits
-        for proj in completed_projectiles:
-            if proj.target_position == player_pos:
+        for target_position in landed_targets:
+            if target_position == player_pos:
                 # Hit! Apply damage based on fleet power
                 # Use average enemy damage but scale with fleet size and power
-                avg_damage = sum(enemy['damage'] for enemy in alive_enemies) / len(alive_enemies)
+                avg_damage = roster.avg_damage
 
                 # Scale damage based on fleet size (more enemies = slightly more damage per hit)
-                fleet_multiplier = 1.0 + (len(alive_enemies) - 1) * 0.1  # +10% per additional enemy
+                fleet_multiplier = 1.0 + (alive_enemy_count - 1) * 0.1  # +10% per additional enemy
                 fleet_multiplier = min(fleet_multiplier, 2.0)  # Cap at 2x
 
                 # Crystalline entities do more damage
@@ -2984,7 +3180,6 @@ def unified_combat_round(player_ship, alive_enemies, combo, firing_mode, player_
 
                 # Break combo on hit
                 combo = 1
-            projectiles.remove(proj)
 
         # Check if phase is complete (no more projectiles and all spawned)
         if not projectiles and projectiles_spawned >= total_projectiles_to_spawn:
@@ -3013,6 +3208,10 @@ def unified_combat_round(player_ship, alive_enemies, combo, firing_mode, player_
 
         # Get input with full frame-time window to reliably catch single presses
         key = get_numpad_key(timeout=0.033)  # Full 33ms window = 100% of frame time at 30 FPS
+        if key:
+            frame_stats.key_received()
+            if perf.handle_key(key):
+                key = None
 
         # Check if ESC is being held for warp escape
         if key == 'esc':
@@ -3083,7 +3282,7 @@ def unified_combat_round(player_ship, alive_enemies, combo, firing_mode, player_
                         warp_charging = False
 
                         # Take some damage from failed warp attempt
-                        failure_damage = sum(enemy['damage'] for enemy in alive_enemies) // 4
+                        failure_damage = roster.damage_sum // 4
                         apply_damage_to_ship(player_ship, int(failure_damage))
 
                         print("\033[H", end="", flush=True)
@@ -3145,6 +3344,7 @@ def unified_combat_round(player_ship, alive_enemies, combo, firing_mode, player_
                             target = alive_enemies[current_target_idx]
                             damage = int(base_dps * 0.04 * combo * random.uniform(0.9, 1.1))  # Halved from 0.08
                             apply_damage_to_enemy(target, damage)
+                            roster.mark_dirty()
                             damage_dealt += damage
                             shots_fired += 1
                     elif firing_mode == "spread":
@@ -3154,6 +3354,7 @@ def unified_combat_round(player_ship, alive_enemies, combo, firing_mode, player_
                             damage = int(base_dps * 0.025 * combo * random.uniform(0.9, 1.1))  # Halved from 0.05
                             apply_damage_to_enemy(target, damage)
                             damage_dealt += damage
+                        roster.mark_dirty()
                         shots_fired += 1
 
                     player_energy -= energy_cost_per_shot
@@ -3176,6 +3377,7 @@ def unified_combat_round(player_ship, alive_enemies, combo, firing_mode, player_
                             dmg = Turret.COMBAT_DAMAGE if hit else 0
                             if hit:
                                 apply_damage_to_enemy(ct.target, dmg)
+                                roster.mark_dirty()
                                 damage_dealt += dmg
                             t_name = ct.target['name'][:20]
                             turret_events.append((ct.turret_id, t_name, dmg, hit))
@@ -3205,13 +3407,19 @@ def unified_combat_round(player_ship, alive_enemies, combo, firing_mode, player_
                         display_offset = current_target_idx - 2  # Keep target in middle/bottom of window
 
         # Draw UI AFTER all input is processed
-        draw_unified_combat_ui(
-            player_ship, player_pos, alive_enemies, projectiles,
-            combo, firing_mode, player_energy, max_energy,
-            current_target_idx, current_time - start_time, weapon_heat, display_offset,
-            warp_charge_level, is_moving,
-            combat_turrets=combat_turrets, turret_events=turret_events
-        )
+        frame_stats.sim_done()
+        with screen_frame():
+            draw_unified_combat_ui(
+                player_ship, player_pos, alive_enemies, projectiles,
+                combo, firing_mode, player_energy, max_energy,
+                current_target_idx, current_time - start_time, weapon_heat, display_offset,
+                warp_charge_level, is_moving,
+                combat_turrets=combat_turrets, turret_events=turret_events
+            )
+            perf_hud = perf.hud_line(frame_stats)
+            if perf_hud:
+                print(perf_hud + "\033[K")
+        frame_stats.render_done()
 
         sleep(0.033)  # ~30 FPS - slower, more relaxed pace
 
@@ -3282,8 +3490,8 @@ def draw_unified_combat_ui(player_ship, player_pos, alive_enemies, projectiles,
     hull_text = f"Hull: {hull_bar} {hull_hp}/{max_hull}"
 
     # Calculate visual lengths
-    shield_visual = len(strip_ansi(shield_text))
-    hull_visual = len(strip_ansi(hull_text))
+    shield_visual = visual_width(shield_text)
+    hull_visual = visual_width(hull_text)
 
     # Padding between shield and hull
     middle_padding = 4
@@ -3301,7 +3509,7 @@ def draw_unified_combat_ui(player_ship, player_pos, alive_enemies, projectiles,
 
     # Get list of positions being targeted by projectiles that are close to hitting
     # Only highlight when projectile is in the final 2/3 of travel
-    targeted_positions = set(proj.target_position for proj in projectiles if proj.progress >= 1/3)
+    targeted_positions = projectiles.targeted_positions(min_progress=1/3)
 
     for row_idx, row in enumerate(positions):
         # Grid - build without padding first
@@ -3323,7 +3531,7 @@ def draw_unified_combat_ui(player_ship, player_pos, alive_enemies, projectiles,
             grid_str += " "
 
         # Calculate visual length of grid
-        grid_visual_len = len(strip_ansi(grid_str))
+        grid_visual_len = visual_width(grid_str)
 
         # Enemy list - display up to 3 enemies starting from display_offset
         enemy_str = ""
@@ -3362,13 +3570,13 @@ def draw_unified_combat_ui(player_ship, player_pos, alive_enemies, projectiles,
     print(f"║{incoming_header}{incoming_padding}║\033[K")
 
     # Show up to 4 projectiles with progress bars
-    visible_projectiles = sorted(projectiles, key=lambda p: p.progress, reverse=True)[:4]
+    visible_projectiles = projectiles.closest(4)
     for i in range(4):
         if i < len(visible_projectiles):
-            proj = visible_projectiles[i]
-            progress_filled = int(proj.progress * 15)
+            proj_progress, proj_target = visible_projectiles[i]
+            progress_filled = int(proj_progress * 15)
             progress_bar = "━" * progress_filled + "━" * (15 - progress_filled)
-            line_content = f"{get_color('red')} ║ ━━━> [{proj.target_position}]{get_color('reset')}"
+            line_content = f"{get_color('red')} ║ ━━━> [{proj_target}]{get_color('reset')}"
             # Visual length is without ANSI codes
             content_visual_len = len(" ║ ━━━> [X]")  # Fixed length
             padding = " " * (76 - content_visual_len)
@@ -3392,7 +3600,7 @@ def draw_unified_combat_ui(player_ship, player_pos, alive_enemies, projectiles,
 
     energy_bar = create_health_bar(int(energy), max_energy, 15, "yellow")
     energy_text = f" Energy: {energy_bar} {int(energy)}/{max_energy}"
-    energy_visual_len = len(strip_ansi(energy_text))
+    energy_visual_len = visual_width(energy_text)
     energy_padding = " " * (76 - energy_visual_len)
     print(f"║{energy_text}{energy_padding}║\033[K")
 
@@ -3401,7 +3609,7 @@ def draw_unified_combat_ui(player_ship, player_pos, alive_enemies, projectiles,
     weapon_heat_bar = create_health_bar(int(weapon_heat * 100), 100, 15, heat_bar_color)
     heat_status = "OVERHEATED!" if weapon_heat >= 1.0 else "READY" if weapon_heat < 0.3 else "COOLING"
     heat_text = f" Weapons: {weapon_heat_bar} {heat_status}"
-    heat_visual_len = len(strip_ansi(heat_text))
+    heat_visual_len = visual_width(heat_text)
     heat_padding = " " * (76 - heat_visual_len)
     print(f"║{heat_text}{heat_padding}║\033[K")
 
@@ -3411,7 +3619,7 @@ def draw_unified_combat_ui(player_ship, player_pos, alive_enemies, projectiles,
         warp_bar = create_health_bar(int(warp_charge_level * 100), 100, 15, warp_bar_color)
         warp_status = "READY!" if warp_charge_level >= 1.0 else "CHARGING..."
         warp_text = f" Warp Drive: {warp_bar} {warp_status}"
-        warp_visual_len = len(strip_ansi(warp_text))
+        warp_visual_len = visual_width(warp_text)
         warp_padding = " " * (76 - warp_visual_len)
         print(f"║{warp_text}{warp_padding}║\033[K")
 
@@ -3426,14 +3634,14 @@ def draw_unified_combat_ui(player_ship, player_pos, alive_enemies, projectiles,
 
     # Controls line (no cooldown indicator needed anymore)
     controls = " [SPACE] Fire  [NUMPAD] Dodge  [Q/E] Mode  [TAB] Target  [ESC] Warp"
-    controls_visual_len = len(strip_ansi(controls))
+    controls_visual_len = visual_width(controls)
     controls_padding = " " * (76 - controls_visual_len)
     print(f"║{controls}{controls_padding}║\033[K")
 
     # Combat turret status row (warships only)
     if combat_turrets:
         turret_header = f"{get_color("yellow")} TURRETS:{get_color("reset")}"
-        th_visual = len(strip_ansi(turret_header))
+        th_visual = visual_width(turret_header)
         th_padding = " " * (76 - th_visual)
         print(f"║{turret_header}{th_padding}║\033[K")
         # One line per turret showing ready/reloading
@@ -3480,29 +3688,6 @@ def draw_unified_combat_ui(player_ship, player_pos, alive_enemies, projectiles,
 
 
 
-def create_health_bar(current, maximum, width, color="green"):
-    """Create a colored health bar"""
-    if maximum == 0:
-        filled = 0
-    else:
-        filled = int((current / maximum) * width)
-
-    empty = width - filled
-
-    # Color codes
-    colors = {
-        "green": "\033[32m",
-        "cyan": "\033[36m",
-        "yellow": "\033[33m",
-        "red": "\033[31m",
-    }
-
-    color_code = colors.get(color, "\033[32m")
-
-    bar = f"{color_code}{'█' * filled}{RESET_COLOR}{'░' * empty}"
-    return bar
-
-
 def player_damage_distributed(enemies, combat_skill, data):
     """Player attacks enemies with distributed damage (max 4 targets)"""
     clear_screen()
@@ -3774,207 +3959,30 @@ def show_detailed_combat_stats(player_ship, enemy_fleet, data):
     input("Press Enter to return to combat...")
 
 
-def generate_anomalies(system_name, system_security, all_systems_data=None):
-    """Generate random anomalies for a star system based on security level
+def manage_system_anomalies(save_name, data, system_name):
+    """Manage anomalies for a system: clean up expired ones and add the ones it has now
 
-    Args:
-        system_name: Name of the system to generate anomalies for
-        system_security: Security level of the system
-        all_systems_data: Optional dict of all systems data (for wormhole generation)
+    A system's anomalies are generated from the save's anomaly seed, so only
+    the anomalies the player has interacted with are actually stored.
     """
-    anomalies = []
     current_time = time()
 
-    # Anomaly spawn rates by security level
-    anomaly_counts = {
-        "Core": 0,
-        "Secure": random.randint(1, 2),
-        "Contested": random.randint(2, 3),
-        "Unsecure": random.randint(2, 4),
-        "Wild": random.randint(3, 6),
-    }
-
-    num_anomalies = anomaly_counts.get(system_security, 0)
-
-    # Define rarity tiers
-    # Common: 50% chance, Uncommon: 30% chance, Rare: 15% chance, Very Rare: 5% chance
-    rarity_weights = {
-        "Common": 50,
-        "Uncommon": 30,
-        "Rare": 15,
-        "VeryRare": 5
-    }
-
-    # Anomaly rarities (applies to all security levels where they can spawn)
-    anomaly_rarities = {
-        "AT": "Common",
-        "BF": "Common",
-        "AL": "Uncommon",
-        "CM": "Uncommon",
-        "DH": "Uncommon",
-        "SP": "Uncommon",
-        "MT": "Uncommon",
-        # WH handled specially below
-        "AA": "Rare",
-        "FO": "Rare",
-        "AN": "Rare",
-        "VX": "VeryRare"
-    }
-
-    # Build weighted pool based on security level and rarity
-    # Each anomaly gets a weight based on its rarity
-    weighted_pool = []
-
-    # Define which anomalies can appear in each security level
-    security_anomalies = {
-        "Secure": ["AT", "AL", "CM", "BF", "SP"],
-        "Contested": ["AT", "AL", "AA", "CM", "BF", "DH", "SP", "MT"],
-        "Unsecure": ["AT", "AL", "AA", "CM", "BF", "DH", "SP", "MT"],
-        "Wild": ["AT", "AL", "AA", "AN", "VX", "CM", "BF", "DH", "SP", "MT", "FO"],
-    }
-
-    # Add wormholes based on security level with different rarities
-    if system_security == "Wild":
-        security_anomalies["Wild"].append("WH")
-    elif system_security == "Unsecure":
-        security_anomalies["Unsecure"].append("WH")
-    elif system_security == "Secure":
-        security_anomalies["Secure"].append("WH")
-
-    available_anomalies = security_anomalies.get(system_security, [])
-
-    # Build weighted pool
-    for anomaly_type in available_anomalies:
-        if anomaly_type == "WH":
-            # Wormhole rarity varies by security
-            if system_security == "Wild":
-                weight = rarity_weights["Uncommon"]
-            elif system_security == "Unsecure":
-                weight = rarity_weights["Rare"]
-            else:  # Secure
-                weight = rarity_weights["VeryRare"]
-        else:
-            rarity = anomaly_rarities.get(anomaly_type, "Common")
-            weight = rarity_weights.get(rarity, rarity_weights["Common"])
-
-        # Add the anomaly type 'weight' times to the pool
-        weighted_pool.extend([anomaly_type] * weight)
-
-    for _ in range(num_anomalies):
-        if weighted_pool:
-            anomaly_type = random.choice(weighted_pool)
-
-            # Determine duration for wormholes
-            if anomaly_type == "WH":
-                # 5% chance for 2-week wormhole, 95% chance for 48-hour wormhole
-                if random.random() < 0.05:
-                    duration = 14 * 24 * 3600  # 2 weeks in seconds
-                else:
-                    duration = 48 * 3600  # 48 hours in seconds
-            else:
-                duration = 48 * 3600  # Standard 48 hours
-
-            anomaly = {
-                "type": anomaly_type,
-                "visited": False,
-                "scanned": False,
-                "timestamp": current_time,
-                "duration": duration,
-            }
-
-            # For wormholes, add additional data
-            if anomaly_type == "WH":
-                # Generate a unique ID for this wormhole pair
-                anomaly["wormhole_id"] = str(uuid4())
-                anomaly["is_origin"] = True  # This is the origin end
-                anomaly["destination_system"] = None  # Will be set when we create the pair
-
-            anomalies.append(anomaly)
-
-    return anomalies
+    # Clean up expired anomalies in every system (and their wormhole pairs), not just this one
+    store = anomaly_store.bind(data)
+    store.evict_expired(current_time)
 
+    # Add this system's current anomalies that it doesn't have yet (or had mined out)
+    seeded = get_anomaly_seeder().anomalies_at(data["anomaly_seed"], system_name, current_time)
+    new_anomalies = store.merge(system_name, seeded, MAX_ANOMALIES)
 
-def manage_system_anomalies(save_name, data, system_name):
-    """Manage anomalies for a system: clean up expired ones and generate new ones if needed"""
-    current_time = time()
-    system = system_data(system_name)
-    system_security = system.get("SecurityLevel", "Secure")
-
-    # Load all systems data for wormhole generation
-    try:
-        with open(resource_path('system_data.json'), 'r') as f:
-            all_systems_data = json.load(f)
-    except:
-        all_systems_data = {}
+    # Create the far end of new wormholes in their destination systems
+    for anomaly in new_anomalies:
+        if anomaly.get("type") == "WH" and anomaly.get("is_origin"):
+            wormhole_id = anomaly["wormhole_id"]
+            destination_system = anomaly["destination_system"]
 
-    # Initialize anomalies dict if needed
-    if "anomalies" not in data:
-        data["anomalies"] = {}
-
-    # Initialize system visit tracking
-    if "last_system_visit" not in data:
-        data["last_system_visit"] = {}
-
-    # Initialize wormhole tracking
-    if "wormhole_pairs" not in data:
-        data["wormhole_pairs"] = {}
-
-    # Get existing anomalies for this system
-    existing_anomalies = data["anomalies"].get(system_name, [])
-
-    # Clean up expired anomalies (older than their duration)
-    cleaned_anomalies = []
-    for anomaly in existing_anomalies:
-        anomaly_age = current_time - anomaly.get("timestamp", current_time)
-        duration = anomaly.get("duration", 48 * 3600)
-
-        if anomaly_age < duration:
-            cleaned_anomalies.append(anomaly)
-        elif anomaly.get("type") == "WH":
-            # If wormhole expired, remove it from both sides
-            wormhole_id = anomaly.get("wormhole_id")
-            if wormhole_id and wormhole_id in data["wormhole_pairs"]:
-                del data["wormhole_pairs"][wormhole_id]
-
-    # Get last visit time
-    last_visit = data["last_system_visit"].get(system_name, 0)
-    time_since_visit = current_time - last_visit
-
-    MAX_ANOMALIES = 12
-
-    # Generate new anomalies if enough time has passed (every 12 hours, capped at 48 hours)
-    if last_visit == 0:
-        # First visit - generate anomalies
-        if len(cleaned_anomalies) < MAX_ANOMALIES:
-            new_anomalies = generate_anomalies(system_name, system_security, all_systems_data)
-            cleaned_anomalies.extend(new_anomalies[:MAX_ANOMALIES - len(cleaned_anomalies)])
-    elif time_since_visit >= 12 * 3600:
-        # Generate anomalies for each 12-hour period, capped at 48 hours
-        periods_elapsed = min(int(time_since_visit / (12 * 3600)), 4)  # Cap at 4 periods (48 hours)
-
-        for _ in range(periods_elapsed):
-            if len(cleaned_anomalies) >= MAX_ANOMALIES:
-                break
-            new_anomalies = generate_anomalies(system_name, system_security, all_systems_data)
-            cleaned_anomalies.extend(new_anomalies[:MAX_ANOMALIES - len(cleaned_anomalies)])
-
-    # Process wormholes & create pairs
-    for anomaly in cleaned_anomalies:
-        if anomaly.get("type") == "WH" and anomaly.get("is_origin") and anomaly.get("destination_system") is None:
-            # This is a new wormhole that needs a pair
-            wormhole_id = anomaly.get("wormhole_id")
-
-            # Choose a random destination system (any system except the current one, and no Core systems)
-            possible_destinations = [s for s in all_systems_data.keys()
-                                   if s != system_name and all_systems_data[s].get("SecurityLevel") != "Core"]
-            if possible_destinations:
-                destination_system = random.choice(possible_destinations)
-
-                # Set destination for this wormhole
-                anomaly["destination_system"] = destination_system
-
-                # Create the paired wormhole in the destination system
-                paired_wormhole = {
+            if not store.has_wormhole(destination_system, wormhole_id):
+                store.add(destination_system, {
                     "type": "WH",
                     "visited": False,
                     "scanned": False,
@@ -3983,35 +3991,19 @@ def manage_system_anomalies(save_name, data, system_name):
                     "wormhole_id": wormhole_id,
                     "is_origin": False,  # This is the destination end
                     "destination_system": system_name  # Points back to origin
-                }
-
-                # Add the paired wormhole to the destination system
-                if destination_system not in data["anomalies"]:
-                    data["anomalies"][destination_system] = []
-                data["anomalies"][destination_system].append(paired_wormhole)
-
-                # Track the wormhole pair
-                data["wormhole_pairs"][wormhole_id] = {
-                    "system1": system_name,
-                    "system2": destination_system,
-                    "timestamp": anomaly["timestamp"],
-                    "duration": anomaly["duration"]
-                }
-
-    # Update system anomalies
-    data["anomalies"][system_name] = cleaned_anomalies
-
-    # Update last visit time
-    data["last_system_visit"][system_name] = current_time
+                })
 
-    save_data(save_name, data)
+            # Track the wormhole pair
+            data["wormhole_pairs"][wormhole_id] = {
+                "system1": system_name,
+                "system2": destination_system,
+                "timestamp": anomaly["timestamp"],
+                "duration": anomaly["duration"]
+            }
 
-    # Update system data
-    data["anomalies"][system_name] = cleaned_anomalies
-    data["last_system_visit"][system_name] = current_time
     save_data(save_name, data)
 
-    return cleaned_anomalies
+    return store.anomalies_in(system_name)
 
 
 def get_anomaly_name(anomaly_type):
@@ -4076,10 +4068,7 @@ def scan_for_anomalies(save_name, data):
         anomaly["scanned"] = True
 
     # Also mark this system as having been scanned at least once
-    if "scanned_systems" not in data:
-        data["scanned_systems"] = []
-    if current_system not in data["scanned_systems"]:
-        data["scanned_systems"].append(current_system)
+    anomaly_store.bind(data).mark_scanned(current_system)
 
     # Display results
     clear_screen()
@@ -4143,7 +4132,7 @@ def visit_anomalies_menu(save_name, data):
     current_system = data["current_system"]
 
     # Check if system has been scanned
-    if current_system not in data.get("scanned_systems", []):
+    if not anomaly_store.bind(data).is_scanned(current_system):
         clear_screen()
         title("ANOMALIES")
         print()
@@ -4260,51 +4249,47 @@ def visit_wormhole(save_name, data, anomaly):
 
     while True:
         # Capture current screen for display
-        content_buffer = StringIO()
-        old_stdout = sys.stdout
-        sys.stdout = content_buffer
-
-        clear_screen()
-        title("WORMHOLE")
-        print()
-        print("  You approach the wormhole... What a spectacular sight!\033[K")
-        print("  Even the fabric of space-time appears distorted here.\033[K")
-        print()
-
-        # Calculate remaining time
-        current_time = time()
-        anomaly_age = current_time - anomaly.get("timestamp", current_time)
-        duration = anomaly.get("duration", 48 * 3600)
-        remaining_time = duration - anomaly_age
-
-        # Show if already scanned
-        if anomaly.get("wormhole_scanned", False):
-            # Get destination security
-            dest_security = all_systems_data.get(destination_system, {}).get("SecurityLevel", "Unknown")
-            dest_color = get_security_color(dest_security)
-
-            print(f"  Scan Data:\033[K")
-            print(f"    Destination: {dest_color}{destination_system}{RESET_COLOR}\033[K")
-            print(f"    Security Level: {dest_color}{dest_security}{RESET_COLOR}\033[K")
+        with capture_frame() as frame:
+            clear_screen()
+            title("WORMHOLE")
+            print()
+            print("  You approach the wormhole... What a spectacular sight!\033[K")
+            print("  Even the fabric of space-time appears distorted here.\033[K")
+            print()
 
-            # Format remaining time
-            if remaining_time > 0:
-                hours_left = int(remaining_time / 3600)
-                if hours_left >= 24:
-                    days_left = hours_left / 24
-                    if days_left >= 7:
-                        print(f"    Stability: ~{int(days_left/7)} week{'s' if int(days_left/7) != 1 else ''} remaining\033[K")
+            # Calculate remaining time
+            current_time = time()
+            anomaly_age = current_time - anomaly.get("timestamp", current_time)
+            duration = anomaly.get("duration", 48 * 3600)
+            remaining_time = duration - anomaly_age
+
+            # Show if already scanned
+            if anomaly.get("wormhole_scanned", False):
+                # Get destination security
+                dest_security = all_systems_data.get(destination_system, {}).get("SecurityLevel", "Unknown")
+                dest_color = get_security_color(dest_security)
+
+                print(f"  Scan Data:\033[K")
+                print(f"    Destination: {dest_color}{destination_system}{RESET_COLOR}\033[K")
+                print(f"    Security Level: {dest_color}{dest_security}{RESET_COLOR}\033[K")
+
+                # Format remaining time
+                if remaining_time > 0:
+                    hours_left = int(remaining_time / 3600)
+                    if hours_left >= 24:
+                        days_left = hours_left / 24
+                        if days_left >= 7:
+                            print(f"    Stability: ~{int(days_left/7)} week{'s' if int(days_left/7) != 1 else ''} remaining\033[K")
+                        else:
+                            print(f"    Stability: ~{int(days_left)} day{'s' if int(days_left) != 1 else ''} remaining\033[K")
                     else:
-                        print(f"    Stability: ~{int(days_left)} day{'s' if int(days_left) != 1 else ''} remaining\033[K")
+                        print(f"    Stability: ~{hours_left} hour{'s' if hours_left != 1 else ''} remaining\033[K")
                 else:
-                    print(f"    Stability: ~{hours_left} hour{'s' if hours_left != 1 else ''} remaining\033[K")
-            else:
-                print(f"    Stability: Collapsing soon!\033[K")
-            print()
+                    print(f"    Stability: Collapsing soon!\033[K")
+                print()
 
 
-        previous_content = content_buffer.getvalue()
-        sys.stdout = old_stdout
+        previous_content = frame.getvalue()
 
         options = []
         if not anomaly.get("wormhole_scanned", False):
@@ -4576,12 +4561,9 @@ def mine_anomaly(save_name, data, anomaly):
     if not asteroids:
         # Find and remove this anomaly from the system's anomaly list
         current_system = data["current_system"]
-        if current_system in data.get("anomalies", {}):
-            system_anomalies = data["anomalies"][current_system]
-            # Find this specific anomaly object and remove it
-            if anomaly in system_anomalies:
-                system_anomalies.remove(anomaly)
-                save_data(save_name, data)
+        # Seeded anomalies leave a tombstone so they don't spawn again before they expire
+        if anomaly_store.bind(data).remove(current_system, anomaly):
+            save_data(save_name, data)
 
         if anomaly_type == "VX":
             music.play_ambiance()
@@ -4594,6 +4576,10 @@ def mine_anomaly(save_name, data, anomaly):
         input("Press Enter to continue...")
 
 
+# The turret mining beam's "..." animation advances three times a second
+BEAM_FRAME_INTERVAL = 1 / 3
+
+
 def mine_asteroid_with_turrets(save_name, data, asteroid, player_ship, ship_class,
                                mining_skill, base_efficiency, stability, remaining_ore,
                                total_quantity, units_collected, ore_name, security_level,
@@ -4610,99 +4596,107 @@ def mine_asteroid_with_turrets(save_name, data, asteroid, player_ship, ship_clas
     standard mining laser shot at its configured intensity, but with +40%
     ore yield.  Stability costs and random event chances are identical to
     normal manual mining per blast.
+
+    Turrets fire on a fixed tick (FIRE_INTERVAL after the previous one, not
+    after the loop last woke up). In between, the loop sleeps until a key
+    arrives or the beam animation's next frame, and only screen lines that
+    changed are rewritten.
     """
     num_turrets = len(mining_turret_names)
     turret_power = [0] * num_turrets   # 0 = idle, 1-5 = active power level
     selected_turret = None
-    last_fire_time = time()
-    FIRE_INTERVAL = 2.0
-    TURRET_EFFICIENCY_BONUS = 1.4
+    next_fire = time() + FIRE_INTERVAL
     total_xp_gained = 0
-
-    intensity_data = {
-        1: {"speed": 0.5, "stability_loss": 0, "stability_gain": 5, "vaporize_chance": 0},
-        2: {"speed": 1.0, "stability_loss": 0, "stability_gain": 0, "vaporize_chance": 0},
-        3: {"speed": 1.8, "stability_loss": 5, "stability_gain": 0, "vaporize_chance": 0.02},
-        4: {"speed": 2.8, "stability_loss": 10, "stability_gain": 0, "vaporize_chance": 0.05},
-        5: {"speed": 4.0, "stability_loss": 20, "stability_gain": 0, "vaporize_chance": 0.10},
-    }
-
-    ore_xp_values = {
-        "Korrelite Ore (Inferior)": 1, "Korrelite Ore": 2,
-        "Korrelite Ore (Superior)": 3, "Korrelite Ore (Pristine)": 5,
-        "Reknite Ore (Inferior)": 2, "Reknite Ore": 3,
-        "Reknite Ore (Superior)": 4, "Reknite Ore (Pristine)": 6,
-        "Gellium Ore": 5, "Gellium Ore (Superior)": 7, "Gellium Ore (Pristine)": 10,
-        "Axnit Ore": 8, "Axnit Ore (Pristine)": 15,
-        "Narcor Ore": 12, "Red Narcor Ore": 20, "Vexnium Ore": 30, "Water Ice": 3,
-    }
-    int_desc = {1: "Minimum", 2: "Low", 3: "Medium", 4: "High", 5: "Maximum"}
+    frame_stats = perf.recorder("turret_mining", frame_budget=BEAM_FRAME_INTERVAL)
+    shown_lines = None  # Screen lines currently on the terminal (None: redraw everything)
+    presence_state = None
 
     while remaining_ore > 0 and stability > 0:
-        print("[H", end="", flush=True)  # Cursor home, no flash
-        update_discord_presence(data=data, context="mining")
-        title("MINING ASTEROID  [TURRET MODE]")
-        print("\033[K")
-        ship_nick = player_ship.get("nickname", player_ship["name"].title())
-        print(f"  Ore: {ore_name}\033[K")
-        print(f"  Ship: {ship_nick} ({ship_class})\033[K")
-        bonus_pct = int((TURRET_EFFICIENCY_BONUS - 1) * 100)
-        print(f"  Mining Skill: Level {mining_skill}  |  Turret Efficiency: +{bonus_pct}%\033[K")
-        print("\033[K")
-
-        ore_percent = (remaining_ore / total_quantity) * 100
-        stability_color = get_stability_color(stability)
-        print(f"  Ore Remaining: {int(remaining_ore)}/{total_quantity} ({ore_percent:.1f}%)\033[K")
-        print(f"  Asteroid Stability: {stability_color}{stability:.1f}%{RESET_COLOR}\033[K")
-        print("\033[K")
-
-        bar_width = 40
-        filled = int((stability / 100) * bar_width)
-        empty = bar_width - filled
-        stab_bar = f"[{stability_color}{'█' * filled}{'░' * empty}{RESET_COLOR}]"
-        print(f"  {stab_bar}\033[K")
-        print("\033[K")
-
-        print("=" * 60 + "\033[K")
-        print("\033[K")
-        print("  Mining Turrets:\033[K")
-        for i, name in enumerate(mining_turret_names):
-            key_char = chr(ord('a') + i)
-            pwr = turret_power[i]
-            sel_marker = " \u25c4 SELECTED" if selected_turret == i else ""
-            status = "IDLE" if pwr == 0 else f"Power {pwr} ({int_desc[pwr]})"
-            if selected_turret == i:
-                set_color("cyan")
-            print(f"  [{key_char}] Turret {i + 1} ({name}): {status}{sel_marker}\033[K")
-            reset_color()
-
+        frame_stats.sim_done()
         active_turrets = [i for i in range(num_turrets) if turret_power[i] > 0]
 
-        print("\033[K")
-        print("=" * 60 + "\033[K")
-        print("\033[K")
-        if selected_turret is not None:
-            print(f"  Turret {selected_turret + 1} selected — press [1-5] to set power, [0] to idle.\033[K")
-        else:
-            print("  Press [a-z] to select a turret, then [1-5] to set its power.\033[K")
-        print("\033[K")
+        # Discord presence (settings and system data lookups) only when the mining state changes
+        mining_state = (ore_name, bool(active_turrets))
+        if mining_state != presence_state:
+            presence_state = mining_state
+            update_discord_presence(data=data, context="mining")
+
+        with capture_frame() as frame:
+            title("MINING ASTEROID  [TURRET MODE]")
+            print("\033[K")
+            ship_nick = player_ship.get("nickname", player_ship["name"].title())
+            print(f"  Ore: {ore_name}\033[K")
+            print(f"  Ship: {ship_nick} ({ship_class})\033[K")
+            bonus_pct = int((TURRET_EFFICIENCY_BONUS - 1) * 100)
+            print(f"  Mining Skill: Level {mining_skill}  |  Turret Efficiency: +{bonus_pct}%\033[K")
+            print("\033[K")
+
+            ore_percent = (remaining_ore / total_quantity) * 100
+            stability_color = get_stability_color(stability)
+            print(f"  Ore Remaining: {int(remaining_ore)}/{total_quantity} ({ore_percent:.1f}%)\033[K")
+            print(f"  Asteroid Stability: {stability_color}{stability:.1f}%{RESET_COLOR}\033[K")
+            print("\033[K")
+
+            bar_width = 40
+            filled = int((stability / 100) * bar_width)
+            empty = bar_width - filled
+            stab_bar = f"[{stability_color}{'█' * filled}{'░' * empty}{RESET_COLOR}]"
+            print(f"  {stab_bar}\033[K")
+            print("\033[K")
+
+            print("=" * 60 + "\033[K")
+            print("\033[K")
+            print("  Mining Turrets:\033[K")
+            for i, name in enumerate(mining_turret_names):
+                key_char = chr(ord('a') + i)
+                pwr = turret_power[i]
+                sel_marker = " \u25c4 SELECTED" if selected_turret == i else ""
+                status = "IDLE" if pwr == 0 else f"Power {pwr} ({INTENSITY_NAMES[pwr]})"
+                if selected_turret == i:
+                    set_color("cyan")
+                print(f"  [{key_char}] Turret {i + 1} ({name}): {status}{sel_marker}\033[K")
+                reset_color()
 
-        if active_turrets:
-            set_color("green")
-            beam_dots = "." * (int(time() * 3) % 4)
-            print(f"  Mining beam active{beam_dots:<3}  {len(active_turrets)} turret(s) firing continuously\033[K")
-            reset_color()
-        else:
-            set_color("yellow")
-            print("  No active turrets. Select a turret and set its power to begin.\033[K")
-            reset_color()
+            print("\033[K")
+            print("=" * 60 + "\033[K")
+            print("\033[K")
+            if selected_turret is not None:
+                print(f"  Turret {selected_turret + 1} selected — press [1-5] to set power, [0] to idle.\033[K")
+            else:
+                print("  Press [a-z] to select a turret, then [1-5] to set its power.\033[K")
+            print("\033[K")
 
-        print("\033[K")
-        print("  [ESC] Stop mining\033[K")
-        print("\033[K")
-        print("\033[J", end="", flush=True)  # Clear below last line
+            if active_turrets:
+                set_color("green")
+                beam_dots = "." * (int(time() / BEAM_FRAME_INTERVAL) % 4)
+                print(f"  Mining beam active{beam_dots:<3}  {len(active_turrets)} turret(s) firing continuously\033[K")
+                reset_color()
+            else:
+                set_color("yellow")
+                print("  No active turrets. Select a turret and set its power to begin.\033[K")
+                reset_color()
 
-        key = get_numpad_key(timeout=0.1)
+            print("\033[K")
+            print("  [ESC] Stop mining\033[K")
+            print("\033[K")
+            perf_hud = perf.hud_line(frame_stats)
+            if perf_hud:
+                print(perf_hud + "\033[K")
+        lines = frame.getvalue().split("\n")
+        draw_changed_lines(lines, shown_lines)
+        shown_lines = lines
+        frame_stats.render_done()
+
+        # Sleep until the next fire tick, the beam's next frame (or the HUD's), or a key
+        now = time()
+        wake = next_fire if active_turrets else float("inf")
+        if active_turrets or perf_hud:
+            wake = min(wake, (int(now / BEAM_FRAME_INTERVAL) + 1) * BEAM_FRAME_INTERVAL)
+        key = get_numpad_key(timeout=None if wake == float("inf") else max(0.0, wake - now))
+        if key:
+            frame_stats.key_received()
+            if perf.handle_key(key):
+                key = None
 
         if key == 'esc':
             break
@@ -4723,34 +4717,25 @@ def mine_asteroid_with_turrets(save_name, data, asteroid, player_ship, ship_clas
             turret_power[selected_turret] = key
             selected_turret = None
 
-        # Fire cycle — every FIRE_INTERVAL seconds
+        # Fire cycle — on the fixed FIRE_INTERVAL tick (simulation half of the frame)
+        frame_stats.frame_start()
         now = time()
-        if now - last_fire_time >= FIRE_INTERVAL and active_turrets:
-            last_fire_time = now
+        active_turrets = [i for i in range(num_turrets) if turret_power[i] > 0]
+        if active_turrets and now >= next_fire:
+            next_fire += FIRE_INTERVAL
+            if next_fire <= now:
+                # Fell behind (turrets were idle, or an event screen was up): restart the tick from now
+                next_fire = now + FIRE_INTERVAL
             for t_idx in active_turrets:
                 intensity = turret_power[t_idx]
-                idata = intensity_data[intensity]
-
-                base_extraction = 2 + (intensity * 1.5)
-                ore_extracted = (base_extraction * idata["speed"] * 0.1
-                                 * base_efficiency * TURRET_EFFICIENCY_BONUS)
-
-                vaporized = 0
-                if random.random() < idata["vaporize_chance"]:
-                    vap_pct = random.uniform(0.05, 0.15)
-                    vaporized = int(ore_extracted * vap_pct)
-                    ore_extracted -= vaporized
-
-                ore_extracted = min(ore_extracted, remaining_ore)
-
-                stab_change = idata["stability_gain"] - idata["stability_loss"]
-                if stab_change < 0:
-                    stab_change *= (1.0 - mining_skill * 0.02)
-                stability = max(0, min(100, stability + stab_change))
+                ore_extracted, vaporized, stability = blast(
+                    intensity, base_efficiency * TURRET_EFFICIENCY_BONUS, stability,
+                    remaining_ore, mining_skill
+                )
 
                 remaining_ore = max(0, remaining_ore - ore_extracted)
                 units_collected += ore_extracted
-                total_xp_gained += int(ore_extracted * ore_xp_values.get(ore_name, 2))
+                total_xp_gained += int(ore_extracted * ORE_XP.get(ore_name, DEFAULT_ORE_XP))
 
                 # Random events (same chance as a manual blast)
                 event = check_mining_event(
@@ -4758,6 +4743,7 @@ def mine_asteroid_with_turrets(save_name, data, asteroid, player_ship, ship_clas
                     anomaly_type=asteroid.get("anomaly_type", "AT")
                 )
                 if event:
+                    shown_lines = None  # Event screens replace the mining screen
                     ev_type, ev_data = event
                     if ev_type == "gas_pocket":
                         ore_lost = ev_data["ore_lost"]
@@ -4954,10 +4940,7 @@ def mine_asteroid(save_name, data, asteroid, guarded=False):
     units_collected = current_mined
 
     # Base mining efficiency based on ship class
-    if ship_class == "Miner":
-        base_efficiency = 1.0 + (dps / 500) + (mining_skill * 0.05)
-    else:
-        base_efficiency = 0.15 * (0.5 + (dps / 1000)) + (mining_skill * 0.02)
+    base_efficiency = mining_efficiency(ship_class, dps, mining_skill)
 
     # Trigger crystalline guardian attack if guarded
     if guarded and random.random() < 0.8:
@@ -5080,40 +5063,9 @@ def mine_asteroid(save_name, data, asteroid, guarded=False):
 
         intensity = int(choice)
 
-        # Calculate mining results based on intensity
         # Intensity affects: mining speed, stability loss, ore vaporization risk
-        intensity_data = {
-            1: {"speed": 0.5, "stability_loss": 0, "stability_gain": 5, "vaporize_chance": 0},
-            2: {"speed": 1.0, "stability_loss": 0, "stability_gain": 0, "vaporize_chance": 0},
-            3: {"speed": 1.8, "stability_loss": 5, "stability_gain": 0, "vaporize_chance": 0.02},
-            4: {"speed": 2.8, "stability_loss": 10, "stability_gain": 0, "vaporize_chance": 0.05},
-            5: {"speed": 4.0, "stability_loss": 20, "stability_gain": 0, "vaporize_chance": 0.10},
-        }
-
-        int_data = intensity_data[intensity]
-
-        # Base ore extraction
-        base_extraction = 2 + (intensity * 1.5)
-        ore_extracted = base_extraction * int_data["speed"] * 0.1 * base_efficiency
-
-        # Vaporization check
-        vaporized = 0
-        if random.random() < int_data["vaporize_chance"]:
-            vaporize_percent = random.uniform(0.05, 0.15)
-            vaporized = int(ore_extracted * vaporize_percent)
-            ore_extracted -= vaporized
-
-        ore_extracted = min(ore_extracted, remaining_ore)
-
-        # Update stability
-        stability_change = int_data["stability_gain"] - int_data["stability_loss"]
-
-        # Mining skill reduces stability loss
-        if stability_change < 0:
-            stability_change *= (1.0 - mining_skill * 0.02)
-
-        stability += stability_change
-        stability = max(0, min(100, stability))
+        ore_extracted, vaporized, stability = blast(intensity, base_efficiency, stability,
+                                                    remaining_ore, mining_skill)
 
         # Display mining action
         clear_screen()
@@ -5341,27 +5293,7 @@ def mine_asteroid(save_name, data, asteroid, guarded=False):
         units_collected += ore_extracted
 
         # XP calculation based on ore type
-        ore_xp_values = {
-            "Korrelite Ore (Inferior)": 1,
-            "Korrelite Ore": 2,
-            "Korrelite Ore (Superior)": 3,
-            "Korrelite Ore (Pristine)": 5,
-            "Reknite Ore (Inferior)": 2,
-            "Reknite Ore": 3,
-            "Reknite Ore (Superior)": 4,
-            "Reknite Ore (Pristine)": 6,
-            "Gellium Ore": 5,
-            "Gellium Ore (Superior)": 7,
-            "Gellium Ore (Pristine)": 10,
-            "Axnit Ore": 8,
-            "Axnit Ore (Pristine)": 15,
-            "Narcor Ore": 12,
-            "Red Narcor Ore": 20,
-            "Vexnium Ore": 30,
-            "Water Ice": 3,
-        }
-
-        xp_per_unit = ore_xp_values.get(ore_name, 2)
+        xp_per_unit = ORE_XP.get(ore_name, DEFAULT_ORE_XP)
         xp_gain = int(ore_extracted * xp_per_unit)
         total_xp_gained += xp_gain
 
@@ -5444,6 +5376,42 @@ def mine_asteroid(save_name, data, asteroid, guarded=False):
         return "partial"
 
 
+def mining_report(ore_name, runs=20, skills=(0, 10, 25)):
+    """Print the best intensity policy and expected yields for an ore, per ship
+    class, mining skill and security level (from seeded headless mining sessions)"""
+    securities = ["Secure", "Contested", "Unsecure", "Wild"]
+    dps_by_class = {}
+    for ship in load_ships_data().values():
+        if ship.get("class") != "Special":
+            dps_by_class.setdefault(ship.get("class", "Fighter"), []).append(ship.get("stats", {}).get("DPS", 100))
+
+    anomaly_type, quantity = ORE_SOURCES.get(ore_name, DEFAULT_SOURCE)
+    print(f"MINING REPORT: {ore_name}")
+    print(f"  {quantity}-unit asteroids in {get_anomaly_name(anomaly_type)} anomalies, "
+          f"10-minute sessions, {runs} seeds each")
+    print(f"  Policies that blow up more than 2% of asteroids are only picked if nothing safer exists")
+    print()
+    print(f"  {'Ship class':<12} {'Skill':>5}  {'Security':<10} {'Best policy':<22} {'Ore/min':>8} {'Explode':>8}")
+    for ship_class, dps_values in dps_by_class.items():
+        dps = statistics.median(dps_values)
+        for skill in skills:
+            efficiency = mining_efficiency(ship_class, dps, skill)
+            for security in securities:
+                best = optimize(ore_name, efficiency, skill, security, runs)[0]
+                print(f"  {ship_class:<12} {skill:>5}  {security:<10} {best['policy'].name:<22} "
+                      f"{best['ore_per_minute']:8.1f} {best['explosion_rate'] * 100:7.1f}%")
+
+    print()
+    print("EXPECTED ORE PER MINUTE AT A FIXED INTENSITY (mining skill 0)")
+    print(f"  {'Ship class':<12} {'Security':<10} " + " ".join(f"{'x' + str(i):>13}" for i in range(1, 6)))
+    for ship_class, dps_values in dps_by_class.items():
+        efficiency = mining_efficiency(ship_class, statistics.median(dps_values), 0)
+        for security in securities:
+            table = yield_table(ore_name, efficiency, 0, security, runs)
+            cells = [f"{r['ore_per_minute']:6.1f} ({r['explosion_rate'] * 100:3.0f}%)" for r in table.values()]
+            print(f"  {ship_class:<12} {security:<10} " + " ".join(f"{cell:>13}" for cell in cells))
+
+
 def get_stability_color(stability):
     """Get color code based on asteroid stability"""
     if stability >= 80:
@@ -5464,48 +5432,9 @@ def check_mining_event(data, ore_name, stability, security_level, intensity, ano
     Returns:
         tuple: (event_type, event_data) or None if no event
     """
-    # Base event chances (modified by various factors)
-    event_chances = {
-        "gas_pocket": 0.08,
-        "dense_formation": 0.10,
-        "collision": 0.06,
-        "artifact": 0.03,
-        "proximity_mine": 0.06,
-    }
-
-    # Modify chances based on ore type
-    if ore_name in ["Gellium Ore", "Gellium Ore (Superior)", "Gellium Ore (Pristine)", "Red Narcor Ore"]:
-        event_chances["gas_pocket"] *= 1.8
-
-    if ore_name == "Water Ice":
-        event_chances["gas_pocket"] *= 3
-
-    if ore_name in ["Vexnium Ore", "Axnit Ore", "Axnit Ore (Pristine)",
-                    "Korrelite Ore (Pristine)", "Reknite Ore (Pristine)"]:
-        event_chances["dense_formation"] *= 1.6
-
-    # Modify based on anomaly type
-    if anomaly_type in ["AL", "CM"]:
-        event_chances["collision"] *= 2.0
-    elif anomaly_type in ["VX", "MT"]:
-        event_chances["collision"] = 0
-
-    # Modify based on security level
-    if security_level == "Wild":
-        event_chances["artifact"] *= 3.0
-        event_chances["proximity_mine"] *= 2.0
-    elif security_level == "Unsecure":
-        event_chances["proximity_mine"] *= 1.5
-    elif security_level in ["Contested"]:
-        event_chances["proximity_mine"] *= 1.2
-    elif security_level == "Secure":
-        event_chances["proximity_mine"] = 0.0
-        event_chances["artifact"] *= 0.25
-
-    # Roll for each event
-    for event_type, chance in event_chances.items():
-        if random.random() < chance:
-            return trigger_mining_event(event_type, data, ore_name, stability, intensity)
+    event_type = draw_event(event_table(ore_name, security_level, anomaly_type))
+    if event_type:
+        return trigger_mining_event(event_type, data, ore_name, stability, intensity)
 
     return None
 
@@ -5516,141 +5445,49 @@ def trigger_mining_event(event_type, data, ore_name, stability, intensity):
     Returns:
         tuple: (event_type, event_data)
     """
-    if event_type == "gas_pocket":
-        # Gas pocket - loses ore and stability
-        # Worse if asteroid is already unstable
-        base_ore_loss = random.uniform(2, 5)
-        stability_factor = 1.0 + ((100 - stability) / 100)
-        ore_lost = base_ore_loss * stability_factor
-
-        base_stability_loss = random.uniform(5, 15)
-        stability_lost = base_stability_loss * stability_factor
-
-        # Ship damage if very unstable
-        ship_damage = 0
-        if stability < 40:
-            ship_damage = random.randint(20, 50)
-
-        return ("gas_pocket", {
-            "ore_lost": ore_lost,
-            "stability_lost": stability_lost,
-            "ship_damage": ship_damage
-        })
-
-    elif event_type == "dense_formation":
-        # Dense formation - extra ore
-        base_bonus = random.uniform(3, 8)
-
-        # Pristine ore gives more bonus
-        if "Pristine" in ore_name:
-            base_bonus *= 1.5
-
-        return ("dense_formation", {
-            "bonus_ore": base_bonus
-        })
-
-    elif event_type == "collision":
-        # Asteroid collision
-        ore_lost = random.uniform(4, 10)
-        recoverable = ore_lost * random.uniform(0.5, 0.9)
-
-        return ("collision", {
-            "ore_lost": ore_lost,
-            "recoverable": recoverable
-        })
-
-    elif event_type == "artifact":
-        # Ancient artifact
-        # High intensity can destroy it
-        destroyed = intensity >= 4 and random.random() < 0.6
-
-        return ("artifact", {
-            "destroyed": destroyed
-        })
-
-    elif event_type == "proximity_mine":
-        # Proximity mine
-        clear_screen()
-        set_color("red")
-        set_color("blinking")
-        print()
-        print("  " + "=" * 56 + "\033[K")
-        print("  ⚠ ⚠ ⚠  PROXIMITY MINE DETECTED  ⚠ ⚠ ⚠\033[K")
-        print("  " + "=" * 56 + "\033[K")
-        reset_color()
-        print()
-        sleep(1)
+    if event_type != "proximity_mine":
+        return event_outcome(event_type, ore_name, stability, intensity)
 
-        print("  This asteroid has an explosive mine attached!\033[K")
-        print()
-        print("  What do you want to do?\033[K")
-        print()
-        print("  [D] Attempt to defuse the mine (risky)\033[K")
-        print("  [S] Skip this asteroid entirely\033[K")
-        print()
-
-        choice = None
-        while choice not in ['d', 's']:
-            choice = get_key()
+    # Proximity mine: the player decides whether to defuse it
+    clear_screen()
+    set_color("red")
+    set_color("blinking")
+    print()
+    print("  " + "=" * 56 + "\033[K")
+    print("  ⚠ ⚠ ⚠  PROXIMITY MINE DETECTED  ⚠ ⚠ ⚠\033[K")
+    print("  " + "=" * 56 + "\033[K")
+    reset_color()
+    print()
+    sleep(1)
 
-        if choice == 'd':
-            # Defuse attempt
-            mining_skill = data.get("skills", {}).get("mining", 0)
-            success_chance = max(0.8, 0.5 + (mining_skill * 0.03))  # 50% base, +3% per level, caps at 80%
+    print("  This asteroid has an explosive mine attached!\033[K")
+    print()
+    print("  What do you want to do?\033[K")
+    print()
+    print("  [D] Attempt to defuse the mine (risky)\033[K")
+    print("  [S] Skip this asteroid entirely\033[K")
+    print()
 
-            print()
-            set_color("cyan")
-            print("  Attempting to defuse...\033[K")
-            reset_color()
-            sleep(2)
+    choice = None
+    while choice not in ['d', 's']:
+        choice = get_key()
 
-            if random.random() < success_chance:
-                return ("proximity_mine", {
-                    "defused": True,
-                    "detonated": False,
-                    "damage": 0
-                })
-            else:
-                # Detonation
-                damage = random.randint(150, 300)
-                return ("proximity_mine", {
-                    "defused": False,
-                    "detonated": True,
-                    "damage": damage
-                })
-        else:
-            # Skip asteroid
-            return ("proximity_mine", {
-                "defused": False,
-                "detonated": False,
-                "damage": 0
-            })
+    mining_skill = data.get("skills", {}).get("mining", 0)
+    if choice == 'd':
+        # Defuse attempt
+        print()
+        set_color("cyan")
+        print("  Attempting to defuse...\033[K")
+        reset_color()
+        sleep(2)
 
-    return None
+    return event_outcome("proximity_mine", ore_name, stability, intensity,
+                         mine_choice=choice, mining_skill=mining_skill)
 
 
 def visit_refinery(save_name, data):
     """Visit the refinery to process ores and metal scraps into materials"""
-    # Define refining rules
-    refining_rules = {
-        "Korrelite Ore (Inferior)": ("Korrelite", 1),
-        "Korrelite Ore": ("Korrelite", 2),
-        "Korrelite Ore (Superior)": ("Korrelite", 3),
-        "Korrelite Ore (Pristine)": ("Korrelite", 4),
-        "Reknite Ore (Inferior)": ("Reknite", 1),
-        "Reknite Ore": ("Reknite", 2),
-        "Reknite Ore (Superior)": ("Reknite", 3),
-        "Reknite Ore (Pristine)": ("Reknite", 4),
-        "Gellium Ore": ("Gellium", 2),
-        "Gellium Ore (Superior)": ("Gellium", 3),
-        "Gellium Ore (Pristine)": ("Gellium", 4),
-        "Axnit Ore": ("Axnit", 1),
-        "Axnit Ore (Pristine)": ("Axnit", 2),
-        "Narcor Ore": ("Narcor", 1),
-        "Red Narcor Ore": ("Red Narcor", 1),
-        "Vexnium Ore": ("Vexnium", 1),
-        "Water Ice": ("Water", 1),
-    }
+    scrap_chance = int(SCRAP_SUCCESS_CHANCE * 100)
 
     while True:
         clear_screen()
@@ -5667,10 +5504,10 @@ def visit_refinery(save_name, data):
 
         for item_name, quantity in inventory.items():
             if quantity > 0:
-                if item_name in refining_rules:
-                    material, yield_amount = refining_rules[item_name]
+                if item_name in REFINING_RULES:
+                    material, yield_amount = REFINING_RULES[item_name]
                     refinable_items.append((item_name, quantity, material, yield_amount))
-                elif item_name == "Metal Scraps":
+                elif item_name == SCRAP_ITEM:
                     refinable_items.append((item_name, quantity, "Random", "?"))
 
         if not refinable_items:
@@ -5682,17 +5519,40 @@ def visit_refinery(save_name, data):
         # Display refinable items
         options = []
         for item_name, quantity, material, yield_amount in refinable_items:
-            if item_name == "Metal Scraps":
-                options.append(f"{item_name} (x{quantity}) → Random material (20% chance)")
+            if item_name == SCRAP_ITEM:
+                options.append(f"{item_name} (x{quantity}) → Random material ({scrap_chance}% chance)")
             else:
                 options.append(f"{item_name} (x{quantity}) → {material} (x{yield_amount} per ore)")
+        refine_everything = len(options)
+        options.append("Refine Everything")
         options.append("Back")
 
         choice = arrow_menu("Select item to refine:", options)
 
-        if choice == len(refinable_items):
+        if choice == refine_everything + 1:
             return
 
+        if choice == refine_everything:
+            # Every stack in one transaction, saved once
+            processed, gained = refine_all(data["inventory"])
+
+            clear_screen()
+            title("REFINING")
+            print()
+            for item_name, amount in processed.items():
+                print(f"Processed {amount}x {item_name}\033[K")
+            print()
+            if gained:
+                print("Materials gained:\033[K")
+                for mat, qty in gained.items():
+                    print(f"  +{qty}x {mat}\033[K")
+            else:
+                print("No materials recovered.\033[K")
+            print()
+            save_data(save_name, data)
+            input("Press Enter to continue...")
+            continue
+
         # Process refinement
         item_name, quantity, material, yield_amount = refinable_items[choice]
 
@@ -5703,8 +5563,8 @@ def visit_refinery(save_name, data):
         print(f"Available: {quantity}\033[K")
         print()
 
-        if item_name == "Metal Scraps":
-            print("Metal Scraps have a 20% chance to refine into a random material.\033[K")
+        if item_name == SCRAP_ITEM:
+            print(f"Metal Scraps have a {scrap_chance}% chance to refine into a random material.\033[K")
             print("Higher tier materials are rarer.\033[K")
             print()
             print(f"How many would you like to process? (0 to cancel, Enter for max [{quantity}]): ", end="")
@@ -5730,40 +5590,16 @@ def visit_refinery(save_name, data):
                 input("Press Enter to continue...")
                 continue
 
-            # Process the refinement
+            # Process the refinement (the whole stack is drawn at once)
+            materials_gained, successful_refines = refine(item_name, amount)
             data["inventory"][item_name] -= amount
             if data["inventory"][item_name] <= 0:
                 del data["inventory"][item_name]
+            for mat, qty in materials_gained.items():
+                data["inventory"][mat] = data["inventory"].get(mat, 0) + qty
 
-            if item_name == "Metal Scraps":
-                # Metal scraps special processing
-                successful_refines = 0
-                materials_gained = {}
-
-                # Material pool with weighted chances
-                material_pool = [
-                    ("Korrelite", 40),      # 40% of successes
-                    ("Reknite", 30),        # 30% of successes
-                    ("Gellium", 15),        # 15% of successes
-                    ("Axnit", 10),          # 10% of successes
-                    ("Narcor", 4),          # 4% of successes
-                    ("Red Narcor", 1),      # 1% of successes
-                ]
-
-                for _ in range(amount):
-                    if random.random() < 0.20:  # 20% success rate
-                        successful_refines += 1
-                        # Choose material based on weights
-                        total_weight = sum(weight for _, weight in material_pool)
-                        rand = random.randint(1, total_weight)
-                        cumulative = 0
-                        for mat, weight in material_pool:
-                            cumulative += weight
-                            if rand <= cumulative:
-                                materials_gained[mat] = materials_gained.get(mat, 0) + 1
-                                break
-
-                print()
+            print()
+            if item_name == SCRAP_ITEM:
                 print(f"Processed {amount} Metal Scraps\033[K")
                 print(f"Successful refines: {successful_refines} ({int(successful_refines/amount*100)}%)\033[K")
 
@@ -5771,24 +5607,12 @@ def visit_refinery(save_name, data):
                     print()
                     print("Materials gained:\033[K")
                     for mat, qty in materials_gained.items():
-                        if mat not in data["inventory"]:
-                            data["inventory"][mat] = 0
-                        data["inventory"][mat] += qty
                         print(f"  +{qty}x {mat}\033[K")
                 else:
                     print("No materials recovered.\033[K")
-
             else:
-                # Standard ore refinement
-                total_yield = amount * yield_amount
-
-                if material not in data["inventory"]:
-                    data["inventory"][material] = 0
-                data["inventory"][material] += total_yield
-
-                print()
                 print(f"Refined {amount}x {item_name}\033[K")
-                print(f"Produced: {total_yield}x {material}\033[K")
+                print(f"Produced: {materials_gained[material]}x {material}\033[K")
 
             print()
             save_data(save_name, data)
@@ -5809,15 +5633,11 @@ def visit_manufacturing_bay(save_name, data):
 
     while True:
         # Capture content for display
-        content_buffer = StringIO()
-        old_stdout = sys.stdout
-        sys.stdout = content_buffer
-
-        title("MANUFACTURING BAY")
-        print()
+        with capture_frame() as frame:
+            title("MANUFACTURING BAY")
+            print()
 
-        previous_content = content_buffer.getvalue()
-        sys.stdout = old_stdout
+        previous_content = frame.getvalue()
 
         # Show options
         options = ["Craft Items", "Craft Ships", "View Manufacturing Jobs", "Back"]
@@ -5867,38 +5687,26 @@ def manufacturing_craft_menu(save_name, data, craft_type):
         page_recipes = sorted_recipes[start_idx:end_idx]
 
         # Capture content for display
-        content_buffer = StringIO()
-        old_stdout = sys.stdout
-        sys.stdout = content_buffer
-
-        # Build display
-        title(f"MANUFACTURING - {craft_type.upper()}S")
-        print()
-        print(f"Page {current_page + 1}/{max_page + 1}\033[K")
-        print()
-        print("=" * 60)
+        with capture_frame() as frame:
+            # Build display
+            title(f"MANUFACTURING - {craft_type.upper()}S")
+            print()
+            print(f"Page {current_page + 1}/{max_page + 1}\033[K")
+            print()
+            print("=" * 60)
 
-        previous_content = content_buffer.getvalue()
-        sys.stdout = old_stdout
+        previous_content = frame.getvalue()
 
         # Build options
         options = []
+        items = player_inventory.bind(data)
         for name, recipe in page_recipes:
             materials = recipe.get('materials', {})
             time_str = f"{recipe.get('time', 0):.0f}s"
 
-            # Check if player has materials
-            has_all_materials = True
-            has_some_materials = False
-            for mat_name, mat_qty in materials.items():
-                inventory_qty = data.get('inventory', {}).get(mat_name, 0)
-                storage_qty = data.get('storage', {}).get(mat_name, 0)
-                player_qty = inventory_qty + storage_qty
-
-                if player_qty < mat_qty:
-                    has_all_materials = False
-                if player_qty > 0:
-                    has_some_materials = True
+            # Check if player has materials (inventory and storage combined)
+            has_all_materials = items.has(materials)
+            has_some_materials = any(items.count(mat_name) > 0 for mat_name in materials)
 
             # Color item name based on material availability
             # Green if has all, yellow if has some, red if has none
@@ -5938,67 +5746,62 @@ def manufacturing_craft_menu(save_name, data, craft_type):
 def show_craft_details(save_name, data, item_name, recipe, items_data, ships_data):
     """Show details about a craftable item and option to craft it"""
     # Capture content for display
-    content_buffer = StringIO()
-    old_stdout = sys.stdout
-    sys.stdout = content_buffer
-
-    # Build display
-    title(f"CRAFT: {item_name}")
-    print()
+    with capture_frame() as frame:
+        # Build display
+        title(f"CRAFT: {item_name}")
+        print()
 
-    # Show item info
-    item_info = items_data.get(item_name, {})
-    item_type = recipe.get('type', 'Unknown').title()
-    print(f"Name: {item_name}\033[K")
-    print(f"Type: {item_type}\033[K")
+        # Show item info
+        item_info = items_data.get(item_name, {})
+        item_type = recipe.get('type', 'Unknown').title()
+        print(f"Name: {item_name}\033[K")
+        print(f"Type: {item_type}\033[K")
 
-    # Show description
-    if recipe.get('type') == 'ship':
-        ship_info = ships_data.get(item_name.lower(), {})
-        desc = ship_info.get('description', 'No description available.')
-        wrapped_desc = wrap_text(desc, 60)
-        print(f"Description: {wrapped_desc}\033[K")
+        # Show description
+        if recipe.get('type') == 'ship':
+            ship_info = ships_data.get(item_name.lower(), {})
+            desc = ship_info.get('description', 'No description available.')
+            wrapped_desc = wrap_text(desc, 60)
+            print(f"Description: {wrapped_desc}\033[K")
 
-        # Show ship stats
-        stats = ship_info.get('stats', {})
-        if stats:
-            print()
-            print("Ship Stats:\033[K")
-            for stat_name, stat_value in stats.items():
-                print(f"  {stat_name}: {stat_value}\033[K")
-    else:
-        desc = item_info.get('description', 'No description available.')
-        wrapped_desc = wrap_text(desc, 60)
-        print(f"Description: {wrapped_desc}\033[K")
+            # Show ship stats
+            stats = ship_info.get('stats', {})
+            if stats:
+                print()
+                print("Ship Stats:\033[K")
+                for stat_name, stat_value in stats.items():
+                    print(f"  {stat_name}: {stat_value}\033[K")
+        else:
+            desc = item_info.get('description', 'No description available.')
+            wrapped_desc = wrap_text(desc, 60)
+            print(f"Description: {wrapped_desc}\033[K")
 
-    print()
+        print()
 
-    # Show crafting time
-    craft_time = recipe.get('time', 0)
-    print(f"Crafting Time: {craft_time:.0f} seconds\033[K")
-    print()
+        # Show crafting time
+        craft_time = recipe.get('time', 0)
+        print(f"Crafting Time: {craft_time:.0f} seconds\033[K")
+        print()
 
-    # Show required materials
-    print("Required Materials:\033[K")
-    materials = recipe.get('materials', {})
-    has_all_materials = True
+        # Show required materials
+        print("Required Materials:\033[K")
+        materials = recipe.get('materials', {})
+        has_all_materials = True
+        items = player_inventory.bind(data)
 
-    for mat_name, mat_qty in materials.items():
-        inventory_qty = data.get('inventory', {}).get(mat_name, 0)
-        storage_qty = data.get('storage', {}).get(mat_name, 0)
-        player_qty = inventory_qty + storage_qty
+        for mat_name, mat_qty in materials.items():
+            player_qty = items.count(mat_name)
 
-        if player_qty >= mat_qty:
-            print(f"  ✓ {mat_name}: {mat_qty} (You have: {player_qty})\033[K")
-        else:
-            print(f"  x {mat_name}: {mat_qty} (You have: {player_qty})\033[K")
-            has_all_materials = False
+            if player_qty >= mat_qty:
+                print(f"  ✓ {mat_name}: {mat_qty} (You have: {player_qty})\033[K")
+            else:
+                print(f"  x {mat_name}: {mat_qty} (You have: {player_qty})\033[K")
+                has_all_materials = False
 
-    print()
-    print("=" * 60)
+        print()
+        print("=" * 60)
 
-    previous_content = content_buffer.getvalue()
-    sys.stdout = old_stdout
+    previous_content = frame.getvalue()
 
     # Show options
     if has_all_materials:
@@ -6015,15 +5818,7 @@ def show_craft_details(save_name, data, item_name, recipe, items_data, ships_dat
         # For items (not ships), ask for quantity
         if item_type != 'ship':
             # Calculate max quantity based on materials
-            max_quantity = float('inf')
-            materials = recipe.get('materials', {})
-            for mat_name, mat_qty in materials.items():
-                inventory_qty = data.get('inventory', {}).get(mat_name, 0)
-                storage_qty = data.get('storage', {}).get(mat_name, 0)
-                player_qty = inventory_qty + storage_qty
-                max_quantity = min(max_quantity, player_qty // mat_qty)
-
-            max_quantity = int(max_quantity)
+            max_quantity = items.max_times(recipe.get('materials', {}))
 
             clear_screen()
             title(f"CRAFT: {item_name}")
@@ -6056,44 +5851,22 @@ def start_crafting(save_name, data, item_name, recipe, quantity=1):
     # Get current station
     station = data.get('docked_at', 'The Citadel')
 
-    # Consume materials for all items (from inventory first, then storage)
-    materials = recipe.get('materials', {})
-    for mat_name, mat_qty in materials.items():
-        total_needed = mat_qty * quantity
-        remaining_qty = total_needed
-
-        # First consume from inventory
-        inventory_qty = data.get('inventory', {}).get(mat_name, 0)
-        consume_from_inventory = min(inventory_qty, remaining_qty)
-        if consume_from_inventory > 0:
-            data['inventory'][mat_name] -= consume_from_inventory
-            if data['inventory'][mat_name] <= 0:
-                del data['inventory'][mat_name]
-            remaining_qty -= consume_from_inventory
-
-        # Then consume from storage if needed
-        if remaining_qty > 0:
-            storage_qty = data.get('storage', {}).get(mat_name, 0)
-            consume_from_storage = min(storage_qty, remaining_qty)
-            if consume_from_storage > 0:
-                data['storage'][mat_name] -= consume_from_storage
-                if data['storage'][mat_name] <= 0:
-                    del data['storage'][mat_name]
-                remaining_qty -= consume_from_storage
-
-    # Create multiple crafting jobs
-    if station not in data['manufacturing_jobs']:
-        data['manufacturing_jobs'][station] = []
-
-    for i in range(quantity):
-        job = {
-            "item": item_name,
-            "station": station,
-            "start_time": time(),
-            "craft_time": recipe.get('time', 0),
-            "type": recipe.get('type', 'item')
-        }
-        data['manufacturing_jobs'][station].append(job)
+    # Consume materials for all items (from inventory first, then storage) and
+    # queue all units as one batch; nothing is consumed if either fails
+    items = player_inventory.bind(data)
+    try:
+        with items.transaction():
+            items.take(recipe.get('materials', {}), quantity)
+            batch = manufacturing_queue.bind(data).queue(station, item_name, quantity,
+                                                         recipe.get('time', 0), recipe.get('type', 'item'))
+    except InsufficientItems as e:
+        clear_screen()
+        title("CRAFTING FAILED")
+        print()
+        print(f"Not enough materials: {e}\033[K")
+        print()
+        input("Press Enter to continue...")
+        return
 
     save_data(save_name, data)
 
@@ -6104,8 +5877,12 @@ def start_crafting(save_name, data, item_name, recipe, quantity=1):
         print(f"Started crafting: {item_name}\033[K")
     else:
         print(f"Started crafting: {item_name} x{quantity}\033[K")
-        print(f"Queued {quantity} manufacturing jobs\033[K")
+        print(f"Queued {quantity} units\033[K")
     print(f"Location: {station}\033[K")
+    wait = batch['start_time'] - time()
+    if wait > 0:
+        print(f"All {station_slots(station)} manufacturing slots here are busy; "
+              f"this order starts in {math.ceil(wait / 60)} minute(s)\033[K")
     print(f"Time per item: {recipe.get('time', 0):.0f} seconds\033[K")
     if quantity > 1:
         print(f"Total time: {recipe.get('time', 0) * quantity:.0f} seconds\033[K")
@@ -6127,12 +5904,12 @@ def view_manufacturing_jobs(save_name, data):
 
     # Helper function to get keyboard input with timeout (non-blocking)
     def get_key_nonblocking(timeout=0.125):
-        """Get a key with timeout, returns None if no key pressed"""
+        """Get a key with timeout (None waits for a key), returns None if no key pressed"""
         if os.name == 'nt':  # Windows
             import msvcrt
             import time as time_module
             start = time_module.time()
-            while time_module.time() - start < timeout:
+            while timeout is None or time_module.time() - start < timeout:
                 if msvcrt.kbhit():
                     key = msvcrt.getch()
                     if key == b'\x1b':  # Escape
@@ -6174,18 +5951,17 @@ def view_manufacturing_jobs(save_name, data):
             finally:
                 termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
 
+    frame_stats = perf.recorder("manufacturing", frame_budget=0.125)
+    queue = manufacturing_queue.bind(data)
+    shown_lines = None  # Screen lines currently on the terminal (None: redraw everything)
+
     while True:
         current_time = time()
+        frame_stats.frame_start()
 
-        # Collect all jobs from all stations and group by item+station
-        job_groups = {}  # Key: (item_name, station), Value: list of jobs
-
-        for station, jobs in data['manufacturing_jobs'].items():
-            for job in jobs:
-                key = (job['item'], station)
-                if key not in job_groups:
-                    job_groups[key] = []
-                job_groups[key].append(job)
+        # Jobs are kept grouped by item+station; only batches finished since the last refresh are processed
+        queue.advance(current_time)
+        job_groups = queue.groups()
 
         if not job_groups:
             clear_screen()
@@ -6197,86 +5973,85 @@ def view_manufacturing_jobs(save_name, data):
             return
 
         # Process job groups
-        all_groups = []
-        for (item_name, station), jobs in job_groups.items():
-            # Calculate stats for the group
-            total_jobs = len(jobs)
-            completed_jobs = 0
-            total_progress = 0
-
-            for job in jobs:
-                elapsed = current_time - job['start_time']
-                progress = min(100, (elapsed / job['craft_time']) * 100)
-                total_progress += progress
-                if elapsed >= job['craft_time']:
-                    completed_jobs += 1
-
-            avg_progress = total_progress / total_jobs
-            all_complete = (completed_jobs == total_jobs)
-            can_collect = (station == current_station or station == 'The Citadel') and all_complete
-
-            all_groups.append({
-                'item_name': item_name,
-                'station': station,
-                'jobs': jobs,
-                'count': total_jobs,
-                'completed_count': completed_jobs,
-                'avg_progress': avg_progress,
-                'all_complete': all_complete,
-                'can_collect': can_collect
-            })
+        all_groups = [job_group_entry(job_group, current_station, current_time) for job_group in job_groups]
 
-        # Sort groups: collectable first, then by progress
-        all_groups.sort(key=lambda g: (not g['can_collect'], -g['avg_progress']))
+        # Sort groups: collectable first, then by progress (as shown, so rows only move when the text does)
+        all_groups.sort(key=lambda g: (not g['can_collect'], -round(g['avg_progress'], 1)))
+        frame_stats.sim_done()
 
-        # Display jobs with live updating
-        clear_screen()
-        title("MANUFACTURING JOBS")
-        print()
-        print("Active Jobs:\033[K")
-        print()
-
-        for i, group in enumerate(all_groups):
-            item_name = group['item_name']
-            station = group['station']
-            count = group['count']
-            completed_count = group['completed_count']
-            avg_progress = group['avg_progress']
-            all_complete = group['all_complete']
-            can_collect = group['can_collect']
-
-            # Progress bar
-            bar_width = 30
-            filled = int((avg_progress / 100) * bar_width)
-            bar = "█" * filled + "░" * (bar_width - filled)
-
-            # Item display with count
-            item_display = f"{item_name}"
-            if count > 1:
-                item_display += f" x{count}"
-
-            status = ""
-            if can_collect:
-                status = " [READY TO COLLECT]"
-            elif all_complete:
-                status = f" [Complete - at {station}]"
-            elif completed_count > 0:
-                status = f" [{completed_count}/{count} done]"
-
-            print(f"{chr(ord('a') + i)}) {item_display} - {station}\033[K")
-            print(f"   [{bar}] {avg_progress:.1f}%{status}\033[K")
+        # Draw jobs off-screen, then rewrite only the lines that changed
+        with capture_frame() as frame:
+            title("MANUFACTURING JOBS")
+            print()
+            print("Active Jobs:\033[K")
             print()
 
-        print("=" * 60)
-        print()
-        print("[a-z] Select job | [ESC] Back\033[K")
-        print()
+            for i, group in enumerate(all_groups):
+                item_name = group['item_name']
+                station = group['station']
+                count = group['count']
+                completed_count = group['completed_count']
+                avg_progress = group['avg_progress']
+                all_complete = group['all_complete']
+                can_collect = group['can_collect']
+
+                # Progress bar
+                bar_width = 30
+                filled = int((avg_progress / 100) * bar_width)
+                bar = "█" * filled + "░" * (bar_width - filled)
+
+                # Item display with count
+                item_display = f"{item_name}"
+                if count > 1:
+                    item_display += f" x{count}"
+
+                status = ""
+                if can_collect:
+                    status = " [READY TO COLLECT]"
+                elif all_complete:
+                    status = f" [Complete - at {station}]"
+                elif completed_count > 0:
+                    status = f" [{completed_count}/{count} done]"
+
+                print(f"{chr(ord('a') + i)}) {item_display} - {station}\033[K")
+                print(f"   [{bar}] {avg_progress:.1f}%{status}\033[K")
+                print()
 
-        # Wait for input with timeout for live updating
-        key = get_key_nonblocking(timeout=0.125)
+            print("=" * 60)
+            print()
+            if any(group['can_collect'] for group in all_groups):
+                print("[a-z] Select job | [Enter] Collect all ready | [ESC] Back\033[K")
+            else:
+                print("[a-z] Select job | [ESC] Back\033[K")
+            print()
+            perf_hud = perf.hud_line(frame_stats)
+            if perf_hud:
+                print(perf_hud + "\033[K")
+        lines = frame.getvalue().split("\n")
+        draw_changed_lines(lines, shown_lines)
+        shown_lines = lines
+        frame_stats.render_done()
+
+        # Sleep until a bar, percentage or status next changes (at most 8 redraws a second), or a key arrives
+        next_change = queue.next_change(current_time)
+        timeout = None if next_change is None else max(0.0, max(next_change, current_time + 0.125) - time())
+        if perf_hud:
+            # The HUD's own numbers change every frame
+            timeout = 0.125 if timeout is None else min(timeout, 0.125)
+        key = get_key_nonblocking(timeout=timeout)
+        if key:
+            frame_stats.key_received()
+            if perf.handle_key(key):
+                key = None
 
         if key == 'esc':
             return
+        elif key == 'enter':
+            # Collect every ready group at once, with a single save
+            ready = [group for group in all_groups if group['can_collect']]
+            if ready:
+                collect_crafted_items_group(save_name, data, ready)
+                shown_lines = None
         elif key and len(key) == 1 and key.isalpha():
             # User selected a job group
             idx = ord(key) - ord('a')
@@ -6290,49 +6065,100 @@ def view_manufacturing_jobs(save_name, data):
                     # Show details about the group
                     show_job_group_details(selected_group)
                     # After showing details, continue the loop to refresh
+                shown_lines = None
 
 
 def collect_crafted_items_group(save_name, data, group):
-    """Collect all completed crafted items in a group"""
-    item_name = group['item_name']
-    station = group['station']
-    jobs = group['jobs']
-    count = group['count']
-    item_type = jobs[0]['type'] if jobs else 'item'
-
-    # Remove all jobs from queue
-    for job in jobs:
-        data['manufacturing_jobs'][station] = [j for j in data['manufacturing_jobs'][station] if j != job]
-    if not data['manufacturing_jobs'][station]:
-        del data['manufacturing_jobs'][station]
-
-    # Give player all the items
-    if item_name not in data['inventory']:
-        data['inventory'][item_name] = 0
-    data['inventory'][item_name] += count
+    """Collect all completed crafted items in a group (or a list of groups, saved once)"""
+    groups = group if isinstance(group, list) else [group]
+    queue = manufacturing_queue.bind(data)
+
+    # Remove all jobs from queue and give player all the items
+    collected = []
+    for entry in groups:
+        item_name = entry['item_name']
+        item_type = entry['group'].type
+        count = queue.collect(entry['group'])
+        if count:
+            data['inventory'][item_name] = data['inventory'].get(item_name, 0) + count
+            collected.append((item_name, item_type, count))
 
     clear_screen()
-    if item_type == 'ship':
-        title("SHIPS CRAFTED")
-        print()
-        if count == 1:
-            print(f"✓ {item_name} ship item has been added to your inventory!\033[K")
+    if len(collected) == 1:
+        item_name, item_type, count = collected[0]
+        if item_type == 'ship':
+            title("SHIPS CRAFTED")
+            print()
+            if count == 1:
+                print(f"✓ {item_name} ship item has been added to your inventory!\033[K")
+            else:
+                print(f"✓ {item_name} x{count} ship items have been added to your inventory!\033[K")
+            print(f"  You can assemble them from the Ship Terminal or form your inventory.\033[K")
         else:
-            print(f"✓ {item_name} x{count} ship items have been added to your inventory!\033[K")
-        print(f"  You can assemble them from the Ship Terminal or form your inventory.\033[K")
+            title("ITEMS CRAFTED")
+            print()
+            if count == 1:
+                print(f"✓ {item_name} has been added to your inventory!\033[K")
+            else:
+                print(f"✓ {item_name} x{count} have been added to your inventory!\033[K")
     else:
         title("ITEMS CRAFTED")
         print()
-        if count == 1:
-            print(f"✓ {item_name} has been added to your inventory!\033[K")
-        else:
-            print(f"✓ {item_name} x{count} have been added to your inventory!\033[K")
+        print("Added to your inventory:\033[K")
+        for item_name, item_type, count in collected:
+            ship_note = " (ship item)" if item_type == 'ship' else ""
+            print(f"  ✓ {item_name} x{count}{ship_note}\033[K")
 
     save_data(save_name, data)
     print()
     input("Press Enter to continue...")
 
 
+def job_group_entry(job_group, current_station, current_time):
+    """Display info for a manufacturing job group (as used by the jobs view and collection)"""
+    station = job_group.station
+    all_complete = job_group.all_complete
+    return {
+        'item_name': job_group.item,
+        'station': station,
+        'group': job_group,
+        'count': job_group.count,
+        'completed_count': job_group.ready,
+        'avg_progress': job_group.progress(current_time),
+        'all_complete': all_complete,
+        'can_collect': (station == current_station or station == 'The Citadel') and all_complete
+    }
+
+
+def show_manufacturing_catch_up(save_name, data, since):
+    """Summarise manufacturing that finished while the game was closed, with the option to collect it"""
+    current_time = time()
+    finished = manufacturing_queue.bind(data).catch_up(since, current_time)
+    if not finished:
+        return
+
+    current_station = data.get('docked_at', '')
+    entries = [job_group_entry(job_group, current_station, current_time) for job_group, _, _ in finished]
+    collectable = [entry for entry in entries if entry['can_collect']]
+
+    with capture_frame() as frame:
+        title("WHILE YOU WERE AWAY")
+        print()
+        print("Manufacturing finished since you last played:\033[K")
+        print()
+        for (job_group, units, finished_at), entry in zip(finished, entries):
+            where = "" if entry['can_collect'] else f" - collect at {job_group.station}"
+            print(f"  ✓ {job_group.item} x{units} ({strftime('%b %d %H:%M', localtime(finished_at))}){where}\033[K")
+        print()
+
+    options = ["Continue"]
+    if collectable:
+        options.insert(0, f"Collect {sum(entry['count'] for entry in collectable)} ready item(s) now")
+    choice = arrow_menu("Select:", options, frame.getvalue())
+    if collectable and choice == 0:
+        collect_crafted_items_group(save_name, data, collectable)
+
+
 def show_job_group_details(group):
     """Show details about a group of manufacturing jobs"""
     item_name = group['item_name']
@@ -6340,7 +6166,7 @@ def show_job_group_details(group):
     count = group['count']
     completed_count = group['completed_count']
     avg_progress = group['avg_progress']
-    jobs = group['jobs']
+    batches = group['group'].batches
 
     clear_screen()
     title("JOB GROUP DETAILS")
@@ -6353,17 +6179,28 @@ def show_job_group_details(group):
     print(f"Completed: {completed_count}/{count}\033[K")
     print()
 
-    # Show individual job progress if there are multiple
-    if count > 1:
-        print("Individual Jobs:\033[K")
+    # Show each batch's progress if there are several
+    if len(batches) > 1:
+        print("Batches:\033[K")
         current_time = time()
-        for i, job in enumerate(jobs, 1):
-            elapsed = current_time - job['start_time']
-            progress = min(100, (elapsed / job['craft_time']) * 100)
-            remaining = max(0, job['craft_time'] - elapsed)
+        for i, batch in enumerate(batches, 1):
+            elapsed = current_time - batch['start_time']
+            if elapsed < 0:
+                # Queued behind other jobs until a manufacturing slot frees up
+                print(f"  {i}. x{batch.get('quantity', 1)} Progress: 0.0% - "
+                      f"Waiting for a slot (starts in {-elapsed:.0f}s)\033[K")
+                continue
+            progress = min(100, (elapsed / batch['craft_time']) * 100) if batch['craft_time'] > 0 else 100
+            remaining = max(0, batch['craft_time'] - elapsed)
 
-            status = "Complete" if elapsed >= job['craft_time'] else f"{remaining:.0f}s remaining"
-            print(f"  {i}. Progress: {progress:.1f}% - {status}\033[K")
+            status = "Complete" if elapsed >= batch['craft_time'] else f"{remaining:.0f}s remaining"
+            print(f"  {i}. x{batch.get('quantity', 1)} Progress: {progress:.1f}% - {status}\033[K")
+        print()
+    elif not group['all_complete']:
+        wait = batches[0]['start_time'] - time() if batches else 0
+        if wait > 0:
+            print(f"Waiting for a slot (starts in {wait:.0f}s)\033[K")
+        print(f"Time remaining: {max(0, group['group'].eta() - time()):.0f}s\033[K")
         print()
 
     if group['all_complete']:
@@ -6437,16 +6274,25 @@ def show_job_details(job_info):
 
 def game_loop(save_name, data):
     clear_screen()
-    if data["v"] < SAVE_VERSION_CODE:
+    # Older saves were already migrated by read_data; newer ones can't be downgraded
+    if data["v"] > SAVE_VERSION_CODE:
         title("CONTINUE GAME")
         print()
-        print("ERROR: Save file is of an older data format.\033[K")
-        print("       No migration method has been programmed.\033[K")
-        print("       This save file can therefore not be loaded.\033[K")
+        print("ERROR: Save file is from a newer version of the game.\033[K")
+        print("       Update the game to load this save file.\033[K")
         print()
         input("Press Enter to return to main menu")
         return
 
+    # Manufacturing that finished since the last save (the save index has its time)
+    last_save = save_engine.summary(save_name)
+    if last_save:
+        show_manufacturing_catch_up(save_name, data, last_save.get("last_played", 0))
+
+    # Drop anomalies that expired while the game was closed, in every system
+    if anomaly_store.bind(data).evict_expired():
+        save_data(save_name, data)
+
     # Set initial presence based on whether player is docked
     if data.get("docked_at"):
         update_discord_presence(data=data, context="docked")
@@ -6512,46 +6358,47 @@ def main_screen(save_name, data):
     update_discord_presence(data=data, context="traveling")
 
     # Capture the screen content before showing the menu
-    content_buffer = StringIO()
-    old_stdout = sys.stdout
-    sys.stdout = content_buffer
-
-    title(f"CURRENT SYSTEM: {system_name}  [{system["SecurityLevel"].upper()}]")
-    print(f"  {system["Region"]} > {system["Sector"]}")
-
-    # Show destination info if set
-    destination = data.get("destination", "")
-    if destination:
-        # Load all systems data for pathfinding
-        with open(resource_path('system_data.json'), 'r') as f:
-            all_systems_data = json.load(f)
+    with capture_frame() as frame:
+        title(f"CURRENT SYSTEM: {system_name}  [{system["SecurityLevel"].upper()}]")
+        print(f"  {system["Region"]} > {system["Sector"]}")
 
-        route = find_route_to_destination(system_name, destination, all_systems_data)
+        # Show destination info if set
+        destination = data.get("destination", "")
+        if destination:
+            # Load all systems data for pathfinding
+            with open(resource_path('system_data.json'), 'r') as f:
+                all_systems_data = json.load(f)
 
-        if route and len(route) > 1:
-            jumps = len(route) - 1
-            dest_security = all_systems_data[destination].get("SecurityLevel", "Unknown")
-            dest_color = get_security_color(dest_security)
+            route = find_route_to_destination(system_name, destination, all_systems_data, data)
+
+            if route and len(route) > 1:
+                jumps = len(route) - 1
+                dest_security = all_systems_data[destination].get("SecurityLevel", "Unknown")
+                dest_color = get_security_color(dest_security)
+
+                # Show destination and jump count
+                print(f"  Destination: {dest_color}{destination}{RESET_COLOR} ({jumps} jump{'s' if jumps != 1 else ''})\033[K")
+
+                # Show security dots for next 5 systems (excluding current)
+                print(f"  Route: ", end="")
+                next_systems = route[1:6]  # Get next 5 systems (excluding current)
+                for next_sys in next_systems:
+                    next_security = all_systems_data[next_sys].get("SecurityLevel", "Unknown")
+                    next_color = get_security_color(next_security)
+                    print(f"{next_color}●{RESET_COLOR}", end="")
+                print()  # newline
+                if wormhole_router.is_wormhole_jump(system_name, route[1]):
+                    print(f"  Next jump: wormhole to {route[1]} (Visit anomalies)\033[K")
+            elif route and len(route) == 1:
+                # Already at destination
+                print(f"  Destination: {get_security_color(all_systems_data[destination].get('SecurityLevel', 'Unknown'))}{destination}{RESET_COLOR} (Arrived!)\033[K")
+            else:
+                # No route found
+                print(f"  Destination: {destination} (No route found)\033[K")
 
-            # Show destination and jump count
-            print(f"  Destination: {dest_color}{destination}{RESET_COLOR} ({jumps} jump{'s' if jumps != 1 else ''})\033[K")
-
-            # Show security dots for next 5 systems (excluding current)
-            print(f"  Route: ", end="")
-            next_systems = route[1:6]  # Get next 5 systems (excluding current)
-            for next_sys in next_systems:
-                next_security = all_systems_data[next_sys].get("SecurityLevel", "Unknown")
-                next_color = get_security_color(next_security)
-                print(f"{next_color}●{RESET_COLOR}", end="")
-            print()  # newline
-        elif route and len(route) == 1:
-            # Already at destination
-            print(f"  Destination: {get_security_color(all_systems_data[destination].get('SecurityLevel', 'Unknown'))}{destination}{RESET_COLOR} (Arrived!)\033[K")
-        else:
-            # No route found
-            print(f"  Destination: {destination} (No route found)\033[K")
+        title(f"CREDITS: ¢{data["credits"]}")
 
-    title(f"CREDITS: ¢{data["credits"]}")
+    previous_content = frame.getvalue()
 
     # Check if current system is a gate (starts with "G-")
     is_gate_system = system_name.startswith("G-")
@@ -6573,9 +6420,6 @@ def main_screen(save_name, data):
 
     rng = random.random()
     if rng <= enemy_encounter_chance:
-        previous_content = content_buffer.getvalue()
-        sys.stdout = old_stdout
-
         # Generate enemy fleet based on system security
         enemy_fleet = generate_enemy_fleet(system_security, data)
 
@@ -6590,7 +6434,6 @@ def main_screen(save_name, data):
             pass
 
     if system_name == "Gatinsir":
-        sys.stdout = old_stdout
         clear_screen()
 
         title(f"CURRENT SYSTEM: {system_name}  [{system["SecurityLevel"].upper()}]")
@@ -6629,9 +6472,6 @@ def main_screen(save_name, data):
         animated_death_screen(save_name, data)
         return
 
-    previous_content = content_buffer.getvalue()
-    sys.stdout = old_stdout
-
     options = ["View status", "Warp to another system", "View inventory",
                "Dock at station", "Scan for anomalies", "Visit anomalies", "Map", "Save and quit"]
     choice = arrow_menu("Select action:", options, previous_content)
@@ -6978,7 +6818,7 @@ def warp_menu(system, save_name, data):
     next_in_route = None
     if destination:
         current_system = data["current_system"]
-        route = find_route_to_destination(current_system, destination, all_systems_data)
+        route = find_route_to_destination(current_system, destination, all_systems_data, data)
         if route and len(route) > 1:
             next_in_route = route[1]  # Next system in route
 
@@ -7166,19 +7006,15 @@ def station_screen(system, station_num, save_name, data):
     while True:
         clear_screen()
 
-        content_buffer = StringIO()
-        old_stdout = sys.stdout
-        sys.stdout = content_buffer
-
-        # Get station data
-        station = system["Stations"][station_num]
-        station_name = station.get("Name", f"{system.get('Name', 'Unknown Station')}")
-        facilities = station.get("Facilities", [])
+        with capture_frame() as frame:
+            # Get station data
+            station = system["Stations"][station_num]
+            station_name = station.get("Name", f"{system.get('Name', 'Unknown Station')}")
+            facilities = station.get("Facilities", [])
 
-        title(f"DOCKED AT: {station_name}")
+            title(f"DOCKED AT: {station_name}")
 
-        previous_content = content_buffer.getvalue()
-        sys.stdout = old_stdout
+        previous_content = frame.getvalue()
 
         # Build options list based on available facilities
         options = []
@@ -7324,16 +7160,12 @@ def visit_marketplace(save_name, data):
 
     while True:
         # Capture content for display
-        content_buffer = StringIO()
-        old_stdout = sys.stdout
-        sys.stdout = content_buffer
-
-        title("GENERAL MARKETPLACE")
-        print()
-        print(f"  Credits: {data['credits']}\033[K")
+        with capture_frame() as frame:
+            title("GENERAL MARKETPLACE")
+            print()
+            print(f"  Credits: {data['credits']}\033[K")
 
-        previous_content = content_buffer.getvalue()
-        sys.stdout = old_stdout
+        previous_content = frame.getvalue()
 
         # Show tabs
         options = ["Buy Items", "Sell Items", "Cancel"]
@@ -7350,20 +7182,31 @@ def visit_marketplace(save_name, data):
             return
 
 
+def price_trend_marker(prices, item_name, field):
+    """▲/▼ after a price that moved on the last market tick"""
+    trend = prices.trend(item_name, field)
+    if trend > 0:
+        return f" {UNSECURE_COLOR}▲{RESET_COLOR}" if field == 'buy_price' else f" {CORE_COLOR}▲{RESET_COLOR}"
+    if trend < 0:
+        return f" {CORE_COLOR}▼{RESET_COLOR}" if field == 'buy_price' else f" {UNSECURE_COLOR}▼{RESET_COLOR}"
+    return ""
+
+
 def marketplace_buy(save_name, data, items_data):
     """Buy items from marketplace"""
+    station = data.get('docked_at')
     while True:
-        # Get all buyable items (items with buy_price specified)
+        prices = get_market()
+
+        # Get all buyable items (items this station's market sells)
         buyable_items = []
         for item_name, item_info in items_data.items():
-            # Don't allow buying ships in the marketplace
-            if item_info.get('type') == 'Ship':
-                continue
-            if item_info.get('buy_price') and item_info['buy_price'] != "":
+            # Ships are not sold in the marketplace
+            if prices.sells(item_name):
                 buyable_items.append((item_name, item_info))
 
         # Sort by price
-        buyable_items.sort(key=lambda x: int(x[1]['buy_price']))
+        buyable_items.sort(key=lambda x: prices.buy_price(x[0], station))
 
         if not buyable_items:
             clear_screen()
@@ -7375,27 +7218,24 @@ def marketplace_buy(save_name, data, items_data):
             return
 
         # Capture current screen for display
-        content_buffer = StringIO()
-        old_stdout = sys.stdout
-        sys.stdout = content_buffer
-
-        print("MARKETPLACE - BUY\033[K")
-        print()
-        print(f"Credits: {data['credits']}\033[K")
-        print()
-        print("=" * 60)
+        with capture_frame() as frame:
+            print("MARKETPLACE - BUY\033[K")
+            print()
+            print(f"Credits: {data['credits']}\033[K")
+            print()
+            print("=" * 60)
 
-        previous_content = content_buffer.getvalue()
-        sys.stdout = old_stdout
+        previous_content = frame.getvalue()
 
         # Display items
         options = []
         for item_name, item_info in buyable_items:
-            price = item_info['buy_price']
+            price = prices.buy_price(item_name, station)
+            trend = price_trend_marker(prices, item_name, 'buy_price')
             item_type = item_info.get('type', 'Unknown')
             # Get current inventory count
             inv_count = data.get('inventory', {}).get(item_name, 0)
-            options.append(f"{item_name} - {price} CR ({item_type}) [Own: {inv_count}]")
+            options.append(f"{item_name} - {price} CR{trend} ({item_type}) [Own: {inv_count}]")
 
         options.append("Back")
 
@@ -7407,7 +7247,7 @@ def marketplace_buy(save_name, data, items_data):
 
         # Show item details and purchase confirmation
         item_name, item_info = buyable_items[choice]
-        price = int(item_info['buy_price'])
+        price = prices.buy_price(item_name, station)
 
         clear_screen()
         title("PURCHASE ITEM")
@@ -7464,9 +7304,8 @@ def marketplace_buy(save_name, data, items_data):
 
             # Process purchase
             data['credits'] -= total_cost
-            if item_name not in data['inventory']:
-                data['inventory'][item_name] = 0
-            data['inventory'][item_name] += quantity
+            player_inventory.bind(data).credit('inventory', item_name, quantity)
+            prices.record_trade(item_name, quantity, buying=True)
 
             save_data(save_name, data)
 
@@ -7484,20 +7323,17 @@ def marketplace_buy(save_name, data, items_data):
 
 def marketplace_sell(save_name, data, items_data):
     """Sell items to marketplace"""
+    station = data.get('docked_at')
     while True:
         # Capture current screen for display
-        content_buffer = StringIO()
-        old_stdout = sys.stdout
-        sys.stdout = content_buffer
-
-        print("MARKETPLACE - SELL\033[K")
-        print()
-        print(f"Credits: {data['credits']}\033[K")
-        print()
-        print("=" * 60)
+        with capture_frame() as frame:
+            print("MARKETPLACE - SELL\033[K")
+            print()
+            print(f"Credits: {data['credits']}\033[K")
+            print()
+            print("=" * 60)
 
-        previous_content = content_buffer.getvalue()
-        sys.stdout = old_stdout
+        previous_content = frame.getvalue()
 
         # Ask whether to sell from inventory or storage
         options = [
@@ -7525,13 +7361,12 @@ def marketplace_sell(save_name, data, items_data):
             input("Press Enter to continue...")
             continue
 
-        # Get all sellable items from the chosen source
+        # Get all sellable items (items the market buys) from the chosen source
+        prices = get_market()
         sellable_items = []
         for item_name, quantity in source.items():
-            if quantity > 0:
-                item_info = items_data.get(item_name, {})
-                if item_info.get('sell_price') and item_info['sell_price'] != "":
-                    sellable_items.append((item_name, item_info, quantity))
+            if quantity > 0 and prices.sell_price(item_name, station) is not None:
+                sellable_items.append((item_name, items_data.get(item_name, {}), quantity))
 
         if not sellable_items:
             clear_screen()
@@ -7543,29 +7378,27 @@ def marketplace_sell(save_name, data, items_data):
             continue
 
         # Sort by sell price (descending)
-        sellable_items.sort(key=lambda x: int(x[1]['sell_price']), reverse=True)
+        sellable_items.sort(key=lambda x: prices.sell_price(x[0], station), reverse=True)
 
         # Display items
         while True:
             # Capture current screen for display
-            content_buffer = StringIO()
-            old_stdout = sys.stdout
-            sys.stdout = content_buffer
-
-            print(f"MARKETPLACE - SELL FROM {source_name.upper()}\033[K")
-            print()
-            print(f"Credits: {data['credits']}\033[K")
-            print()
-            print("=" * 60)
+            with capture_frame() as frame:
+                print(f"MARKETPLACE - SELL FROM {source_name.upper()}\033[K")
+                print()
+                print(f"Credits: {data['credits']}\033[K")
+                print()
+                print("=" * 60)
 
-            previous_content = content_buffer.getvalue()
-            sys.stdout = old_stdout
+            previous_content = frame.getvalue()
 
+            prices = get_market()
             options = []
             for item_name, item_info, quantity in sellable_items:
-                price = item_info['sell_price']
+                price = prices.sell_price(item_name, station)
+                trend = price_trend_marker(prices, item_name, 'sell_price')
                 item_type = item_info.get('type', 'Unknown')
-                options.append(f"{item_name} - {price} CR ({item_type}) [Have: {quantity}]")
+                options.append(f"{item_name} - {price} CR{trend} ({item_type}) [Have: {quantity}]")
 
             options.append("Back")
 
@@ -7577,7 +7410,7 @@ def marketplace_sell(save_name, data, items_data):
 
             # Show item details and sale confirmation
             item_name, item_info, available_quantity = sellable_items[item_choice]
-            price = int(item_info['sell_price'])
+            price = prices.sell_price(item_name, station)
 
             clear_screen()
             title("SELL ITEM")
@@ -7614,12 +7447,9 @@ def marketplace_sell(save_name, data, items_data):
 
                 # Process sale
                 total_value = price * quantity
+                player_inventory.bind(data).debit(source_name, item_name, quantity)
                 data['credits'] += total_value
-                data[source_name][item_name] -= quantity
-
-                # Remove item from source if quantity reaches 0
-                if data[source_name][item_name] <= 0:
-                    del data[source_name][item_name]
+                prices.record_trade(item_name, quantity, buying=False)
 
                 # Update sellable_items list
                 sellable_items = [(n, i, q - quantity if n == item_name else q)
@@ -7715,32 +7545,28 @@ def access_global_storage(save_name, data):
         ]
 
         # Capture current screen
-        content_buffer = StringIO()
-        old_stdout = sys.stdout
-        sys.stdout = content_buffer
-
-        print("GLOBAL STORAGE\033[K")
-        print()
-        print("=" * 60)
-        print("INVENTORY:\033[K")
-        if not inventory:
-            print("  Empty\033[K")
-        else:
-            for item_name, quantity in sorted(inventory.items()):
-                print(f"  {item_name} x{quantity}\033[K")
+        with capture_frame() as frame:
+            print("GLOBAL STORAGE\033[K")
+            print()
+            print("=" * 60)
+            print("INVENTORY:\033[K")
+            if not inventory:
+                print("  Empty\033[K")
+            else:
+                for item_name, quantity in sorted(inventory.items()):
+                    print(f"  {item_name} x{quantity}\033[K")
 
-        print()
-        print("STORAGE:\033[K")
-        if not storage:
-            print("  Empty\033[K")
-        else:
-            for item_name, quantity in sorted(storage.items()):
-                print(f"  {item_name} x{quantity}\033[K")
+            print()
+            print("STORAGE:\033[K")
+            if not storage:
+                print("  Empty\033[K")
+            else:
+                for item_name, quantity in sorted(storage.items()):
+                    print(f"  {item_name} x{quantity}\033[K")
 
-        print("=" * 60)
+            print("=" * 60)
 
-        previous_content = content_buffer.getvalue()
-        sys.stdout = old_stdout
+        previous_content = frame.getvalue()
 
         choice = arrow_menu("Select action:", options, previous_content)
 
@@ -7760,7 +7586,8 @@ def access_global_storage(save_name, data):
 
 def transfer_items(save_name, data, source_key, dest_key):
     """Transfer items between inventory and storage"""
-    source = data.get(source_key, {})
+    items = player_inventory.bind(data)
+    source = items[source_key]
 
     if not source:
         clear_screen()
@@ -7792,21 +7619,17 @@ def transfer_items(save_name, data, source_key, dest_key):
         options.append("Back")
 
         # Capture current screen
-        content_buffer = StringIO()
-        old_stdout = sys.stdout
-        sys.stdout = content_buffer
-
-        print(f"TRANSFER: {source_key.upper()} → {dest_key.upper()}\033[K")
-        print()
-        print(f"{source_key.upper()}:\033[K")
-        print("=" * 60)
-        for i, (item_name, quantity) in enumerate(sorted_items):
-            print(f"  [{i+1}] {item_name} x{quantity}\033[K")
-        print()
-        print("=" * 60)
+        with capture_frame() as frame:
+            print(f"TRANSFER: {source_key.upper()} → {dest_key.upper()}\033[K")
+            print()
+            print(f"{source_key.upper()}:\033[K")
+            print("=" * 60)
+            for i, (item_name, quantity) in enumerate(sorted_items):
+                print(f"  [{i+1}] {item_name} x{quantity}\033[K")
+            print()
+            print("=" * 60)
 
-        previous_content = content_buffer.getvalue()
-        sys.stdout = old_stdout
+        previous_content = frame.getvalue()
 
         choice = arrow_menu("Select item to transfer:", options, previous_content)
 
@@ -7846,15 +7669,7 @@ def transfer_items(save_name, data, source_key, dest_key):
                 continue
 
             # Perform transfer
-            source[item_name] -= quantity
-            if source[item_name] <= 0:
-                del source[item_name]
-
-            dest = data.get(dest_key, {})
-            if item_name not in dest:
-                dest[item_name] = 0
-            dest[item_name] += quantity
-            data[dest_key] = dest
+            items.move(item_name, quantity, source_key, dest_key)
 
             save_data(save_name, data)
 
@@ -7872,14 +7687,9 @@ def transfer_items(save_name, data, source_key, dest_key):
 
 def view_item_details(data, save_name=None):
     """View detailed information about items in inventory or storage"""
-    # Combine inventory and storage for viewing
-    all_items = {}
-
-    for item_name, quantity in data.get('inventory', {}).items():
-        all_items[item_name] = all_items.get(item_name, 0) + quantity
-
-    for item_name, quantity in data.get('storage', {}).items():
-        all_items[item_name] = all_items.get(item_name, 0) + quantity
+    # Inventory and storage combined
+    items = player_inventory.bind(data)
+    all_items = items.totals()
 
     if not all_items:
         clear_screen()
@@ -7920,18 +7730,20 @@ def view_item_details(data, save_name=None):
         print(f"Description: {wrap_text(desc, 60)}\033[K")
         print()
 
-        inv_qty = data.get('inventory', {}).get(item_name, 0)
-        stor_qty = data.get('storage', {}).get(item_name, 0)
+        inv_qty = items.count(item_name, 'inventory')
+        stor_qty = items.count(item_name, 'storage')
 
         print(f"In Inventory: {inv_qty}\033[K")
         print(f"In Storage: {stor_qty}\033[K")
-        print(f"Total: {inv_qty + stor_qty}\033[K")
+        print(f"Total: {items.count(item_name)}\033[K")
         print()
 
-        if item_info.get('sell_price') and item_info['sell_price'] != "":
-            print(f"Sell Price: {item_info['sell_price']} CR\033[K")
-        if item_info.get('buy_price') and item_info['buy_price'] != "":
-            print(f"Buy Price: {item_info['buy_price']} CR\033[K")
+        prices = get_market()
+        station = data.get('docked_at')
+        if prices.sell_price(item_name, station) is not None:
+            print(f"Sell Price: {prices.sell_price(item_name, station)} CR\033[K")
+        if prices.buy_price(item_name, station) is not None:
+            print(f"Buy Price: {prices.buy_price(item_name, station)} CR\033[K")
 
         print()
 
@@ -7943,11 +7755,8 @@ def view_item_details(data, save_name=None):
             if key == 'a':
                 assemble_ship_from_item(save_name, data, item_name)
                 # Refresh all_items after assembly
-                all_items = {}
-                for item_name_refresh, quantity in data.get('inventory', {}).items():
-                    all_items[item_name_refresh] = all_items.get(item_name_refresh, 0) + quantity
-                for item_name_refresh, quantity in data.get('storage', {}).items():
-                    all_items[item_name_refresh] = all_items.get(item_name_refresh, 0) + quantity
+                items = player_inventory.bind(data)
+                all_items = items.totals()
         else:
             input("Press Enter to continue...")
 
@@ -8011,18 +7820,14 @@ def visit_ship_vendor(save_name, data):
         options.append("Back")
 
         # Capture current screen
-        content_buffer = StringIO()
-        old_stdout = sys.stdout
-        sys.stdout = content_buffer
-
-        print("SHIP VENDOR\033[K")
-        print()
-        print(f"Credits: {data['credits']}\033[K")
-        print()
-        print("=" * 60)
+        with capture_frame() as frame:
+            print("SHIP VENDOR\033[K")
+            print()
+            print(f"Credits: {data['credits']}\033[K")
+            print()
+            print("=" * 60)
 
-        previous_content = content_buffer.getvalue()
-        sys.stdout = old_stdout
+        previous_content = frame.getvalue()
 
         choice = arrow_menu("Select ship to purchase:", options, previous_content)
 
@@ -8221,29 +8026,24 @@ def ship_list_tab(save_name, data):
         print()
 
         # Get user choice with custom key handling
-        from io import StringIO
-        import sys
-
-        content_buffer = StringIO()
-        old_stdout = sys.stdout
-        sys.stdout = content_buffer
+        with capture_frame() as frame:
+            # Recreate the screen content
+            print()
+            print("  ┌─────────┐ ┌──────────┐\033[K")
+            print("  │  Ships  │ │ Assembly │\033[K")
+            print("  └─────────┴─┴──────────┴─────────────────────────────────\033[K")
+            print()
+            print("  [1] Ships     [2] Assembly\033[K")
+            print("=" * 60)
+            print()
 
-        # Recreate the screen content
-        print()
-        print("  ┌─────────┐ ┌──────────┐\033[K")
-        print("  │  Ships  │ │ Assembly │\033[K")
-        print("  └─────────┴─┴──────────┴─────────────────────────────────\033[K")
-        print()
-        print("  [1] Ships     [2] Assembly\033[K")
-        print("=" * 60)
-        print()
-
-        previous_content = content_buffer.getvalue()
-        sys.stdout = old_stdout
+        previous_content = frame.getvalue()
 
         selected = 0
+        shown_lines = None
         while True:
-            display_menu("Select ship to view details", options, selected, previous_content)
+            shown_lines = display_menu("Select ship to view details", options, selected, previous_content,
+                                       shown_lines)
             key = get_key()
 
             if key == 'up':
@@ -8323,45 +8123,38 @@ def view_ship_details(save_name, data, ship_index):
         print()
 
         # Capture current screen content for arrow_menu
-        from io import StringIO
-        import sys
-
-        content_buffer = StringIO()
-        old_stdout = sys.stdout
-        sys.stdout = content_buffer
-
-        # Recreate the screen content
-        title("SHIP DETAILS")
-        print()
-        print(f"Nickname: {nickname}\033[K")
-        print(f"Model: {ship_name.title()}\033[K")
-        print()
-        print(f"Class: {ship_info.get('class', 'Unknown')}\033[K")
-        desc = ship_info.get('description', 'No description available.')
-        print(f"Description: {wrap_text(desc, 60)}\033[K")
-        print()
-        print(f"Hull: {current_hull}/{max_hull}\033[K")
-        print(f"Shield: {current_shield}/{max_shield}\033[K")
-        print()
-        print("Stats:\033[K")
-        print(f"  DPS: {stats.get('DPS', 'N/A')}\033[K")
-        print(f"  Shield: {stats.get('Shield', 'N/A')}\033[K")
-        print(f"  Hull: {stats.get('Hull', 'N/A')}\033[K")
-        print(f"  Energy: {stats.get('Energy', 'N/A')}\033[K")
-        print(f"  Speed: {stats.get('Speed', 'N/A')}\033[K")
-        print(f"  Agility: {stats.get('Agility', 'N/A')}\033[K")
-        print(f"  Warp Speed: {stats.get('Warp Speed', 'N/A')}\033[K")
-        print()
-        if ship_index == data["active_ship"]:
-            print("Status: ACTIVE ★\033[K")
-        else:
-            print("Status: Docked\033[K")
-        print()
-        print("=" * 60)
-        print()
+        with capture_frame() as frame:
+            # Recreate the screen content
+            title("SHIP DETAILS")
+            print()
+            print(f"Nickname: {nickname}\033[K")
+            print(f"Model: {ship_name.title()}\033[K")
+            print()
+            print(f"Class: {ship_info.get('class', 'Unknown')}\033[K")
+            desc = ship_info.get('description', 'No description available.')
+            print(f"Description: {wrap_text(desc, 60)}\033[K")
+            print()
+            print(f"Hull: {current_hull}/{max_hull}\033[K")
+            print(f"Shield: {current_shield}/{max_shield}\033[K")
+            print()
+            print("Stats:\033[K")
+            print(f"  DPS: {stats.get('DPS', 'N/A')}\033[K")
+            print(f"  Shield: {stats.get('Shield', 'N/A')}\033[K")
+            print(f"  Hull: {stats.get('Hull', 'N/A')}\033[K")
+            print(f"  Energy: {stats.get('Energy', 'N/A')}\033[K")
+            print(f"  Speed: {stats.get('Speed', 'N/A')}\033[K")
+            print(f"  Agility: {stats.get('Agility', 'N/A')}\033[K")
+            print(f"  Warp Speed: {stats.get('Warp Speed', 'N/A')}\033[K")
+            print()
+            if ship_index == data["active_ship"]:
+                print("Status: ACTIVE ★\033[K")
+            else:
+                print("Status: Docked\033[K")
+            print()
+            print("=" * 60)
+            print()
 
-        previous_content = content_buffer.getvalue()
-        sys.stdout = old_stdout
+        previous_content = frame.getvalue()
 
         # Action options
         options = []
@@ -8729,19 +8522,14 @@ def ship_assembly_tab(save_name, data):
         print()
 
         # Get all ship items from inventory and storage
+        items = player_inventory.bind(data)
         ship_items = {}
 
-        for item_name, quantity in data.get('inventory', {}).items():
+        for item_name in items.totals():
             item_info = items_data.get(item_name, {})
             if item_info.get('type') == 'Ship':
-                ship_items[item_name] = ship_items.get(item_name, {'inv': 0, 'stor': 0})
-                ship_items[item_name]['inv'] = quantity
-
-        for item_name, quantity in data.get('storage', {}).items():
-            item_info = items_data.get(item_name, {})
-            if item_info.get('type') == 'Ship':
-                ship_items[item_name] = ship_items.get(item_name, {'inv': 0, 'stor': 0})
-                ship_items[item_name]['stor'] = quantity
+                ship_items[item_name] = {'inv': items.count(item_name, 'inventory'),
+                                         'stor': items.count(item_name, 'storage')}
 
         if not ship_items:
             print("  No ship items available to assemble.\033[K")
@@ -8779,28 +8567,22 @@ def ship_assembly_tab(save_name, data):
         options.append("Back")
 
         # Get user choice with custom key handling
-        from io import StringIO
-        import sys
-
-        content_buffer = StringIO()
-        old_stdout = sys.stdout
-        sys.stdout = content_buffer
-
-        print()
-        print("  ┌─────────┐ ┌──────────┐\033[K")
-        print("  │  Ships  │ │ Assembly │\033[K")
-        print("  └─────────┴─┴──────────┴─────────────────────────────────\033[K")
-        print()
-        print("  [1] Ships     [2] Assembly\033[K")
-        print("=" * 60)
-        print()
+        with capture_frame() as frame:
+            print()
+            print("  ┌─────────┐ ┌──────────┐\033[K")
+            print("  │  Ships  │ │ Assembly │\033[K")
+            print("  └─────────┴─┴──────────┴─────────────────────────────────\033[K")
+            print()
+            print("  [1] Ships     [2] Assembly\033[K")
+            print("=" * 60)
+            print()
 
-        previous_content = content_buffer.getvalue()
-        sys.stdout = old_stdout
+        previous_content = frame.getvalue()
 
         selected = 0
+        shown_lines = None
         while True:
-            display_menu("Select ship to assemble", options, selected, previous_content)
+            shown_lines = display_menu("Select ship to assemble", options, selected, previous_content, shown_lines)
             key = get_key()
 
             if key == 'up':
@@ -8829,8 +8611,9 @@ def assemble_ship_from_item(save_name, data, ship_name):
     ships_data = load_ships_data()
 
     # Check quantities
-    inv_qty = data.get('inventory', {}).get(ship_name, 0)
-    stor_qty = data.get('storage', {}).get(ship_name, 0)
+    items = player_inventory.bind(data)
+    inv_qty = items.count(ship_name, 'inventory')
+    stor_qty = items.count(ship_name, 'storage')
 
     if inv_qty + stor_qty == 0:
         print("No ship items available!\033[K")
@@ -8886,12 +8669,7 @@ def assemble_ship_from_item(save_name, data, ship_name):
         nickname = ship_name
 
     # Remove item from source
-    if source not in data:
-        data[source] = {}
-
-    data[source][ship_name] -= 1
-    if data[source][ship_name] <= 0:
-        del data[source][ship_name]
+    items.debit(source, ship_name, 1)
 
     # Create assembled ship
     new_ship = {
@@ -9041,10 +8819,10 @@ def new_game():
 
     # Find unique save name by appending numbers if needed
     save_name = player_name
-    save_dir = Path.home() / ".starscape_text_adventure" / "saves"
+    save_worker.flush()  # So a save still being written counts as taken
     counter = 1
 
-    while (save_dir / save_name / "save.json").exists():
+    while save_engine.has_save(save_name):
         save_name = f"{player_name}_{counter}"
         counter += 1
 
@@ -9083,10 +8861,21 @@ def new_game():
     game_loop(save_name, data)
 
 
+def save_slot_label(save_name, summary):
+    """Save list entry: name plus credits, system, ship and last played from the save index"""
+    if not summary:
+        return save_name
+    location = summary["docked_at"] or summary["system"]
+    last_played = strftime('%Y-%m-%d %H:%M', localtime(summary["last_played"]))
+    return (f"{save_name:<16} {summary['credits']:>13,.0f} CR  {location[:20]:<20}  "
+            f"{summary['ship'][:12]:<12}  {last_played}")
+
+
 def continue_game():
     """Load a save and continue it"""
     # List available saves
     save_dir = Path.home() / ".starscape_text_adventure" / "saves"
+    save_worker.flush()  # So saves still being written show up in the list
     if not save_dir.exists():
         clear_screen()
         title("CONTINUE GAME")
@@ -9095,8 +8884,8 @@ def continue_game():
         input("Press Enter to continue...")
         return
 
-    saves = [folder.name for folder in save_dir.iterdir()
-             if folder.is_dir() and (folder / "save.json").exists()]
+    slots = save_engine.list_saves()
+    saves = [save_name for save_name, _ in slots]
 
     if not saves:
         clear_screen()
@@ -9107,7 +8896,7 @@ def continue_game():
         return
 
     # Add "Cancel" option
-    options = saves + ["Cancel"]
+    options = [save_slot_label(save_name, summary) for save_name, summary in slots] + ["Cancel"]
 
     choice = arrow_menu("SELECT SAVE TO CONTINUE", options)
 
@@ -9129,6 +8918,7 @@ def continue_game():
 def delete_save_screen():
     """List saves and delete the selected one after confirmation"""
     save_dir = Path.home() / ".starscape_text_adventure" / "saves"
+    save_worker.flush()  # So saves still being written show up in the list
 
     if not save_dir.exists():
         clear_screen()
@@ -9138,8 +8928,8 @@ def delete_save_screen():
         input("Press Enter to continue...")
         return
 
-    saves = [folder.name for folder in save_dir.iterdir()
-             if folder.is_dir() and (folder / "save.json").exists()]
+    slots = save_engine.list_saves()
+    saves = [save_name for save_name, _ in slots]
 
     if not saves:
         clear_screen()
@@ -9149,7 +8939,7 @@ def delete_save_screen():
         input("Press Enter to continue...")
         return
 
-    options = saves + ["Cancel"]
+    options = [save_slot_label(save_name, summary) for save_name, summary in slots] + ["Cancel"]
     choice = arrow_menu("SELECT SAVE TO DELETE", options)
 
     if choice == len(saves):  # Cancel
@@ -9172,6 +8962,10 @@ def delete_save_screen():
         input("Press Enter to continue...")
         return
 
+    # Write anything still queued first, so the worker can't recreate the folder afterwards
+    save_worker.flush()
+    save_engine.forget(save_name)
+
     # Delete save directory and contents
     for root, dirs, files in os.walk(save_path, topdown=False):
         for file in files:
@@ -9194,6 +8988,10 @@ def get_settings():
         "adaptive_discord_presence": True,
         "ambiance_volume": 100,
         "battle_volume": 100,
+        "performance_instrumentation": False,
+        "record_combat": False,
+        "save_journal": False,
+        "sqlite_saves": False,
     }
 
     # Load existing settings or use defaults
@@ -9222,6 +9020,10 @@ def settings_screen():
         "adaptive_discord_presence": True,
         "ambiance_volume": 100,
         "battle_volume": 100,
+        "performance_instrumentation": False,
+        "record_combat": False,
+        "save_journal": False,
+        "sqlite_saves": False,
     }
 
     # Load existing settings or create defaults
@@ -9332,12 +9134,20 @@ def settings_screen():
             # Build menu options based on current settings
             startup_dialog_status   = "ON"  if settings["display_startup_dialog"]    else "OFF"
             discord_presence_status = "ON"  if settings["adaptive_discord_presence"] else "OFF"
+            perf_status             = "ON"  if settings["performance_instrumentation"] else "OFF"
+            record_status           = "ON"  if settings["record_combat"] else "OFF"
+            journal_status          = "ON"  if settings["save_journal"] else "OFF"
+            sqlite_status           = "ON"  if settings["sqlite_saves"] else "OFF"
             av = volume_bar(settings["ambiance_volume"])
             bv = volume_bar(settings["battle_volume"])
 
             options = [
                 f"Display dialog on startup:        {startup_dialog_status}",
                 f"Adaptive Discord rich presence:   {discord_presence_status}",
+                f"Performance instrumentation:      {perf_status}",
+                f"Record combat encounters:         {record_status}",
+                f"Journaled saves:                  {journal_status}",
+                f"SQLite save storage:              {sqlite_status}",
                 f"Ambiance music volume:  {av}",
                 f"Battle music volume:    {bv}",
                 "Reset settings to default",
@@ -9353,12 +9163,28 @@ def settings_screen():
                 settings["adaptive_discord_presence"] = not settings["adaptive_discord_presence"]
 
             elif choice == 2:
-                edit_volume("Ambiance music volume", "ambiance_volume")
+                # Frame timings are recorded while on; press ` in combat/mining/jobs to show the HUD
+                settings["performance_instrumentation"] = not settings["performance_instrumentation"]
 
             elif choice == 3:
-                edit_volume("Battle music volume (also applies to Vex)", "battle_volume")
+                # Recordings go to ~/.starscape_text_adventure/recordings (see replay_combat)
+                settings["record_combat"] = not settings["record_combat"]
 
             elif choice == 4:
+                # Small changes are appended to save.journal instead of rewriting save.dat
+                settings["save_journal"] = not settings["save_journal"]
+
+            elif choice == 5:
+                # Saves are kept in save.db (indexed tables) instead of save.dat; converted on next save
+                settings["sqlite_saves"] = not settings["sqlite_saves"]
+
+            elif choice == 6:
+                edit_volume("Ambiance music volume", "ambiance_volume")
+
+            elif choice == 7:
+                edit_volume("Battle music volume (also applies to Vex)", "battle_volume")
+
+            elif choice == 8:
                 # Reset settings to default
                 clear_screen()
                 title("RESET SETTINGS")
@@ -9379,9 +9205,16 @@ def settings_screen():
                     print("\nReset cancelled.\033[K")
                     input("Press Enter to continue...")
 
-            elif choice == 5:
+            elif choice == 9:
                 # Save and exit
                 save_settings()
+                if settings["performance_instrumentation"]:
+                    perf.enable()
+                else:
+                    perf.disable()
+                save_worker.flush()
+                save_engine.use_journal = settings["save_journal"]
+                save_engine.use_sqlite = settings["sqlite_saves"]
                 return
     finally:
         globals()['get_key'] = _saved
@@ -9824,11 +9657,13 @@ def animated_death_screen(save_name, data):
     RESET = "\033[0m"
 
     def type_text(text, delay=0.03, color=GREEN):
-        """Print text with typing effect"""
+        """Print text with typing effect (color is set once, not per character)"""
+        sys.stdout.write(color)
         for char in text:
-            print(color + char + RESET, end='', flush=True)
+            sys.stdout.write(char)
+            sys.stdout.flush()
             sleep(delay)
-        print()
+        sys.stdout.write(RESET + "\n")
 
     def glitch_line(length=60):
         """Generate a glitchy corrupted line"""
@@ -9968,6 +9803,8 @@ def animated_death_screen(save_name, data):
     player_ship["shield_hp"] = get_max_shield(player_ship)
 
     save_data(save_name, data)
+    # Don't leave the respawn waiting in the save worker
+    save_worker.flush()
 
     # Update presence - now docked at The Citadel after respawn
     update_discord_presence(data=data, context="docked")
@@ -9998,33 +9835,83 @@ def get_systems_within_jumps(start_system, max_jumps, all_systems_data):
     return visited
 
 
-def find_route_to_destination(start_system, end_system, all_systems_data):
-    """Find shortest route from start to end system using BFS.
+def find_route_to_destination(start_system, end_system, all_systems_data, data=None):
+    """Find shortest route from start to end system, through gates and known wormholes.
+    Wormholes the player has scanned (taken from data, or from the last call
+    that passed it) are used until they collapse.
     Returns list of systems in order, or None if no route exists."""
-    from collections import deque
+    router = get_wormhole_router(all_systems_data)
+    if data is not None:
+        router.sync(known_wormholes(data.get("anomalies", {})))
+    return router.route(start_system, end_system)
 
-    if start_system == end_system:
-        return [start_system]
 
-    visited = {start_system}
-    queue = deque([(start_system, [start_system])])
+def get_wormhole_router(all_systems_data):
+    """The WormholeRouter over the gate network, built on first use"""
+    global wormhole_router
+    if wormhole_router is None:
+        wormhole_router = WormholeRouter(all_systems_data)
+    return wormhole_router
 
-    while queue:
-        current, path = queue.popleft()
 
-        system_info = all_systems_data.get(current)
-        if not system_info:
-            continue
+def get_trade_planner(all_systems_data):
+    """The TradePlanner over system_data.json's stations, built on first use"""
+    global trade_planner
+    if trade_planner is None:
+        trade_planner = TradePlanner(all_systems_data)
+    return trade_planner
 
-        for neighbor in system_info.get("Connections", []):
-            if neighbor == end_system:
-                return path + [neighbor]
 
-            if neighbor not in visited:
-                visited.add(neighbor)
-                queue.append((neighbor, path + [neighbor]))
+def show_trade_routes(data, all_systems_data):
+    """Rank trade loops from the current system; returns the system of the chosen loop's first stop elsewhere (or None)"""
+    clear_screen()
+    title("TRADE ROUTES")
+    print()
+    print("Plans loops that refine and sell your inventory and return here.\033[K")
+    print()
+
+    def ask_number(prompt, default):
+        try:
+            answer = input(f"{prompt} (Enter for {default}): ").strip()
+            return max(0, int(answer)) if answer else default
+        except ValueError:
+            return default
+
+    cargo_limit = ask_number("Cargo limit in units", DEFAULT_CARGO_LIMIT)
+    max_jumps = ask_number("Jump budget", DEFAULT_MAX_JUMPS)
+
+    current_system = data["current_system"]
+    plans = get_trade_planner(all_systems_data).plan(current_system, data.get('inventory', {}), get_market(),
+                                                     cargo_limit, max_jumps)
+
+    if not plans:
+        print()
+        print(f"No loop within {max_jumps} jumps beats selling in {current_system}.\033[K")
+        print()
+        input("Press Enter to continue...")
+        return None
+
+    with capture_frame() as frame:
+        title("TRADE ROUTES")
+        print()
+        print(f"From {current_system} | Cargo limit {cargo_limit} | Jump budget {max_jumps}\033[K")
+        print(f"Selling here: {plans[0]['profit'] - plans[0]['gain']} CR; gains below are on top of that\033[K")
+        print()
+        print("=" * 60)
 
-    return None  # No route found
+    previous_content = frame.getvalue()
+
+    options = []
+    for plan in plans:
+        stops = " → ".join(f"{action.title()} @ {station}" for station, _, action in plan["stops"])
+        options.append(f"+{plan['gain']} CR, {plan['jumps']} jumps ({plan['gain_per_jump']:.0f} CR/jump): {stops}")
+    options.append("Back")
+
+    choice = arrow_menu("Select a loop to set its first stop as destination:", options, previous_content)
+    if choice == len(options) - 1:
+        return None
+    # Stops in this system (refining before leaving) need no travel
+    return next(name for _, name, _ in plans[choice]["stops"] if name != current_system)
 
 
 def fuzzy_match(query, text):
@@ -10159,31 +10046,25 @@ def search_systems(all_systems_data):
         input("Press Enter to continue...")
         return None
 
-    # Show results with letter navigation
-    print()
-    print(f"Found {len(matches)} system(s):\033[K")
-    print()
+    # Show every result in a paged, filterable menu
+    with capture_frame() as frame:
+        title("GALAXY SEARCH")
+        print()
+        print(f"Found {len(matches)} system(s) matching '{query}'\033[K")
 
-    letter_map = {}
-    for i, system_name in enumerate(matches[:26]):  # Limit to 26 for a-z
-        letter = chr(ord('a') + i)
-        letter_map[letter] = system_name
+    previous_content = frame.getvalue()
 
-        system_info = all_systems_data[system_name]
-        security = system_info.get("SecurityLevel", "Unknown")
+    options = []
+    for system_name in matches:
+        security = all_systems_data[system_name].get("SecurityLevel", "Unknown")
         color = get_security_color(security)
+        options.append(f"{color}{system_name}{RESET_COLOR} ({security})")
+    options.append("Cancel")
 
-        print(f"  [{letter}] {color}{system_name}{RESET_COLOR} ({security})\033[K")
-
-    print()
-    print("Press a letter to view that system, or Enter to cancel\033[K")
-
-    while True:
-        key = get_key()
-        if key == 'enter':
-            return None
-        elif key and key in letter_map:
-            return letter_map[key]
+    choice = arrow_menu("Select a system to view:", options, previous_content)
+    if choice == len(options) - 1:
+        return None
+    return matches[choice]
 
 
 def get_security_color(security_level):
@@ -10375,7 +10256,7 @@ def draw_line(grid, x1, y1, x2, y2, char='·'):
 
 
 def display_spatial_map(center_system, all_systems_data, current_system,
-                        destination):
+                        destination, data=None):
     """Display galaxy map as a node-based spatial graph"""
     clear_screen()
 
@@ -10479,7 +10360,7 @@ def display_spatial_map(center_system, all_systems_data, current_system,
 
     # Assign letters and place system markers
     # Skip letters used for controls
-    reserved_keys = {'s', 'f'}  # Search, Find by security
+    reserved_keys = {'s', 'f', 't'}  # Search, Find by security, Trade routes
     letter_map = {}
     letter_idx = 0
 
@@ -10545,7 +10426,7 @@ def display_spatial_map(center_system, all_systems_data, current_system,
     # Find next system in route if destination is set
     next_in_route = None
     if destination:
-        route = find_route_to_destination(current_system, destination, all_systems_data)
+        route = find_route_to_destination(current_system, destination, all_systems_data, data)
         if route and len(route) > 1:
             next_in_route = route[1]
 
@@ -10592,7 +10473,7 @@ def display_spatial_map(center_system, all_systems_data, current_system,
 
     print()
     print(
-        "  [a-z] Navigate | [SHIFT+letter] Set dest | [s] Search | [f] Find by security | [ESC] Exit")
+        "  [a-z] Navigate | [SHIFT+letter] Set dest | [s] Search | [f] Find by security | [t] Trade routes | [ESC] Exit")
     print("  Legend: ★ Current System  ◆ Destination  @ Viewing Center  \033[33m➜\033[0m Next in Route\033[K")
     print("=" * 60)
 
@@ -10614,7 +10495,7 @@ def galaxy_map(save_name, data):
 
     while True:
         letter_map = display_spatial_map(center_system, all_systems_data,
-                                         current_system, destination)
+                                         current_system, destination, data)
 
         key, is_shift = get_key_with_shift()
 
@@ -10638,6 +10519,12 @@ def galaxy_map(save_name, data):
             result = find_nearest_by_security(current_system, all_systems_data)
             if result:
                 center_system = result
+        elif key == 't' and not is_shift:
+            # Plan a trade loop; its first stop outside this system becomes the destination
+            result = show_trade_routes(data, all_systems_data)
+            if result and result != current_system:
+                destination = result
+                center_system = result
         elif key and key in letter_map:
             selected_system = letter_map[key]
 
@@ -10652,7 +10539,22 @@ def galaxy_map(save_name, data):
                 center_system = selected_system
 
 
+def export_perf_session():
+    """Write this session's recorded frame timings to the perf folder (if any were recorded)"""
+    try:
+        perf.export(Path.home() / ".starscape_text_adventure" / "perf")
+    except OSError:
+        pass
+
+
+def _sigterm_handler(sig, frame):
+    """SIGTERM handler — write queued saves before the game is terminated."""
+    exit_game()
+
+
 def exit_game(close_rpc=True):
+    save_worker.close()
+    export_perf_session()
     if close_rpc:
         close_discord_rpc()
     if MUSIC_AVAILABLE:
@@ -10665,9 +10567,20 @@ def main():
     # Load settings
     settings = get_settings()
 
+    # Flush queued saves if the game is terminated
+    signal.signal(signal.SIGTERM, _sigterm_handler)
+
     # Initialize Discord Rich Presence
     init_discord_rpc()
 
+    # Frame-time instrumentation is opt-in (Settings > Performance instrumentation)
+    if settings.get("performance_instrumentation", False):
+        perf.enable()
+
+    # Append-only save journal is opt-in (Settings > Journaled saves)
+    save_engine.use_journal = settings.get("save_journal", False)
+    save_engine.use_sqlite = settings.get("sqlite_saves", False)
+
     # Display startup dialog if enabled in settings
     if settings.get("display_startup_dialog", True):
         startup_lines = [
@@ -10738,10 +10651,45 @@ def main():
     finally:
         # Clean up Discord connection when exiting
         close_discord_rpc()
+        save_worker.close()
+        export_perf_session()
         print("Game exited.\033[K")
 
 
 if __name__ == "__main__":
+    # Headless combat replay: main.py --replay-combat <recording.json> [--realtime]
+    if len(sys.argv) >= 3 and sys.argv[1] == "--replay-combat":
+        try:
+            replay = replay_combat(sys.argv[2], realtime="--realtime" in sys.argv[3:])
+        except ReplayDivergence as e:
+            print(f"Replay diverged from recording: {e}")
+            sys.exit(1)
+        print(f"Outcome: {replay['outcome']} (recorded: {replay['expected_outcome']})")
+        print(f"Replayed {replay['events']} events in {replay['elapsed']:.3f}s")
+        print("MATCH" if replay["matched"] else "MISMATCH")
+        sys.exit(0 if replay["matched"] else 1)
+
+    # Intensity policy report: main.py --mining-report ["Ore Name"]
+    if len(sys.argv) >= 2 and sys.argv[1] == "--mining-report":
+        mining_report(sys.argv[2] if len(sys.argv) >= 3 else "Korrelite Ore")
+        sys.exit(0)
+
+    # Save import/export as plain JSON: main.py --export-save <save> <file.json>
+    #                                   main.py --import-save <file.json> <save>
+    if len(sys.argv) == 4 and sys.argv[1] in ("--export-save", "--import-save"):
+        settings = get_settings()
+        save_engine.use_sqlite = settings.get("sqlite_saves", False)
+        save_engine.use_journal = settings.get("save_journal", False)
+        if sys.argv[1] == "--export-save":
+            if not save_engine.export_json(sys.argv[2], sys.argv[3]):
+                print(f"No save named '{sys.argv[2]}'")
+                sys.exit(1)
+            print(f"Exported '{sys.argv[2]}' to {sys.argv[3]}")
+        else:
+            save_engine.import_json(sys.argv[3], sys.argv[2])
+            print(f"Imported {sys.argv[2]} as '{sys.argv[3]}'")
+        sys.exit(0)
+
     try:
         main()
     except KeyboardInterrupt:
@@ -0,0 +1,289 @@
+"""
+Manufacturing job scheduler.
+
+A manufacturing order is stored as one batch per station ({"item", "station",
+"type", "quantity", "start_time", "craft_time"}) instead of one job dict per
+unit, so queueing 500 System Probes adds a single entry to the save. Units
+of a batch are crafted side by side and finish together at start_time +
+craft_time, as they always have.
+
+Station slot rules: every station crafts up to DEFAULT_STATION_SLOTS (3)
+orders at a time in parallel, and The Citadel, the galaxy's hub, up to 6
+(STATION_SLOTS). An order queued while every slot is busy waits, in series,
+for the first slot to free up; its start_time is that moment. Since queued
+batches are never reordered, the whole timeline is fixed when a batch is
+queued, and what finished while the game was closed follows in closed form
+from the stored times (catch_up()).
+
+ManufacturingQueue indexes the batches of a save by (item, station) group and
+keeps a min-heap of start and completion times. advance() pops only the
+batches that started or finished since the last call, so a refresh costs
+O(log n) per such batch and nothing otherwise. Each group keeps its ready
+count and the sums its progress is a linear function of over its running
+batches (waiting batches count as no progress until they start), so
+progress and ready counts are O(1) per group, and ETAs look at the group's
+few batches rather than every unit.
+"""
+import heapq
+import math
+from itertools import count
+from time import time
+
+# Orders (batches) each station crafts at once; None would mean no limit
+DEFAULT_STATION_SLOTS = 3
+STATION_SLOTS = {"The Citadel": 6}
+
+
+def batch_quantity(batch):
+    """Units in a batch (jobs from before batching are single units)"""
+    return batch.get("quantity", 1)
+
+
+def finishes_at(batch):
+    return batch["start_time"] + batch["craft_time"]
+
+
+def station_slots(station):
+    return STATION_SLOTS.get(station, DEFAULT_STATION_SLOTS)
+
+
+def slot_start(batches, now, slots):
+    """When a batch queued now at a station with these batches can start
+
+    Args:
+        batches: The station's batches, in queue order
+        slots: Batches the station crafts at once (None: no limit)
+    """
+    if slots is None:
+        return now
+    # Replay the station's timeline: each batch took the slot that freed up first
+    free = [now] * slots
+    for batch in sorted(batches, key=lambda b: b["start_time"]):
+        heapq.heapreplace(free, max(free[0], finishes_at(batch)))
+    return max(now, free[0])
+
+
+class JobGroup:
+    """Batches of one item at one station"""
+
+    def __init__(self, item, station):
+        self.item = item
+        self.station = station
+        self.batches = []
+        self.count = 0
+        self.ready = 0
+        self._pending = []
+        self._running = []
+        # Progress of the running units is (now * _rate - _offset) / count, until
+        # _valid_until (the next time one of the group's batches starts or finishes)
+        self._rate = 0.0
+        self._offset = 0.0
+        self._valid_until = math.inf
+
+    @property
+    def type(self):
+        return self.batches[0].get("type", "item") if self.batches else "item"
+
+    @property
+    def all_complete(self):
+        return self.ready == self.count
+
+    def _reindex(self):
+        running = self._running
+        self._rate = sum(batch_quantity(b) / b["craft_time"] for b in running)
+        self._offset = sum(batch_quantity(b) * b["start_time"] / b["craft_time"] for b in running)
+        self._valid_until = min((finishes_at(b) if any(b is r for r in running) else b["start_time"]
+                                 for b in self._pending), default=math.inf)
+
+    def progress(self, now):
+        """Average progress of the group's units, 0-100"""
+        if not self.count:
+            return 100.0
+        if now <= self._valid_until:
+            done = self.ready + now * self._rate - self._offset
+        else:
+            # A batch started or finished since the last advance(): sum each batch's share
+            done = self.ready + sum(batch_quantity(b) * min(1.0, max(0.0, (now - b["start_time"]) / b["craft_time"]))
+                                    for b in self._pending)
+        return min(100.0, max(0.0, done / self.count * 100))
+
+    def next_change(self, now, step=0.1):
+        """Next time the progress, shown rounded to step percent, changes (None if it can't before a completion)"""
+        if not self._rate or not self.count:
+            return None
+        progress = self.progress(now)
+        # Rounding flips at the halfway point to the next step
+        target = (math.floor(progress / step + 0.5) + 0.5) * step
+        if target >= 100:
+            return None
+        return now + (target - progress) * self.count / (self._rate * 100)
+
+    def eta(self):
+        """Time the last unit of the group finishes"""
+        return max((finishes_at(b) for b in self._pending), default=0)
+
+
+class ManufacturingQueue:
+    """Completion heap and per-group totals over one save's manufacturing jobs
+
+    Call bind(data) before use; it reindexes only when a different save dict
+    (or a replaced job map) is passed in.
+    """
+
+    def __init__(self):
+        self._data = None
+        self._jobs = None
+        self._groups = {}
+        self._heap = []
+        self._order = count()
+
+    def bind(self, data):
+        """Index a save's manufacturing jobs; cheap if data is already indexed"""
+        data.setdefault("manufacturing_jobs", {})
+        if data is self._data and data["manufacturing_jobs"] is self._jobs:
+            return self
+        self._data = data
+        self._jobs = data["manufacturing_jobs"]
+        self._groups = {}
+        self._heap = []
+        for station, batches in self._jobs.items():
+            for batch in batches:
+                self._index(station, batch)
+        heapq.heapify(self._heap)
+        for group in self._groups.values():
+            group._reindex()
+        return self
+
+    def _index(self, station, batch, push=False):
+        key = (batch["item"], station)
+        group = self._groups.get(key)
+        if group is None:
+            group = self._groups[key] = JobGroup(batch["item"], station)
+        group.batches.append(batch)
+        group.count += batch_quantity(batch)
+        if batch["craft_time"] <= 0:
+            group.ready += batch_quantity(batch)
+            return group
+        group._pending.append(batch)
+        # A batch joins its group's progress when it starts and leaves it when it finishes
+        for entry in ((batch["start_time"], next(self._order), key, batch, True),
+                      (finishes_at(batch), next(self._order), key, batch, False)):
+            if push:
+                heapq.heappush(self._heap, entry)
+            else:
+                self._heap.append(entry)
+        return group
+
+    def queue(self, station, item, quantity, craft_time, item_type="item", now=None):
+        """Queue a batch of quantity units at a station
+
+        The batch starts now, or when a slot frees up if all of the station's
+        slots are busy.
+
+        Returns:
+            dict: The batch added to the save
+        """
+        if now is None:
+            now = time()
+        batch = {
+            "item": item,
+            "station": station,
+            "start_time": slot_start(self._jobs.get(station, []), now, station_slots(station)),
+            "craft_time": craft_time,
+            "type": item_type,
+            "quantity": quantity,
+        }
+        self._jobs.setdefault(station, []).append(batch)
+        self._index(station, batch, push=True)._reindex()
+        return batch
+
+    def advance(self, now=None):
+        """Start batches whose slot came up by now, and move batches that have
+        finished by now into their groups' ready counts
+
+        Returns:
+            list: The groups that started or finished batches
+        """
+        if now is None:
+            now = time()
+        changed = {}
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            _, _, key, batch, starting = heapq.heappop(heap)
+            group = self._groups.get(key)
+            if group is None or not any(b is batch for b in group._pending):
+                # Collected (or otherwise removed) before it came up
+                continue
+            if starting:
+                group._running.append(batch)
+            else:
+                group._pending = [b for b in group._pending if b is not batch]
+                group._running = [b for b in group._running if b is not batch]
+                group.ready += batch_quantity(batch)
+            changed[key] = group
+        for group in changed.values():
+            group._reindex()
+        return list(changed.values())
+
+    def groups(self):
+        """Every job group, in the order they were first queued"""
+        return list(self._groups.values())
+
+    def group(self, item, station):
+        return self._groups.get((item, station))
+
+    def next_completion(self):
+        """Earliest time a queued batch starts or finishes, or None"""
+        return self._heap[0][0] if self._heap else None
+
+    def next_change(self, now, step=0.1):
+        """Next time anything the jobs view shows changes: a batch starting or
+        finishing, or a group's progress (rounded to step percent) moving on
+
+        Returns:
+            float: The time, or None if nothing is in progress
+        """
+        times = [group.next_change(now, step) for group in self._groups.values()]
+        times.append(self.next_completion())
+        times = [t for t in times if t is not None]
+        return min(times) if times else None
+
+    def catch_up(self, since, now=None):
+        """What finished between since (e.g. when the game was last saved) and now
+
+        Returns:
+            list: (group, units, finished_at) for every group with units that
+            finished in that window, in the order they finished
+        """
+        if now is None:
+            now = time()
+        self.advance(now)
+        finished = []
+        for group in self._groups.values():
+            times = [finishes_at(b) for b in group.batches if since < finishes_at(b) <= now]
+            if times:
+                units = sum(batch_quantity(b) for b in group.batches if since < finishes_at(b) <= now)
+                finished.append((group, units, max(times)))
+        finished.sort(key=lambda entry: entry[2])
+        return finished
+
+    def ready_units(self):
+        return sum(group.ready for group in self._groups.values())
+
+    def collect(self, group):
+        """Remove a group's batches from the save
+
+        Returns:
+            int: Number of units collected
+        """
+        key = (group.item, group.station)
+        if self._groups.get(key) is not group:
+            return 0
+        del self._groups[key]
+        batches = {id(b) for b in group.batches}
+        remaining = [b for b in self._jobs.get(group.station, []) if id(b) not in batches]
+        if remaining:
+            self._jobs[group.station] = remaining
+        else:
+            self._jobs.pop(group.station, None)
+        return group.count
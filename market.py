@@ -0,0 +1,187 @@
+"""
+Dynamic marketplace prices.
+
+items.json gives each item a fixed buy_price and/or sell_price. The market
+holds a price factor per item (1.0 is the items.json price), indexed by
+item ID in one array, and moves every factor once per MARKET_TICK:
+
+    factor = 1 + (factor - 1) * REVERSION + noise
+
+so prices drift with supply and demand but are always pulled back toward
+the listed price. The noise is uniform in +/- VOLATILITY, which keeps an
+untouched item's factor within 1 +/- VOLATILITY / (1 - REVERSION).
+
+Player trades add pressure to the traded item (buying pushes its price up,
+selling pushes it down), which is applied over the next ticks and decays
+by PRESSURE_DECAY each tick. Only traded items carry pressure, so it is
+kept sparse; factors it moves are clamped to MIN_FACTOR..MAX_FACTOR.
+
+A tick is one pass over the factor array: NumPy when it is installed, an
+array('d') rebuilt by a list comprehension otherwise. Each tick's array
+is kept in a ring buffer of the last HISTORY ticks for price history.
+
+Each station's marketplace also has its own fixed price level per item,
+within +/- LOCAL_SPREAD of the galaxy-wide price and derived from the
+station and item names, so prices differ from station to station in the
+same way every session. Buy and sell prices share both factors, so an
+item never sells for more than it can be bought for at the same station.
+"""
+import random
+from array import array
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+MARKET_TICK = 60.0
+HISTORY = 240
+REVERSION = 0.98
+VOLATILITY = 0.01
+LIQUIDITY = 200
+PRICE_IMPACT = 0.01
+MAX_PRESSURE = 5.0
+PRESSURE_DECAY = 0.8
+MIN_FACTOR = 0.5
+MAX_FACTOR = 2.0
+LOCAL_SPREAD = 0.2
+
+# Item types the General Marketplace does not sell (ships come from the Ship Vendor)
+UNSOLD_TYPES = ("Ship",)
+
+
+def listed_price(item_info, field):
+    """An item's items.json price (buy_price or sell_price), or None if it has none"""
+    price = item_info.get(field)
+    if price in (None, ""):
+        return None
+    return int(price)
+
+
+def local_factor(station, item_name):
+    """A station's fixed price level for an item, relative to the galaxy-wide price"""
+    return 1.0 + LOCAL_SPREAD * (2 * random.Random(f"{station}:{item_name}").random() - 1)
+
+
+class Market:
+    """Price factors, pressure and price history of every item with a listed price"""
+
+    def __init__(self, items_data, seed=None, now=0.0):
+        self.names = [name for name, info in items_data.items()
+                      if listed_price(info, 'buy_price') is not None or listed_price(info, 'sell_price') is not None]
+        self.index = {name: i for i, name in enumerate(self.names)}
+        self.base_buy = [listed_price(items_data[name], 'buy_price') for name in self.names]
+        self.base_sell = [listed_price(items_data[name], 'sell_price') for name in self.names]
+        self.sold = {name for name, base in zip(self.names, self.base_buy)
+                     if base is not None and items_data[name].get('type') not in UNSOLD_TYPES}
+        self._rng = random.Random(seed)
+        self._numpy_rng = numpy.random.default_rng(seed) if numpy is not None else None
+        self._factor = self._array([1.0] * len(self.names))
+        self._pressure = {}
+        self._local = {}
+        self._history = [None] * HISTORY
+        self._head = 0
+        self._ticks = 0
+        self._record()
+        self.last_tick = now
+
+    @staticmethod
+    def _array(values):
+        if numpy is not None:
+            return numpy.array(values, dtype=float)
+        return array('d', values)
+
+    def _record(self):
+        self._history[self._head] = self._factor
+        self._head = (self._head + 1) % HISTORY
+        self._ticks += 1
+
+    def tick(self, count=1):
+        """Move every price factor count ticks forward"""
+        offset = 1.0 - REVERSION - VOLATILITY
+        spread = 2 * VOLATILITY
+        reversion = REVERSION
+        for _ in range(count):
+            factor = self._factor
+            if numpy is not None:
+                factor = offset + factor * reversion + self._numpy_rng.random(len(factor)) * spread
+            else:
+                rand = self._rng.random
+                factor = array('d', [offset + f * reversion + rand() * spread for f in factor])
+
+            # Trade pressure on the few items the player traded
+            for i, pressure in list(self._pressure.items()):
+                factor[i] = min(MAX_FACTOR, max(MIN_FACTOR, factor[i] + pressure * PRICE_IMPACT))
+                pressure *= PRESSURE_DECAY
+                if abs(pressure) < 0.01:
+                    del self._pressure[i]
+                else:
+                    self._pressure[i] = pressure
+
+            self._factor = factor
+            self._record()
+
+    def advance(self, now):
+        """Run the ticks due since the last one (at most HISTORY of them)"""
+        due = int((now - self.last_tick) // MARKET_TICK)
+        if due > 0:
+            self.tick(min(due, HISTORY))
+            self.last_tick += due * MARKET_TICK
+        return self
+
+    def record_trade(self, item_name, quantity, buying):
+        """Add the pressure of the player buying (or selling) quantity of an item"""
+        i = self.index.get(item_name)
+        if i is None or quantity <= 0:
+            return
+        pressure = self._pressure.get(i, 0.0) + (quantity if buying else -quantity) / LIQUIDITY
+        self._pressure[i] = max(-MAX_PRESSURE, min(MAX_PRESSURE, pressure))
+
+    @staticmethod
+    def _price(base, factor):
+        return None if base is None else max(1, round(base * factor))
+
+    def local_factors(self, station):
+        """A station's price level of every item, by item ID (computed once per station)"""
+        factors = self._local.get(station)
+        if factors is None:
+            factors = self._local[station] = [local_factor(station, name) for name in self.names]
+        return factors
+
+    def _factor_at(self, i, station):
+        if station:
+            return float(self._factor[i]) * self.local_factors(station)[i]
+        return float(self._factor[i])
+
+    def sells(self, item_name):
+        """True if the marketplace sells an item (it has a buy price and is not a ship)"""
+        return item_name in self.sold
+
+    def buy_price(self, item_name, station=None):
+        """What the market (at a station, or galaxy-wide) charges for an item now, or None if it is not sold"""
+        i = self.index.get(item_name)
+        return None if i is None else self._price(self.base_buy[i], self._factor_at(i, station))
+
+    def sell_price(self, item_name, station=None):
+        """What the market (at a station, or galaxy-wide) pays for an item now, or None if it is not bought"""
+        i = self.index.get(item_name)
+        return None if i is None else self._price(self.base_sell[i], self._factor_at(i, station))
+
+    def history(self, item_name, field='buy_price'):
+        """An item's buy (or sell) price over the kept ticks, oldest first"""
+        i = self.index[item_name]
+        base = (self.base_buy if field == 'buy_price' else self.base_sell)[i]
+        kept = min(self._ticks, HISTORY)
+        start = (self._head - kept) % HISTORY
+        return [self._price(base, float(self._history[(start + k) % HISTORY][i])) for k in range(kept)]
+
+    def trend(self, item_name, field='buy_price'):
+        """Price change over the last tick: +1 up, -1 down, 0 unchanged"""
+        i = self.index.get(item_name)
+        if i is None or self._ticks < 2:
+            return 0
+        base = (self.base_buy if field == 'buy_price' else self.base_sell)[i]
+        before, after = (self._price(base, float(self._history[(self._head - back) % HISTORY][i])) for back in (2, 1))
+        if before is None or before == after:
+            return 0
+        return 1 if after > before else -1
@@ -0,0 +1,105 @@
+"""
+Paged, filterable view over a menu's options.
+
+arrow_menu() used to print every option on every keypress. MenuView keeps
+only what a keypress changes: the position of the selection among the
+options that match the filter, and the page (a window of rows sized to
+the terminal) the selection is on. Pages are fixed slices of the matches,
+so moving within a page changes two rows (the old and the new selection)
+and the screen is diff-rendered; only a page change redraws the window.
+
+Filtering is by case-insensitive substring of the option text without
+color codes. Each typed character narrows the previous matches rather than
+scanning every option again, and the earlier match lists are kept so
+Backspace goes back without searching at all.
+"""
+from bisect import bisect_left
+
+from text_layout import strip_ansi
+
+# Rows a menu window always gets, however little room the screen leaves
+MIN_WINDOW = 5
+
+
+class MenuView:
+    """Selection, filter and visible page of a list of options
+
+    Args:
+        options: The option strings (may contain ANSI codes)
+        window: Rows available for options
+    """
+
+    def __init__(self, options, window):
+        self.options = options
+        self.window = max(1, min(window, len(options)))
+        self.position = 0
+        self._text = None
+        self._filters = [("", range(len(options)))]
+
+    @property
+    def query(self):
+        return self._filters[-1][0]
+
+    @property
+    def matches(self):
+        """Indexes of the options matching the filter"""
+        return self._filters[-1][1]
+
+    def selected(self):
+        """Index of the selected option, or None if nothing matches"""
+        matches = self.matches
+        return matches[self.position] if matches else None
+
+    def move(self, step):
+        """Move the selection step rows, wrapping around the ends"""
+        if self.matches:
+            self.position = (self.position + step) % len(self.matches)
+
+    def page(self, step):
+        """Move the selection step pages, stopping at the ends"""
+        if self.matches:
+            self.position = max(0, min(len(self.matches) - 1, self.position + step * self.window))
+
+    def type(self, text):
+        """Narrow the filter by text"""
+        if self._text is None:
+            self._text = [strip_ansi(option).lower() for option in self.options]
+        query = self.query + text.lower()
+        option_text = self._text
+        matches = [i for i in self.matches if query in option_text[i]]
+        self._refilter(self._filters + [(query, matches)])
+
+    def backspace(self):
+        """Undo the last typed character"""
+        if len(self._filters) > 1:
+            self._refilter(self._filters[:-1])
+
+    def clear_filter(self):
+        """Show every option again"""
+        if len(self._filters) > 1:
+            self._refilter(self._filters[:1])
+
+    def _refilter(self, filters):
+        # Keep the selected option selected if it still matches
+        selected = self.selected()
+        self._filters = filters
+        matches = self.matches
+        self.position = 0
+        if selected is not None:
+            position = bisect_left(matches, selected)
+            if position < len(matches) and matches[position] == selected:
+                self.position = position
+
+    def top(self):
+        """Position (among the matches) of the first row on the current page"""
+        return self.position // self.window * self.window
+
+    def rows(self):
+        """The current page: [(option index, selected)]"""
+        top = self.top()
+        return [(i, position == self.position)
+                for position, i in enumerate(self.matches[top:top + self.window], top)]
+
+    def is_paged(self):
+        return len(self.options) > self.window
+
@@ -0,0 +1,439 @@
+"""
+Mining physics as a pure, seeded engine, and an intensity optimizer.
+
+Everything that decides what a mining laser shot does lives here, without
+any terminal I/O: the intensity table (speed, stability loss and vaporize
+chance), ore extraction, the odds of random events and their outcomes.
+Every function takes the random source to draw from (the random module by
+default, or a seeded random.Random), so mine_asteroid,
+mine_asteroid_with_turrets and the simulator below roll exactly the same
+numbers for the same seed.
+
+Event odds depend only on the ore, the anomaly and the security level, so
+they are precomputed per (ore, anomaly_type, security_level) into
+EVENT_TABLE as a cumulative distribution, and a blast picks its event (or
+none) with a single uniform draw.
+
+simulate() plays a mining session headlessly by the manual mining rules:
+one blast per FIRE_INTERVAL seconds, asteroid after asteroid, with the
+intensity picked by a policy from the asteroid's stability. optimize()
+runs every candidate policy (threshold_policies()) over the same seeded
+sessions, so policies are compared on identical luck, and ranks them by
+ore per minute among those that rarely blow up the asteroid.
+"""
+import random
+import statistics
+
+# A turret fires once per interval; a manual blast takes as long to play out
+FIRE_INTERVAL = 2.0
+TURRET_EFFICIENCY_BONUS = 1.4
+
+# Laser intensity: mining speed, stability change and ore vaporization risk
+INTENSITY = {
+    1: {"speed": 0.5, "stability_loss": 0, "stability_gain": 5, "vaporize_chance": 0},
+    2: {"speed": 1.0, "stability_loss": 0, "stability_gain": 0, "vaporize_chance": 0},
+    3: {"speed": 1.8, "stability_loss": 5, "stability_gain": 0, "vaporize_chance": 0.02},
+    4: {"speed": 2.8, "stability_loss": 10, "stability_gain": 0, "vaporize_chance": 0.05},
+    5: {"speed": 4.0, "stability_loss": 20, "stability_gain": 0, "vaporize_chance": 0.10},
+}
+INTENSITY_NAMES = {1: "Minimum", 2: "Low", 3: "Medium", 4: "High", 5: "Maximum"}
+
+# Mining XP per unit of ore
+ORE_XP = {
+    "Korrelite Ore (Inferior)": 1,
+    "Korrelite Ore": 2,
+    "Korrelite Ore (Superior)": 3,
+    "Korrelite Ore (Pristine)": 5,
+    "Reknite Ore (Inferior)": 2,
+    "Reknite Ore": 3,
+    "Reknite Ore (Superior)": 4,
+    "Reknite Ore (Pristine)": 6,
+    "Gellium Ore": 5,
+    "Gellium Ore (Superior)": 7,
+    "Gellium Ore (Pristine)": 10,
+    "Axnit Ore": 8,
+    "Axnit Ore (Pristine)": 15,
+    "Narcor Ore": 12,
+    "Red Narcor Ore": 20,
+    "Vexnium Ore": 30,
+    "Water Ice": 3,
+}
+DEFAULT_ORE_XP = 2
+
+# Base chance of each mining event per blast, rolled in this order
+EVENT_CHANCES = {
+    "gas_pocket": 0.08,
+    "dense_formation": 0.10,
+    "collision": 0.06,
+    "artifact": 0.03,
+    "proximity_mine": 0.06,
+}
+
+GASSY_ORES = ("Gellium Ore", "Gellium Ore (Superior)", "Gellium Ore (Pristine)", "Red Narcor Ore")
+DENSE_ORES = ("Vexnium Ore", "Axnit Ore", "Axnit Ore (Pristine)",
+              "Korrelite Ore (Pristine)", "Reknite Ore (Pristine)")
+
+# Where an ore is usually mined: (anomaly type, typical asteroid quantity)
+ORE_SOURCES = {
+    "Water Ice": ("CM", 16),
+    "Vexnium Ore": ("VX", 6),
+    "Axnit Ore": ("AA", 64),
+    "Axnit Ore (Pristine)": ("AA", 64),
+    "Narcor Ore": ("AN", 64),
+    "Red Narcor Ore": ("AN", 64),
+    "Korrelite Ore (Pristine)": ("MT", 64),
+    "Reknite Ore (Pristine)": ("MT", 64),
+    "Gellium Ore (Pristine)": ("MT", 64),
+}
+DEFAULT_SOURCE = ("AT", 64)
+
+
+def mining_efficiency(ship_class, dps, mining_skill):
+    """Ore extraction multiplier of a ship (Miner-class ships are far better at it)"""
+    if ship_class == "Miner":
+        return 1.0 + (dps / 500) + (mining_skill * 0.05)
+    return 0.15 * (0.5 + (dps / 1000)) + (mining_skill * 0.02)
+
+
+def blast(intensity, efficiency, stability, remaining_ore, mining_skill, rng=random):
+    """One mining laser shot
+
+    Args:
+        efficiency: mining_efficiency() (times TURRET_EFFICIENCY_BONUS for turrets)
+
+    Returns:
+        tuple: (ore extracted, ore vaporized, stability afterwards)
+    """
+    int_data = INTENSITY[intensity]
+
+    # Base ore extraction
+    base_extraction = 2 + (intensity * 1.5)
+    ore_extracted = base_extraction * int_data["speed"] * 0.1 * efficiency
+
+    # Vaporization check
+    vaporized = 0
+    if rng.random() < int_data["vaporize_chance"]:
+        vaporize_percent = rng.uniform(0.05, 0.15)
+        vaporized = int(ore_extracted * vaporize_percent)
+        ore_extracted -= vaporized
+
+    ore_extracted = min(ore_extracted, remaining_ore)
+
+    # Mining skill reduces stability loss
+    stability_change = int_data["stability_gain"] - int_data["stability_loss"]
+    if stability_change < 0:
+        stability_change *= (1.0 - mining_skill * 0.02)
+
+    return ore_extracted, vaporized, max(0, min(100, stability + stability_change))
+
+
+def event_chances(ore_name, security_level, anomaly_type="AT"):
+    """Chance of each mining event per blast for an ore, security level and anomaly"""
+    chances = dict(EVENT_CHANCES)
+
+    # Modify chances based on ore type
+    if ore_name in GASSY_ORES:
+        chances["gas_pocket"] *= 1.8
+    if ore_name == "Water Ice":
+        chances["gas_pocket"] *= 3
+    if ore_name in DENSE_ORES:
+        chances["dense_formation"] *= 1.6
+
+    # Modify based on anomaly type
+    if anomaly_type in ("AL", "CM"):
+        chances["collision"] *= 2.0
+    elif anomaly_type in ("VX", "MT"):
+        chances["collision"] = 0
+
+    # Modify based on security level
+    if security_level == "Wild":
+        chances["artifact"] *= 3.0
+        chances["proximity_mine"] *= 2.0
+    elif security_level == "Unsecure":
+        chances["proximity_mine"] *= 1.5
+    elif security_level == "Contested":
+        chances["proximity_mine"] *= 1.2
+    elif security_level == "Secure":
+        chances["proximity_mine"] = 0.0
+        chances["artifact"] *= 0.25
+    return chances
+
+
+def event_distribution(chances):
+    """Cumulative distribution of the event a blast triggers
+
+    Rolling each chance in order and taking the first success gives event i
+    with probability chances[i] times the chance that none before it
+    happened; accumulating those turns the rolls into one uniform draw.
+
+    Returns:
+        tuple: ((cumulative probability, event_type), ...) in roll order
+    """
+    distribution = []
+    cumulative = 0.0
+    none_yet = 1.0
+    for event_type, chance in chances.items():
+        if chance <= 0:
+            continue
+        cumulative += none_yet * chance
+        none_yet *= 1 - chance
+        distribution.append((cumulative, event_type))
+    return tuple(distribution)
+
+
+# Event distributions for every ore, asteroid anomaly and security level,
+# keyed by (ore, anomaly_type, security_level); other combinations are added
+# by event_table() the first time they come up
+EVENT_ANOMALIES = ("AT", "AL", "AA", "AN", "VX", "CM", "MT")
+SECURITY_LEVELS = ("Core", "Secure", "Contested", "Unsecure", "Wild")
+EVENT_TABLE = {
+    (ore_name, anomaly_type, security_level):
+        event_distribution(event_chances(ore_name, security_level, anomaly_type))
+    for ore_name in ORE_XP
+    for anomaly_type in EVENT_ANOMALIES
+    for security_level in SECURITY_LEVELS
+}
+
+
+def event_table(ore_name, security_level, anomaly_type="AT"):
+    """Precomputed event distribution (see event_distribution) for a blast"""
+    key = (ore_name, anomaly_type, security_level)
+    distribution = EVENT_TABLE.get(key)
+    if distribution is None:
+        distribution = EVENT_TABLE[key] = event_distribution(event_chances(ore_name, security_level, anomaly_type))
+    return distribution
+
+
+def draw_event(distribution, rng=random):
+    """The event a blast triggers, from a single uniform draw, or None"""
+    roll = rng.random()
+    for cumulative, event_type in distribution:
+        if roll < cumulative:
+            return event_type
+    return None
+
+
+def defuse_chance(mining_skill):
+    """Chance to defuse a proximity mine"""
+    return max(0.8, 0.5 + (mining_skill * 0.03))
+
+
+def event_outcome(event_type, ore_name, stability, intensity, rng=random, mine_choice="s", mining_skill=0):
+    """What a mining event does
+
+    Args:
+        mine_choice: For proximity mines, "d" to attempt a defuse or "s" to
+            skip the asteroid
+
+    Returns:
+        tuple: (event_type, event_data)
+    """
+    if event_type == "gas_pocket":
+        # Gas pocket - loses ore and stability, worse if the asteroid is already unstable
+        stability_factor = 1.0 + ((100 - stability) / 100)
+        ore_lost = rng.uniform(2, 5) * stability_factor
+        stability_lost = rng.uniform(5, 15) * stability_factor
+
+        # Ship damage if very unstable
+        ship_damage = 0
+        if stability < 40:
+            ship_damage = rng.randint(20, 50)
+
+        return ("gas_pocket", {
+            "ore_lost": ore_lost,
+            "stability_lost": stability_lost,
+            "ship_damage": ship_damage
+        })
+
+    if event_type == "dense_formation":
+        # Dense formation - extra ore, more for pristine ore
+        bonus_ore = rng.uniform(3, 8)
+        if "Pristine" in ore_name:
+            bonus_ore *= 1.5
+        return ("dense_formation", {"bonus_ore": bonus_ore})
+
+    if event_type == "collision":
+        ore_lost = rng.uniform(4, 10)
+        recoverable = ore_lost * rng.uniform(0.5, 0.9)
+        return ("collision", {"ore_lost": ore_lost, "recoverable": recoverable})
+
+    if event_type == "artifact":
+        # High intensity can destroy it
+        return ("artifact", {"destroyed": intensity >= 4 and rng.random() < 0.6})
+
+    if event_type == "proximity_mine":
+        if mine_choice == "d":
+            if rng.random() < defuse_chance(mining_skill):
+                return ("proximity_mine", {"defused": True, "detonated": False, "damage": 0})
+            return ("proximity_mine", {"defused": False, "detonated": True, "damage": rng.randint(150, 300)})
+        return ("proximity_mine", {"defused": False, "detonated": False, "damage": 0})
+
+    return None
+
+
+def threshold_policy(high, low=1, threshold=0):
+    """Fire at high intensity while stability is above threshold, at low otherwise"""
+    def policy(stability):
+        return high if stability > threshold else low
+    policy.name = f"{high}" if not threshold else f"{high} above {threshold}% else {low}"
+    policy.key = (high, low, threshold)
+    return policy
+
+
+def threshold_policies():
+    """Candidate policies: every constant intensity, and each risky intensity
+    with a recovery threshold (intensity 1 is the only one that regains stability)"""
+    policies = [threshold_policy(intensity) for intensity in INTENSITY]
+    for high in (3, 4, 5):
+        for threshold in range(20, 80, 10):
+            policies.append(threshold_policy(high, 1, threshold))
+    return policies
+
+
+def mine_asteroid(policy, ore_name, quantity, efficiency, mining_skill=0, security_level="Secure",
+                  anomaly_type="AT", rng=random, mine_choice="s", collision_recovery=0.0, max_blasts=None):
+    """Mine one asteroid by the manual mining rules, headlessly
+
+    Args:
+        policy: Called with the stability before each blast, returns the intensity
+        collision_recovery: Share of the recoverable ore won back after collisions
+        max_blasts: Stop after this many blasts
+
+    Returns:
+        dict: {"collected", "blasts", "outcome", "artifacts", "ship_damage"}, where
+        outcome is "mined", "exploded" (stability ran out), "skipped" or
+        "detonated" (a proximity mine), or "stopped" (max_blasts)
+    """
+    events = event_table(ore_name, security_level, anomaly_type)
+    stability = 100.0
+    remaining_ore = quantity
+    collected = 0.0
+    blasts = 0
+    artifacts = 0
+    ship_damage = 0
+    outcome = "mined"
+
+    while remaining_ore > 0 and stability > 0:
+        if max_blasts is not None and blasts >= max_blasts:
+            outcome = "stopped"
+            break
+        intensity = policy(stability)
+        ore_extracted, _, stability = blast(intensity, efficiency, stability, remaining_ore, mining_skill, rng)
+        blasts += 1
+
+        event_type = draw_event(events, rng)
+        if event_type:
+            _, event_data = event_outcome(event_type, ore_name, stability, intensity, rng,
+                                          mine_choice, mining_skill)
+            if event_type == "gas_pocket":
+                remaining_ore -= event_data["ore_lost"]
+                stability -= event_data["stability_lost"]
+                ship_damage += event_data["ship_damage"]
+            elif event_type == "dense_formation":
+                ore_extracted = min(ore_extracted + event_data["bonus_ore"], remaining_ore)
+            elif event_type == "collision":
+                remaining_ore -= event_data["ore_lost"]
+                ore_extracted += event_data["recoverable"] * collision_recovery
+            elif event_type == "artifact":
+                artifacts += not event_data["destroyed"]
+            elif event_data["detonated"]:
+                ship_damage += event_data["damage"]
+                remaining_ore = 0
+                stability = 0
+                outcome = "detonated"
+            elif not event_data["defused"]:
+                outcome = "skipped"
+                break
+
+        remaining_ore = max(0, remaining_ore - ore_extracted)
+        collected += ore_extracted
+        if stability <= 0 and outcome == "mined":
+            outcome = "exploded"
+
+    return {"collected": collected, "blasts": blasts, "outcome": outcome,
+            "artifacts": artifacts, "ship_damage": ship_damage}
+
+
+def simulate(policy, ore_name, efficiency, mining_skill=0, security_level="Secure", minutes=10,
+             seed=0, quantity=None, anomaly_type=None, **rules):
+    """A seeded mining session: asteroid after asteroid for a number of minutes
+
+    quantity and anomaly_type default to the ore's usual source (ORE_SOURCES).
+
+    Returns:
+        dict: {"ore_per_minute", "asteroids", "explosions", "detonations", "artifacts"}
+    """
+    source_type, source_quantity = ORE_SOURCES.get(ore_name, DEFAULT_SOURCE)
+    rng = random.Random(seed)
+    blasts_left = int(minutes * 60 / FIRE_INTERVAL)
+    totals = {"collected": 0.0, "asteroids": 0, "explosions": 0, "detonations": 0, "artifacts": 0}
+    while blasts_left > 0:
+        result = mine_asteroid(policy, ore_name, quantity or source_quantity, efficiency, mining_skill,
+                               security_level, anomaly_type or source_type, rng,
+                               max_blasts=blasts_left, **rules)
+        blasts_left -= max(1, result["blasts"])
+        totals["collected"] += result["collected"]
+        totals["artifacts"] += result["artifacts"]
+        if result["outcome"] != "stopped":
+            totals["asteroids"] += 1
+        totals["explosions"] += result["outcome"] == "exploded"
+        totals["detonations"] += result["outcome"] == "detonated"
+    totals["ore_per_minute"] = totals.pop("collected") / minutes
+    return totals
+
+
+def evaluate(policy, ore_name, efficiency, mining_skill=0, security_level="Secure", runs=20, seed=0, **options):
+    """Average of runs seeded sessions (seeds seed .. seed + runs - 1)
+
+    Returns:
+        dict: {"policy", "ore_per_minute", "stdev", "explosion_rate"}, the
+        explosion rate being explosions per asteroid finished
+    """
+    sessions = [simulate(policy, ore_name, efficiency, mining_skill, security_level, seed=seed + run, **options)
+                for run in range(runs)]
+    rates = [session["ore_per_minute"] for session in sessions]
+    asteroids = sum(session["asteroids"] for session in sessions)
+    explosions = sum(session["explosions"] for session in sessions)
+    return {
+        "policy": policy,
+        "ore_per_minute": statistics.fmean(rates),
+        "stdev": statistics.stdev(rates) if runs > 1 else 0.0,
+        "explosion_rate": explosions / asteroids if asteroids else 0.0,
+    }
+
+
+def optimize(ore_name, efficiency, mining_skill=0, security_level="Secure", runs=20, seed=0,
+             max_explosion_rate=0.02, policies=None, **options):
+    """Rank intensity policies by ore per minute
+
+    Every policy plays the same seeded sessions (common random numbers). The
+    policies are raced: all of them get a quarter of the runs, and only the
+    best third goes on to the full count. Policies that blow up more than
+    max_explosion_rate of their asteroids rank below the rest.
+
+    Returns:
+        list: evaluate() results, best first
+    """
+    if policies is None:
+        policies = threshold_policies()
+
+    def rank(results):
+        return sorted(results, key=lambda r: (r["explosion_rate"] > max_explosion_rate, -r["ore_per_minute"]))
+
+    trial = max(2, runs // 4)
+    results = rank([evaluate(policy, ore_name, efficiency, mining_skill, security_level, trial, seed, **options)
+                    for policy in policies])
+    finalists = results[:max(1, len(results) // 3)]
+    return rank([evaluate(r["policy"], ore_name, efficiency, mining_skill, security_level, runs, seed, **options)
+                 for r in finalists]) + results[len(finalists):]
+
+
+def yield_table(ore_name, efficiency, mining_skill=0, security_level="Secure", runs=20, seed=0, **options):
+    """Expected ore per minute of each constant intensity
+
+    Returns:
+        dict: {intensity: evaluate() result}
+    """
+    return {intensity: evaluate(threshold_policy(intensity), ore_name, efficiency, mining_skill,
+                                security_level, runs, seed, **options)
+            for intensity in INTENSITY}
@@ -0,0 +1,205 @@
+"""
+Optional frame-time and input-latency instrumentation for the real-time loops
+(combat rounds, turret mining and the manufacturing job screen).
+
+When instrumentation is off, every loop gets the shared NULL_RECORDER whose
+methods do nothing, so the only cost is an empty method call per frame.
+When it is on, each frame's simulation time, render time, bytes written to
+stdout, input latency and dropped frames go into a fixed-size ring buffer,
+an on-screen HUD line can be toggled, and everything is exported to a JSONL
+file when the session ends.
+"""
+import json
+import sys
+from collections import deque
+from pathlib import Path
+from time import perf_counter, time, strftime
+
+
+class _CountingStdout:
+    """Thin stdout wrapper that counts the UTF-8 bytes written through it"""
+
+    def __init__(self, stream):
+        self._stream = stream
+        self.bytes_written = 0
+
+    def write(self, text):
+        self.bytes_written += len(text.encode('utf-8', 'replace'))
+        return self._stream.write(text)
+
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+
+class _NullRecorder:
+    """Recorder used while instrumentation is disabled - every call is a no-op"""
+    enabled = False
+
+    def frame_start(self):
+        pass
+
+    def sim_done(self):
+        pass
+
+    def render_done(self):
+        pass
+
+    def key_received(self):
+        pass
+
+
+NULL_RECORDER = _NullRecorder()
+
+
+class FrameRecorder:
+    """Per-loop frame timings stored in a ring buffer
+
+    Call order per frame: frame_start() -> [key_received()] -> sim_done() ->
+    render_done(). Input latency is measured from key_received() to the end
+    of the first render after it, i.e. until the player can see the result.
+    """
+    enabled = True
+
+    def __init__(self, monitor, loop_name, frame_budget, capacity=600):
+        self.monitor = monitor
+        self.loop_name = loop_name
+        self.frame_budget = frame_budget    # Target seconds per frame
+        self.frames = deque(maxlen=capacity)
+        self.dropped_total = 0
+        self._frame_start = None
+        self._prev_frame_start = None
+        self._sim_done = None
+        self._bytes_at_start = 0
+        self._key_time = None
+
+    def frame_start(self):
+        now = perf_counter()
+        self._prev_frame_start = self._frame_start
+        self._frame_start = now
+        self._sim_done = None
+        self._bytes_at_start = self.monitor.bytes_written()
+
+    def sim_done(self):
+        self._sim_done = perf_counter()
+
+    def key_received(self):
+        if self._key_time is None:
+            self._key_time = perf_counter()
+
+    def render_done(self):
+        if self._frame_start is None:
+            return
+        now = perf_counter()
+        sim_end = self._sim_done if self._sim_done is not None else self._frame_start
+
+        input_latency = None
+        if self._key_time is not None:
+            input_latency = now - self._key_time
+            self._key_time = None
+
+        # Frames missed since the previous frame started (the sleep/wait is part of the budget)
+        dropped = 0
+        if self._prev_frame_start is not None:
+            interval = self._frame_start - self._prev_frame_start
+            dropped = max(0, int(interval / self.frame_budget + 0.5) - 1)
+        self.dropped_total += dropped
+
+        frame = {
+            "loop": self.loop_name,
+            "t": round(time(), 4),
+            "sim_ms": round((sim_end - self._frame_start) * 1000, 3),
+            "render_ms": round((now - sim_end) * 1000, 3),
+            "bytes": self.monitor.bytes_written() - self._bytes_at_start,
+            "input_ms": round(input_latency * 1000, 3) if input_latency is not None else None,
+            "dropped": dropped,
+        }
+        self.frames.append(frame)
+        self.monitor.session_frames.append(frame)
+
+    def hud_line(self):
+        """One-line summary of the recent frames for the on-screen HUD"""
+        recent = list(self.frames)[-30:]
+        if not recent:
+            return f" PERF [{self.loop_name}] collecting..."
+        count = len(recent)
+        sim = sum(f["sim_ms"] for f in recent) / count
+        render = sum(f["render_ms"] for f in recent) / count
+        size = sum(f["bytes"] for f in recent) / count
+        latencies = [f["input_ms"] for f in recent if f["input_ms"] is not None]
+        latency = f"{max(latencies):.0f}ms" if latencies else "-"
+        return (f" PERF sim {sim:.1f}ms  render {render:.1f}ms  {size / 1024:.1f}KB"
+                f"  input {latency}  dropped {self.dropped_total}")
+
+
+class PerfMonitor:
+    """Owns the per-loop recorders, the HUD toggle and the session export"""
+
+    HUD_TOGGLE_KEY = '`'
+
+    def __init__(self, session_capacity=20000):
+        self.enabled = False
+        self.hud_visible = False
+        self.recorders = {}
+        self.session_frames = deque(maxlen=session_capacity)
+        self._stdout = None
+
+    def enable(self):
+        """Start instrumenting; wraps sys.stdout so frame sizes can be measured"""
+        if self.enabled:
+            return
+        self.enabled = True
+        if not isinstance(sys.stdout, _CountingStdout):
+            self._stdout = _CountingStdout(sys.stdout)
+            sys.stdout = self._stdout
+
+    def disable(self):
+        """Stop instrumenting and restore the original stdout"""
+        if not self.enabled:
+            return
+        self.enabled = False
+        self.hud_visible = False
+        if self._stdout is not None and sys.stdout is self._stdout:
+            sys.stdout = self._stdout._stream
+        self._stdout = None
+
+    def bytes_written(self):
+        return self._stdout.bytes_written if self._stdout is not None else 0
+
+    def recorder(self, loop_name, frame_budget):
+        """Recorder for an instrumented loop (the shared no-op one when disabled)"""
+        if not self.enabled:
+            return NULL_RECORDER
+        rec = self.recorders.get(loop_name)
+        if rec is None:
+            rec = self.recorders[loop_name] = FrameRecorder(self, loop_name, frame_budget)
+        return rec
+
+    def handle_key(self, key):
+        """Toggle the HUD on the toggle key; returns True if the key was consumed"""
+        if self.enabled and key == self.HUD_TOGGLE_KEY:
+            self.hud_visible = not self.hud_visible
+            return True
+        return False
+
+    def hud_line(self, recorder):
+        """HUD text for a recorder, or None if the HUD should not be drawn"""
+        if not self.hud_visible or not recorder.enabled:
+            return None
+        return recorder.hud_line()
+
+    def export(self, directory):
+        """Write every recorded frame of this session to a JSONL file
+
+        Returns:
+            Path of the written file, or None if nothing was recorded
+        """
+        if not self.session_frames:
+            return None
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"frames-{strftime('%Y%m%d-%H%M%S')}.jsonl"
+        with open(path, 'w') as f:
+            for frame in self.session_frames:
+                f.write(json.dumps(frame) + "\n")
+        self.session_frames.clear()
+        return path
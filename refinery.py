@@ -0,0 +1,122 @@
+"""
+Refinery rules and bulk refining.
+
+Ores refine into a fixed yield of their material. Metal Scraps refine unit
+by unit with a SCRAP_SUCCESS_CHANCE chance each, and every success turns
+into one material picked by SCRAP_MATERIALS weight. Rolling that per unit
+made refining tens of thousands of scraps slow, so a stack is drawn in one
+go instead: the number of successes is a binomial draw and their split
+across materials a multinomial one (a binomial per material, conditioned on
+what is left), which is the same distribution in O(materials) draws.
+
+The binomial draws are random.binomialvariate (Python 3.12+, which the
+game requires), O(1) expected at any n.
+"""
+import random
+
+# Ore: (material, yield per ore)
+REFINING_RULES = {
+    "Korrelite Ore (Inferior)": ("Korrelite", 1),
+    "Korrelite Ore": ("Korrelite", 2),
+    "Korrelite Ore (Superior)": ("Korrelite", 3),
+    "Korrelite Ore (Pristine)": ("Korrelite", 4),
+    "Reknite Ore (Inferior)": ("Reknite", 1),
+    "Reknite Ore": ("Reknite", 2),
+    "Reknite Ore (Superior)": ("Reknite", 3),
+    "Reknite Ore (Pristine)": ("Reknite", 4),
+    "Gellium Ore": ("Gellium", 2),
+    "Gellium Ore (Superior)": ("Gellium", 3),
+    "Gellium Ore (Pristine)": ("Gellium", 4),
+    "Axnit Ore": ("Axnit", 1),
+    "Axnit Ore (Pristine)": ("Axnit", 2),
+    "Narcor Ore": ("Narcor", 1),
+    "Red Narcor Ore": ("Red Narcor", 1),
+    "Vexnium Ore": ("Vexnium", 1),
+    "Water Ice": ("Water", 1),
+}
+
+SCRAP_ITEM = "Metal Scraps"
+SCRAP_SUCCESS_CHANCE = 0.20
+
+# Material pool with weighted chances (share of successful scrap refines)
+SCRAP_MATERIALS = [
+    ("Korrelite", 40),
+    ("Reknite", 30),
+    ("Gellium", 15),
+    ("Axnit", 10),
+    ("Narcor", 4),
+    ("Red Narcor", 1),
+]
+
+
+def is_refinable(item_name):
+    return item_name in REFINING_RULES or item_name == SCRAP_ITEM
+
+
+def binomial(n, p, rng=random):
+    """Number of successes in n independent trials with chance p"""
+    if n <= 0 or p <= 0:
+        return 0
+    if p >= 1:
+        return n
+    return rng.binomialvariate(n, p)
+
+
+def multinomial(n, weights, rng=random):
+    """Split n picks across weighted outcomes
+
+    Args:
+        weights: [(outcome, weight), ...]
+
+    Returns:
+        dict: {outcome: count} for the outcomes picked at least once
+    """
+    remaining = sum(weight for _, weight in weights)
+    counts = {}
+    for outcome, weight in weights:
+        if n <= 0:
+            break
+        picked = n if weight >= remaining else binomial(n, weight / remaining, rng)
+        if picked:
+            counts[outcome] = picked
+        n -= picked
+        remaining -= weight
+    return counts
+
+
+def refine(item_name, amount, rng=random):
+    """Refine amount units of an item
+
+    Returns:
+        tuple: ({material: quantity}, successful refines); every unit of an
+        ore succeeds
+    """
+    if item_name == SCRAP_ITEM:
+        successes = binomial(amount, SCRAP_SUCCESS_CHANCE, rng)
+        return multinomial(successes, SCRAP_MATERIALS, rng), successes
+    material, yield_amount = REFINING_RULES[item_name]
+    return {material: amount * yield_amount}, amount
+
+
+def refine_all(inventory, rng=random):
+    """Refine every refinable item in an inventory, as one transaction
+
+    All draws are made before the inventory is touched, so it is either
+    updated completely or (if anything raises) not at all.
+
+    Returns:
+        tuple: ({item: amount processed}, {material: quantity gained})
+    """
+    processed = {item: quantity for item, quantity in inventory.items()
+                 if quantity > 0 and is_refinable(item)}
+    gained = {}
+    for item, amount in processed.items():
+        materials, _ = refine(item, amount, rng)
+        for material, quantity in materials.items():
+            gained[material] = gained.get(material, 0) + quantity
+
+    for item in processed:
+        del inventory[item]
+    for material, quantity in gained.items():
+        inventory[material] = inventory.get(material, 0) + quantity
+    return processed, gained
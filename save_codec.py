@@ -0,0 +1,271 @@
+"""
+Versioned, compressed save codec.
+
+save.dat layout (all integers big-endian):
+
+    b"STSV"  u8 codec format  u16 save version  u16 section count
+    then per top-level section:
+        u8 name length, name (UTF-8), u8 flags, u32 payload length, payload
+
+The payload is the section's compact JSON, zlib-compressed when that makes it
+smaller (flag COMPRESSED). Sections are compressed separately so the save
+engine only has to recompress the sections that changed since the last save.
+
+upgrade() checks every known section against its schema in SECTION_SCHEMAS,
+fills in missing optional sections, and runs the migration chain: a save
+with version v is passed through MIGRATIONS[v], MIGRATIONS[v + 1], ... up to
+SAVE_VERSION in one pass, so old saves are upgraded on load instead of
+rejected. Sections without a schema are kept as they are.
+"""
+import json
+import struct
+import zlib
+from uuid import uuid4
+
+from anomaly_seed import new_seed
+
+SAVE_VERSION = 4      # Version of the save data layout (the "v" section)
+CODEC_FORMAT = 1      # Version of the save.dat container itself
+MAGIC = b"STSV"
+COMPRESSION_LEVEL = 6
+
+COMPRESSED = 0x01
+
+_HEADER = struct.Struct(">4sBHH")
+_SECTION = struct.Struct(">BI")
+
+
+class SaveFormatError(ValueError):
+    """Raised for save files that are corrupt or can't be upgraded"""
+
+
+class SectionSchema:
+    """Expected type of a top-level section and, for optional ones, its default
+
+    Args:
+        types: Type or tuple of types the section's value must have
+        default: Function returning the value of a missing section, or None
+            if the section is required
+    """
+
+    def __init__(self, types, default=None):
+        self.types = types if isinstance(types, tuple) else (types,)
+        self.default = default
+
+    def check(self, name, value):
+        if not isinstance(value, self.types) or (isinstance(value, bool) and bool not in self.types):
+            expected = " or ".join("null" if t is type(None) else t.__name__ for t in self.types)
+            raise SaveFormatError(f"Save section '{name}' should be {expected}, got {type(value).__name__}")
+
+
+NUMBER = (int, float)
+OPTIONAL_STR = (str, type(None))
+
+SECTION_SCHEMAS = {
+    "v": SectionSchema(int),
+    "player_name": SectionSchema(str),
+    "credits": SectionSchema(NUMBER),
+    "current_system": SectionSchema(str),
+    "docked_at": SectionSchema(OPTIONAL_STR, lambda: ""),
+    "ships": SectionSchema(list, lambda: [{
+        "id": str(uuid4()),
+        "name": "stratos",
+        "nickname": "Stratos",
+        "hull_hp": 200,
+        "shield_hp": 200,
+        "modules_installed": [],
+    }]),
+    "active_ship": SectionSchema(int, lambda: 0),
+    "inventory": SectionSchema(dict, dict),
+    "storage": SectionSchema(dict, dict),
+    "skills": SectionSchema(dict, lambda: {
+        "combat": 0, "combat_xp": 0,
+        "piloting": 0, "piloting_xp": 0,
+        "mining": 0, "mining_xp": 0,
+    }),
+    "standing": SectionSchema(dict, lambda: {
+        "Core Sec": 0, "Syndicate": 0, "Trade Union": 0, "Mining Guild": 0,
+        "Lycentia": 0, "Forakus": 0, "Kavani": 0,
+    }),
+    "tutorial_progress": SectionSchema(dict, lambda: {"completed": True}),
+    "destination": SectionSchema(OPTIONAL_STR, lambda: ""),
+    "anomalies": SectionSchema(dict, dict),
+    "scanned_systems": SectionSchema(list, list),
+    "manufacturing_jobs": SectionSchema(dict, dict),
+    "anomaly_seed": SectionSchema(int, new_seed),
+    "cleared_anomalies": SectionSchema(dict, dict),
+    # Added on demand by the game, so never filled in
+    "previous_system": SectionSchema(OPTIONAL_STR),
+    "wormhole_pairs": SectionSchema(dict),
+}
+
+# Sections a save can't do without; everything else is optional
+REQUIRED_SECTIONS = ("player_name", "credits", "current_system")
+
+
+def _migrate_v1(data):
+    """Version 1 -> 2
+
+    Version 1 saves lack sections added since (storage, standing, anomalies,
+    scans, manufacturing...); apply_schemas fills those in from their defaults.
+    """
+    data["v"] = 2
+
+
+def _migrate_v2(data):
+    """Version 2 -> 3
+
+    Anomalies are generated from a per-save seed instead of on each visit.
+    The anomalies already in the save are kept whole until they expire, and
+    last_system_visit (which only timed generation) is dropped.
+    """
+    data["anomaly_seed"] = new_seed()
+    data.pop("last_system_visit", None)
+    data["v"] = 3
+
+
+def _migrate_v3(data):
+    """Version 3 -> 4
+
+    Manufacturing jobs were one dict per unit; units queued together (same
+    item, start and craft time) become a single batch with a quantity.
+    """
+    for station, jobs in data.get("manufacturing_jobs", {}).items():
+        batches = {}
+        for job in jobs:
+            key = (job.get("item"), job.get("start_time"), job.get("craft_time"), job.get("type"))
+            if key in batches:
+                batches[key]["quantity"] += job.get("quantity", 1)
+            else:
+                batches[key] = dict(job, quantity=job.get("quantity", 1))
+        data["manufacturing_jobs"][station] = list(batches.values())
+    data["v"] = 4
+
+
+# MIGRATIONS[v] upgrades a version v save to version v + 1 in place
+MIGRATIONS = {
+    1: _migrate_v1,
+    2: _migrate_v2,
+    3: _migrate_v3,
+}
+
+
+def migrate(data):
+    """Upgrade save data to SAVE_VERSION in place
+
+    Returns:
+        int: The version the save had before migrating
+    """
+    original = data.get("v", 1)
+    if not isinstance(original, int):
+        raise SaveFormatError(f"Save version is not a number: {original!r}")
+    if original > SAVE_VERSION:
+        # Saves from a newer game are left alone; the caller decides what to do
+        return original
+    version = original
+    while version < SAVE_VERSION:
+        step = MIGRATIONS.get(version)
+        if step is None:
+            raise SaveFormatError(f"No migration from save version {version}")
+        step(data)
+        version += 1
+        data["v"] = version
+    return original
+
+
+def apply_schemas(data):
+    """Check every known section and fill in missing optional ones"""
+    for name in REQUIRED_SECTIONS:
+        if name not in data:
+            raise SaveFormatError(f"Save is missing the '{name}' section")
+    for name, schema in SECTION_SCHEMAS.items():
+        if name in data:
+            schema.check(name, data[name])
+        elif schema.default is not None:
+            data[name] = schema.default()
+
+
+def upgrade(data):
+    """Migrate data to SAVE_VERSION and validate it
+
+    Returns:
+        int: The version the save had before upgrading
+    """
+    original = migrate(data)
+    if original <= SAVE_VERSION:
+        apply_schemas(data)
+    return original
+
+
+def _pack_payload(encoded):
+    raw = encoded.encode('utf-8')
+    packed = zlib.compress(raw, COMPRESSION_LEVEL)
+    if len(packed) < len(raw):
+        return COMPRESSED, packed
+    return 0, raw
+
+
+def pack_sections(encoded, version, previous=None):
+    """Build a save.dat image from encoded sections
+
+    Args:
+        encoded: {section: compact JSON} in save order
+        version: Save version stored in the header
+        previous: Cache returned by the last call for this save; sections whose
+            JSON is unchanged reuse their compressed payload
+
+    Returns:
+        tuple: (save.dat bytes, cache for the next call)
+    """
+    previous = previous or {}
+    cache = {}
+    parts = [_HEADER.pack(MAGIC, CODEC_FORMAT, version, len(encoded))]
+    for name, enc in encoded.items():
+        hit = previous.get(name)
+        if hit is not None and hit[0] == enc:
+            flags, payload = hit[1]
+        else:
+            flags, payload = _pack_payload(enc)
+        cache[name] = (enc, (flags, payload))
+        name_bytes = name.encode('utf-8')
+        parts.append(bytes((len(name_bytes),)) + name_bytes)
+        parts.append(_SECTION.pack(flags, len(payload)))
+        parts.append(payload)
+    return b"".join(parts), cache
+
+
+def unpack_sections(blob):
+    """Split a save.dat image into {section: compact JSON}"""
+    try:
+        magic, fmt, _version, count = _HEADER.unpack_from(blob, 0)
+    except struct.error:
+        raise SaveFormatError("Save file is truncated") from None
+    if magic != MAGIC:
+        raise SaveFormatError("Not a save file")
+    if fmt != CODEC_FORMAT:
+        raise SaveFormatError(f"Unsupported save file format {fmt}")
+
+    sections = {}
+    offset = _HEADER.size
+    try:
+        for _ in range(count):
+            name_len = blob[offset]
+            name = blob[offset + 1:offset + 1 + name_len].decode('utf-8')
+            offset += 1 + name_len
+            flags, length = _SECTION.unpack_from(blob, offset)
+            offset += _SECTION.size
+            payload = blob[offset:offset + length]
+            if len(payload) != length:
+                raise SaveFormatError("Save file is truncated")
+            offset += length
+            if flags & COMPRESSED:
+                payload = zlib.decompress(payload)
+            sections[name] = payload.decode('utf-8')
+    except (IndexError, struct.error, zlib.error) as e:
+        raise SaveFormatError(f"Save file is corrupt: {e}") from None
+    return sections
+
+
+def decode(blob):
+    """Save data from a save.dat image (not yet migrated, see upgrade)"""
+    return {name: json.loads(enc) for name, enc in unpack_sections(blob).items()}
@@ -0,0 +1,528 @@
+"""
+Save engine for game data.
+
+save_data() used to rewrite the whole pretty-printed save.json in place on
+every call, so a crash mid-write left a truncated save and the cost of each
+call grew with the anomaly map, job lists and inventory.
+
+The engine remembers the encoded form of every top-level section it last
+wrote. A save re-encodes the sections, compares them with what is on disk,
+skips the write entirely when nothing changed, and otherwise writes the file
+to a temporary file next to the save and swaps it in with os.replace(), so
+the save on disk is always either the old or the new complete save.
+
+Saves are written as save.dat in the compressed format of save_codec, which
+only recompresses the sections that changed. Older save.json files are still
+read, upgraded through the save_codec migrations, and replaced by save.dat on
+their next write.
+
+With use_journal on, small changes are appended to save.journal instead of
+rewriting save.dat (see save_journal); load() replays the journal.
+
+With use_sqlite on, saves go to save.db instead (see save_sqlite), where the
+large sections are indexed tables updated row by row. Whichever of the save
+files was written last is the one that is loaded, so switching between the
+two converts a save on its next write.
+
+Every write also refreshes the slot's entry in saves/index.json (see
+save_index), which the save lists are drawn from.
+
+SaveWorker moves those writes off the game thread and coalesces bursts of
+saves (manage_system_anomalies, for instance, saves twice in a row).
+
+Durability guarantees with the worker:
+    * The save file is never partially written: every write is a complete
+      snapshot swapped in atomically, and is fsynced before the swap.
+    * A submitted save reaches disk within `debounce` seconds of the last
+      save in a burst, and never later than `max_delay` seconds after it was
+      submitted, however long the burst goes on.
+    * flush() blocks until every submitted save is on disk. The game flushes
+      on exit, on death (animated_death_screen), on SIGTERM, before reading a
+      save back and before deleting one.
+    * If the process is killed without a chance to flush (SIGKILL, power
+      loss, crash), at most the last `max_delay` seconds of saves are lost;
+      the save on disk is the newest snapshot that finished writing.
+"""
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+from pathlib import Path
+from time import monotonic
+
+from save_codec import SAVE_VERSION, pack_sections, unpack_sections, upgrade
+from save_index import INDEX_FILENAME, SaveIndex, summarize
+from save_sqlite import SqliteSaveStore
+from save_journal import (JOURNAL_FILENAME, snapshot_id, diff_records, apply_record,
+                          read_journal, start_journal, encode_records, append_records)
+
+SAVES_DIR = Path.home() / ".starscape_text_adventure" / "saves"
+SAVE_FILENAME = "save.dat"
+LEGACY_FILENAME = "save.json"    # Plain JSON saves from before save.dat
+SQLITE_FILENAME = "save.db"
+
+
+def encode_section(value):
+    """Compact, deterministic JSON for one top-level save section"""
+    return json.dumps(value, separators=(',', ':'), ensure_ascii=False)
+
+
+def atomic_write(path, content):
+    """Write content (str or bytes) to path so readers only ever see the old or the new file"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=path.name + ".", suffix=".tmp", dir=path.parent)
+    try:
+        with (os.fdopen(fd, 'wb') if isinstance(content, bytes)
+              else os.fdopen(fd, 'w', encoding='utf-8')) as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+class SaveEngine:
+    """Dirty-tracking, atomic writer for save files
+
+    Args:
+        saves_dir: Folder holding one sub-folder per save
+        use_journal: Append changes to save.journal instead of rewriting
+            the save file (see save_journal)
+        journal_limit: Journal size in bytes past which it is compacted
+        use_sqlite: Store saves in save.db instead of save.dat (the journal
+            is not used then)
+    """
+
+    def __init__(self, saves_dir=SAVES_DIR, use_journal=False, journal_limit=512 * 1024, use_sqlite=False):
+        self.saves_dir = Path(saves_dir)
+        self.use_journal = use_journal
+        self.journal_limit = journal_limit
+        self.use_sqlite = use_sqlite
+        self._written = {}    # save_name -> {section: encoded JSON as last written}
+        self._formats = {}    # save_name -> file name _written refers to
+        self._stores = {}     # save_name -> open SqliteSaveStore
+        self._decoded = {}    # save_name -> {section: value} last written to save.db (decoded once)
+        self._journals = {}   # save_name -> size in bytes of its journal, if one applies
+        self._packed = {}     # save_name -> compressed sections cache (see pack_sections)
+        self.index = SaveIndex(self.saves_dir / INDEX_FILENAME, atomic_write)
+        self._lock = threading.Lock()
+        self.writes = 0       # Saves that hit the disk
+        self.skipped = 0      # Saves skipped because nothing changed
+        self.appends = 0      # Saves written as journal records
+        self.compactions = 0  # Journals compacted into a fresh save.json
+
+    def save_path(self, save_name):
+        return self.saves_dir / save_name / SAVE_FILENAME
+
+    def legacy_path(self, save_name):
+        return self.saves_dir / save_name / LEGACY_FILENAME
+
+    def sqlite_path(self, save_name):
+        return self.saves_dir / save_name / SQLITE_FILENAME
+
+    def _save_files(self, save_name):
+        return (self.save_path(save_name), self.sqlite_path(save_name), self.legacy_path(save_name))
+
+    def current_file(self, save_name):
+        """The file holding a save (the most recently written one), or None"""
+        existing = [path for path in self._save_files(save_name) if path.exists()]
+        if not existing:
+            return None
+        return max(existing, key=lambda path: path.stat().st_mtime_ns)
+
+    def has_save(self, save_name):
+        """True if a save of this name exists in any format"""
+        return any(path.exists() for path in self._save_files(save_name))
+
+    def sqlite_store(self, save_name, create=False):
+        """SqliteSaveStore of a save's save.db (for its indexed queries), or None if there is none"""
+        path = self.sqlite_path(save_name)
+        with self._lock:
+            store = self._stores.get(save_name)
+            if store is None and (create or path.exists()):
+                path.parent.mkdir(parents=True, exist_ok=True)
+                store = self._stores[save_name] = SqliteSaveStore(path)
+        return store
+
+    def _close_store(self, save_name):
+        with self._lock:
+            store = self._stores.pop(save_name, None)
+            self._decoded.pop(save_name, None)
+        if store is not None:
+            store.close()
+
+    def journal_path(self, save_name):
+        return self.saves_dir / save_name / JOURNAL_FILENAME
+
+    def load(self, save_name):
+        """Read a save (None if it doesn't exist), upgraded to the current save version
+
+        Raises:
+            SaveFormatError: If the save is corrupt or can't be upgraded
+        """
+        path = self.current_file(save_name)
+        if path is None:
+            return None
+        sections = content = None
+        if path.name == SQLITE_FILENAME:
+            data = self.sqlite_store(save_name).export()
+        elif path.name == SAVE_FILENAME:
+            content = path.read_bytes()
+            sections = unpack_sections(content)
+            data = {key: json.loads(enc) for key, enc in sections.items()}
+        else:
+            content = path.read_bytes()
+            data = json.loads(content)
+
+        # Temp files left by a write that was killed before its os.replace()
+        for stale in path.parent.glob("*.tmp"):
+            try:
+                stale.unlink()
+            except OSError:
+                pass
+
+        # Replay the journal, if there is one for this save file
+        records, journal_size = None, 0
+        if content is not None and self.journal_path(save_name).exists():
+            records, journal_size = read_journal(self.journal_path(save_name), snapshot_id(content))
+            for record in records or ():
+                apply_record(data, record)
+
+        original_version = upgrade(data)
+
+        with self._lock:
+            if path.name == LEGACY_FILENAME or original_version != SAVE_VERSION:
+                # Legacy or migrated: nothing on disk matches, so the next save rewrites it
+                self._written.pop(save_name, None)
+            elif sections is not None and not records and list(sections) == list(data):
+                self._written[save_name] = sections
+            else:
+                self._written[save_name] = self.encode(data)
+            self._formats[save_name] = path.name
+            if records is not None:
+                self._journals[save_name] = journal_size
+            else:
+                self._journals.pop(save_name, None)
+        return data
+
+    @staticmethod
+    def encode(data):
+        """Snapshot of data as {section: encoded JSON}, safe to write from another thread"""
+        return {key: encode_section(value) for key, value in data.items()}
+
+    def dirty_sections(self, save_name, encoded):
+        """Top-level sections of an encoded snapshot that differ from the last write
+
+        Returns:
+            tuple: (dirty section names, removed section names)
+        """
+        with self._lock:
+            written = self._written.get(save_name)
+        if written is None:
+            return list(encoded), []
+        dirty = [key for key, enc in encoded.items() if written.get(key) != enc]
+        removed = [key for key in written if key not in encoded]
+        return dirty, removed
+
+    def is_dirty(self, save_name, encoded):
+        """True if writing the snapshot would change the save on disk"""
+        dirty, removed = self.dirty_sections(save_name, encoded)
+        return bool(dirty or removed) or not self.has_save(save_name)
+
+    def write(self, save_name, encoded):
+        """Write an encoded snapshot if any section changed
+
+        Returns:
+            bool: True if the file was written, False if the write was skipped
+        """
+        dirty, removed = self.dirty_sections(save_name, encoded)
+        if not dirty and not removed and self.has_save(save_name):
+            self.skipped += 1
+            return False
+
+        target = SQLITE_FILENAME if self.use_sqlite else SAVE_FILENAME
+        with self._lock:
+            same_format = self._formats.get(save_name) == target
+        journal_size = None
+        if self.use_sqlite:
+            self._write_sqlite(save_name, encoded, dirty, removed, same_format)
+        elif self.use_journal and same_format and self._append(save_name, encoded, dirty, removed):
+            self.writes += 1
+            self.index.update(save_name, summarize(encoded))
+            return True
+        else:
+            journal_size = self._write_packed(save_name, encoded)
+
+        # The new file is complete; files in other formats are now out of date
+        if target != SQLITE_FILENAME:
+            self._close_store(save_name)
+        for path in self._save_files(save_name):
+            if path.name != target and path.exists():
+                path.unlink()
+        if journal_size is None and self.journal_path(save_name).exists():
+            self.journal_path(save_name).unlink()
+
+        with self._lock:
+            self._written[save_name] = encoded
+            self._formats[save_name] = target
+            if journal_size is not None:
+                self._journals[save_name] = journal_size
+            else:
+                self._journals.pop(save_name, None)
+        self.writes += 1
+        self.index.update(save_name, summarize(encoded))
+        return True
+
+    def _write_packed(self, save_name, encoded):
+        """Write save.dat; returns the size of the fresh journal, or None without one"""
+        version = json.loads(encoded.get("v", "0"))
+        content, packed = pack_sections(encoded, version, self._packed.get(save_name))
+        atomic_write(self.save_path(save_name), content)
+        self._packed[save_name] = packed
+        # A crash right here leaves the old journal, which no longer matches
+        # the save file and is therefore ignored on load
+        if self.use_journal:
+            return start_journal(self.journal_path(save_name), snapshot_id(content))
+        return None
+
+    def _write_sqlite(self, save_name, encoded, dirty, removed, same_format):
+        """Write save.db, row by row when it already holds the last written state"""
+        store = self.sqlite_store(save_name, create=True)
+        with self._lock:
+            written = self._written.get(save_name)
+        if written is None or not same_format:
+            store.import_data({key: json.loads(enc) for key, enc in encoded.items()})
+            self._decoded[save_name] = {}
+            return
+        decoded = self._decoded.setdefault(save_name, {})
+        old = {key: decoded[key] if key in decoded else json.loads(written[key])
+               for key in dirty if key in written}
+        new = {key: json.loads(enc) if key in dirty else None for key, enc in encoded.items()}
+        store.update(old, new, dirty, removed)
+        for key in removed:
+            decoded.pop(key, None)
+        decoded.update((key, new[key]) for key in dirty)
+
+    def _append(self, save_name, encoded, dirty, removed):
+        """Write a save as journal records; False if it needs a full save file instead"""
+        with self._lock:
+            written = self._written.get(save_name)
+            journal_size = self._journals.get(save_name)
+        if written is None or journal_size is None:
+            return False
+
+        text = encode_records(diff_records(written, encoded, dirty, removed))
+        size = len(text.encode('utf-8'))
+        if journal_size + size > self.journal_limit:
+            self.compactions += 1
+            return False
+
+        append_records(self.journal_path(save_name), text)
+        with self._lock:
+            self._written[save_name] = encoded
+            self._journals[save_name] = journal_size + size
+        self.appends += 1
+        return True
+
+    def save(self, save_name, data):
+        """Write data if any section changed (see write)"""
+        return self.write(save_name, self.encode(data))
+
+    def export_json(self, save_name, path):
+        """Write a save (in whatever format it is stored) to path as plain JSON
+
+        Returns:
+            bool: False if the save doesn't exist
+        """
+        data = self.load(save_name)
+        if data is None:
+            return False
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=4, ensure_ascii=False)
+        return True
+
+    def import_json(self, save_name, path):
+        """Replace (or create) a save with the contents of a plain JSON save file
+
+        The file is upgraded like any other save and written in the current format.
+        """
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        upgrade(data)
+        with self._lock:
+            self._written.pop(save_name, None)
+            self._formats.pop(save_name, None)
+        self.write(save_name, self.encode(data))
+        return data
+
+    def summary(self, save_name):
+        """Indexed summary of a save (see save_index.summarize), or None if it can't be read"""
+        summary = self.index.get(save_name)
+        if summary is None:
+            # Saves last written before the index existed are read once, then indexed
+            reader = SaveEngine(self.saves_dir)
+            try:
+                data = reader.load(save_name)
+            except (OSError, ValueError, sqlite3.Error):
+                return None
+            finally:
+                reader._close_store(save_name)
+            if data is None:
+                return None
+            summary = summarize(self.encode(data))
+            summary["last_played"] = self.current_file(save_name).stat().st_mtime
+            self.index.update(save_name, summary)
+        return summary
+
+    def list_saves(self):
+        """[(save_name, summary or None)] for every save, most recently played first"""
+        if not self.saves_dir.exists():
+            return []
+        saves = [(folder.name, self.summary(folder.name)) for folder in self.saves_dir.iterdir()
+                 if folder.is_dir() and self.has_save(folder.name)]
+        saves.sort(key=lambda save: save[1]["last_played"] if save[1] else 0, reverse=True)
+        return saves
+
+    def forget(self, save_name):
+        """Drop cached state for a save (call after deleting it)"""
+        self._close_store(save_name)
+        with self._lock:
+            self._written.pop(save_name, None)
+            self._journals.pop(save_name, None)
+            self._packed.pop(save_name, None)
+            self._formats.pop(save_name, None)
+        self.index.remove(save_name)
+
+
+class SaveWorker:
+    """Background thread that writes save snapshots for a SaveEngine
+
+    submit() encodes the save on the caller's thread - so later changes to the
+    dict cannot leak into the snapshot - and returns without touching the disk.
+    Snapshots of the same save submitted within `debounce` seconds of each
+    other replace one another and only the newest is written; a burst that
+    keeps going is still written at least every `max_delay` seconds.
+
+    Args:
+        engine: SaveEngine that performs the writes
+        debounce: Quiet period (seconds) after the last submit before writing
+        max_delay: Longest a submitted snapshot may wait while a burst continues
+    """
+
+    def __init__(self, engine, debounce=0.5, max_delay=2.0):
+        self.engine = engine
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.last_error = None    # Most recent exception raised by a background write
+        self.submitted = 0
+        self._cond = threading.Condition()
+        self._pending = {}        # save_name -> (encoded snapshot, time first queued)
+        self._last_submit = 0.0
+        self._writing = False
+        self._in_flight = {}      # save_name -> encoded snapshot being written now
+        self._flush_waiters = 0
+        self._closed = False
+        self._thread = None
+
+    def submit(self, save_name, data):
+        """Queue a snapshot of data for writing
+
+        Returns:
+            bool: False if the snapshot matches what is already on disk (nothing queued)
+        """
+        encoded = self.engine.encode(data)
+        with self._cond:
+            if self._closed:
+                # After close() (i.e. while the game is shutting down) saves are written directly
+                return self.engine.write(save_name, encoded)
+            pending = self._pending.get(save_name)
+            if pending is None:
+                # A write in progress decides what ends up on disk, not the last finished one
+                in_flight = self._in_flight.get(save_name)
+                if (encoded == in_flight if in_flight is not None
+                        else not self.engine.is_dirty(save_name, encoded)):
+                    self.engine.skipped += 1
+                    return False
+            now = monotonic()
+            self._pending[save_name] = (encoded, pending[1] if pending else now)
+            self._last_submit = now
+            self.submitted += 1
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="save-worker", daemon=True)
+                self._thread.start()
+            self._cond.notify_all()
+        return True
+
+    def _next_batch(self):
+        """Wait for the debounce window to close; returns the snapshots to write (None to stop)"""
+        with self._cond:
+            while not self._pending and not self._closed:
+                self._cond.wait()
+            while self._pending and not self._closed and not self._flush_waiters:
+                oldest = min(first for _, first in self._pending.values())
+                deadline = min(self._last_submit + self.debounce, oldest + self.max_delay)
+                remaining = deadline - monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            if not self._pending:
+                return None
+            batch, self._pending = self._pending, {}
+            self._writing = True
+            self._in_flight = {save_name: encoded for save_name, (encoded, _) in batch.items()}
+            return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            for save_name, (encoded, _) in batch.items():
+                try:
+                    self.engine.write(save_name, encoded)
+                except Exception as e:
+                    # Not marked as written, so the next submit of this save retries it; the
+                    # thread keeps running so later saves (and flush()) are not stranded
+                    self.last_error = e
+            with self._cond:
+                self._writing = False
+                self._in_flight = {}
+                self._cond.notify_all()
+
+    def pending(self):
+        """True if a snapshot is queued or being written"""
+        with self._cond:
+            return bool(self._pending) or self._writing
+
+    def flush(self, timeout=None):
+        """Write queued snapshots now and wait until they are on disk
+
+        Returns:
+            bool: True if everything was written before the timeout
+        """
+        with self._cond:
+            if self._thread is None or not self._thread.is_alive():
+                return not self._pending
+            self._flush_waiters += 1
+            self._cond.notify_all()
+            try:
+                return self._cond.wait_for(lambda: not self._pending and not self._writing, timeout)
+            finally:
+                self._flush_waiters -= 1
+
+    def close(self, timeout=None):
+        """Flush, stop the thread and make further submits write synchronously"""
+        self.flush(timeout)
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+            thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
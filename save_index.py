@@ -0,0 +1,94 @@
+"""
+Save-slot summary index.
+
+The continue and delete screens want to show more than folder names, but
+reading every save to find its credits, system and ship costs time in
+proportion to the size of the saves. Instead the save engine keeps
+saves/index.json up to date: one small summary per slot, rewritten whenever a
+write changes a summary. Listing the saves then reads this one file, however
+large the saves themselves grow.
+"""
+import json
+import threading
+from time import time
+
+INDEX_FILENAME = "index.json"
+
+# last_played is refreshed on a save at most this often (seconds) when nothing
+# else in the summary changed, so frequent saves don't each rewrite the index
+LAST_PLAYED_RESOLUTION = 60
+
+
+def summarize(sections):
+    """Summary of a save from its encoded top-level sections ({section: JSON})"""
+    def section(name, default=None):
+        enc = sections.get(name)
+        return json.loads(enc) if enc is not None else default
+
+    ships = section("ships", [])
+    active = section("active_ship", 0)
+    ship = ships[active] if isinstance(active, int) and 0 <= active < len(ships) else (ships[0] if ships else {})
+    return {
+        "player_name": section("player_name", ""),
+        "credits": section("credits", 0),
+        "system": section("current_system", ""),
+        "docked_at": section("docked_at", ""),
+        "ship": ship.get("nickname") or ship.get("name", ""),
+        "ships": len(ships),
+        "last_played": time(),
+    }
+
+
+class SaveIndex:
+    """saves/index.json: {save_name: summary}
+
+    Args:
+        path: Location of the index file
+        write: Function(path, text) used to write it (the engine's atomic_write)
+    """
+
+    def __init__(self, path, write):
+        self.path = path
+        self._write = write
+        self._lock = threading.Lock()
+        self._entries = None
+
+    def _load(self):
+        if self._entries is None:
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self._entries = json.load(f)
+            except (OSError, ValueError):
+                self._entries = {}
+        return self._entries
+
+    def get(self, save_name):
+        with self._lock:
+            entry = self._load().get(save_name)
+            return dict(entry) if entry is not None else None
+
+    def update(self, save_name, summary):
+        """Store a slot's summary; returns True if the index file was rewritten"""
+        with self._lock:
+            entries = self._load()
+            old = entries.get(save_name)
+            if old is not None:
+                same = all(old.get(key) == value for key, value in summary.items() if key != "last_played")
+                if same and summary["last_played"] - old.get("last_played", 0) < LAST_PLAYED_RESOLUTION:
+                    return False
+            entries[save_name] = summary
+            self._save(entries)
+            return True
+
+    def remove(self, save_name):
+        with self._lock:
+            entries = self._load()
+            if entries.pop(save_name, None) is not None:
+                self._save(entries)
+
+    def _save(self, entries):
+        try:
+            self._write(self.path, json.dumps(entries, separators=(',', ':'), ensure_ascii=False))
+        except OSError:
+            # The index is only a cache; listings fall back to reading the save
+            pass
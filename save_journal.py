@@ -0,0 +1,237 @@
+"""
+Append-only save journal.
+
+With the journal enabled, a save that only changes a few things - credits
+after a trade, some inventory, a queued job, a scanned anomaly - appends a
+few small delta records to save.journal next to save.json instead of
+rewriting the whole save. Loading replays the journal over save.json, and once
+the journal grows past a size threshold the save engine compacts it by
+writing a fresh save.json and starting an empty journal.
+
+The first line of a journal names the save.json it applies to (a hash of its
+contents). A journal whose base doesn't match save.json - because a
+compaction wrote the new save.json and was killed before it could reset the
+journal - is ignored, since that save.json already contains its records. A
+record torn by a crash mid-append is the last line and is dropped on load.
+
+Record kinds ("op"):
+    credits      {"delta": n}                        credits changed
+    items        {"section", "delta", "removed"}     inventory/storage quantities
+    job_queued   {"station", "jobs"}                 jobs appended to a station's queue
+    anomaly      {"system", "index", "set"}          fields of one anomaly (scanned, visited...)
+    update       {"section", "set", "removed"}       keys of a dict section replaced/removed
+    append       {"section", "values"}               values appended to a list section
+    set          {"section", "value"}                whole section replaced
+    remove       {"section"}                         section removed
+"""
+import hashlib
+import json
+import os
+
+JOURNAL_FILENAME = "save.journal"
+
+# Sections holding {item name: quantity}
+ITEM_SECTIONS = ("inventory", "storage")
+
+
+def snapshot_id(content):
+    """Identifier of a save file's contents (bytes), stored as the journal's base"""
+    return hashlib.sha1(content).hexdigest()
+
+
+def _encode(record):
+    return json.dumps(record, separators=(',', ':'), ensure_ascii=False) + "\n"
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def keeps_order(old, new):
+    """True if updating old in place (removals, then new keys appended) yields new's key order"""
+    return list(new) == [key for key in old if key in new] + [key for key in new if key not in old]
+
+
+def _items_record(section, old, new):
+    """Quantity deltas for an item section, or None if it can't be expressed as one"""
+    if not keeps_order(old, new):
+        return None
+    delta = {}
+    for item, qty in new.items():
+        before = old.get(item, 0)
+        if qty == before and item in old:
+            continue
+        if not _is_number(qty) or not _is_number(before) or before + (qty - before) != qty:
+            return None
+        delta[item] = qty - before
+    removed = [item for item in old if item not in new]
+    return {"op": "items", "section": section, "delta": delta, "removed": removed}
+
+
+def _anomaly_records(system, old, new):
+    """Per-anomaly field changes for a system whose anomaly list kept its shape"""
+    if len(old) != len(new):
+        return None
+    records = []
+    for index, (before, after) in enumerate(zip(old, new)):
+        if before == after:
+            continue
+        if not isinstance(before, dict) or not isinstance(after, dict) or list(before) != list(after):
+            return None
+        changed = {key: value for key, value in after.items() if before[key] != value}
+        records.append({"op": "anomaly", "system": system, "index": index, "set": changed})
+    return records
+
+
+def _dict_records(section, old, new):
+    records = []
+    changed = {}
+    for key, value in new.items():
+        if key in old and old[key] == value:
+            continue
+        before = old.get(key)
+        if (section == "manufacturing_jobs" and isinstance(before, list) and isinstance(value, list)
+                and len(value) > len(before) and value[:len(before)] == before):
+            records.append({"op": "job_queued", "station": key, "jobs": value[len(before):]})
+            continue
+        if section == "anomalies" and isinstance(before, list) and isinstance(value, list):
+            anomaly_records = _anomaly_records(key, before, value)
+            if anomaly_records is not None:
+                records.extend(anomaly_records)
+                continue
+        changed[key] = value
+    removed = [key for key in old if key not in new]
+    if changed or removed:
+        records.append({"op": "update", "section": section, "set": changed, "removed": removed})
+    return records
+
+
+def section_records(section, old, new):
+    """Journal records that turn section value old into new"""
+    if section == "credits" and _is_number(old) and _is_number(new) and old + (new - old) == new:
+        return [{"op": "credits", "delta": new - old}]
+    if isinstance(old, dict) and isinstance(new, dict) and keeps_order(old, new):
+        if section in ITEM_SECTIONS:
+            record = _items_record(section, old, new)
+            if record is not None:
+                return [record]
+        return _dict_records(section, old, new)
+    if (isinstance(old, list) and isinstance(new, list)
+            and len(new) > len(old) and new[:len(old)] == old):
+        return [{"op": "append", "section": section, "values": new[len(old):]}]
+    return [{"op": "set", "section": section, "value": new}]
+
+
+def diff_records(written, encoded, dirty, removed):
+    """Journal records turning the last written snapshot into a new one
+
+    Args:
+        written: {section: encoded JSON} as last written
+        encoded: {section: encoded JSON} to be saved
+        dirty: Sections of encoded that differ from written
+        removed: Sections of written missing from encoded
+
+    Returns:
+        list: Records to append
+    """
+    records = []
+    for section in dirty:
+        new = json.loads(encoded[section])
+        if section not in written:
+            records.append({"op": "set", "section": section, "value": new})
+            continue
+        records.extend(section_records(section, json.loads(written[section]), new))
+    records.extend({"op": "remove", "section": section} for section in removed)
+    return records
+
+
+def apply_record(data, record):
+    """Apply one journal record to loaded save data in place"""
+    op = record["op"]
+    if op == "credits":
+        data["credits"] += record["delta"]
+    elif op == "items":
+        items = data.setdefault(record["section"], {})
+        for item in record["removed"]:
+            items.pop(item, None)
+        for item, delta in record["delta"].items():
+            items[item] = items.get(item, 0) + delta
+    elif op == "job_queued":
+        data.setdefault("manufacturing_jobs", {}).setdefault(record["station"], []).extend(record["jobs"])
+    elif op == "anomaly":
+        data["anomalies"][record["system"]][record["index"]].update(record["set"])
+    elif op == "update":
+        section = data.setdefault(record["section"], {})
+        for key in record["removed"]:
+            section.pop(key, None)
+        section.update(record["set"])
+    elif op == "append":
+        data.setdefault(record["section"], []).extend(record["values"])
+    elif op == "set":
+        data[record["section"]] = record["value"]
+    elif op == "remove":
+        data.pop(record["section"], None)
+    else:
+        raise ValueError(f"Unknown save journal record: {op}")
+
+
+def read_journal(path, base):
+    """Records of the journal at path that apply to the save.json with id base
+
+    Returns:
+        tuple: (records, size in bytes) - records is None if there is no
+        journal or it belongs to a different save.json
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            lines = f.readlines()
+    except FileNotFoundError:
+        return None, 0
+    try:
+        header = json.loads(lines[0]) if lines else {}
+    except json.JSONDecodeError:
+        return None, 0
+    if header.get("base") != base:
+        return None, 0
+
+    records = []
+    size = len(lines[0].encode('utf-8'))
+    for line in lines[1:]:
+        try:
+            if not line.endswith("\n"):
+                raise ValueError("unterminated record")
+            records.append(json.loads(line))
+        except ValueError:
+            # Torn final record from a crash mid-append: cut it off so later
+            # appends start on a fresh line
+            os.truncate(path, size)
+            break
+        size += len(line.encode('utf-8'))
+    return records, size
+
+
+def start_journal(path, base):
+    """Create an empty journal for the save.json with id base
+
+    Returns:
+        int: Size of the new journal in bytes
+    """
+    header = _encode({"base": base})
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(header)
+        f.flush()
+        os.fsync(f.fileno())
+    return len(header.encode('utf-8'))
+
+
+def encode_records(records):
+    """Journal lines for records"""
+    return "".join(_encode(record) for record in records)
+
+
+def append_records(path, text):
+    """Append encoded records (see encode_records) to the journal and make them durable"""
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
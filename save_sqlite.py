@@ -0,0 +1,303 @@
+"""
+SQLite save store (save.db), an optional alternative to save.dat.
+
+The large sections get their own indexed tables - one row per inventory or
+storage item, per anomaly, per scanned system and per manufacturing job - so
+a save only touches the rows of what changed, and questions such as "which
+jobs are finished by now" can be answered from save.db by index lookups,
+without loading the save. The game itself never asks them: it holds the
+loaded save, and a scan of that in memory is faster than any query. They
+are for tools that read save.db from outside the game. Anomalies are stored as seeded deltas (see anomaly_seed), which
+have no type or expiry of their own, so they are only stored, not queried. Everything else is stored as JSON in
+the sections table, which also records the order of the top-level sections so
+export() rebuilds the save dict exactly as it was saved.
+
+A section whose contents don't fit its table (e.g. a non-numeric quantity) is
+stored as JSON like any other section.
+"""
+import json
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+from save_journal import keeps_order
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sections (
+    name TEXT PRIMARY KEY,
+    pos INTEGER NOT NULL,
+    value TEXT                      -- JSON, or NULL if the section lives in its own table
+);
+CREATE TABLE IF NOT EXISTS items (
+    section TEXT NOT NULL,          -- inventory / storage
+    item TEXT NOT NULL,
+    pos INTEGER NOT NULL,
+    qty NOT NULL,                   -- no affinity, so ints stay ints and floats floats
+    PRIMARY KEY (section, item)
+);
+CREATE TABLE IF NOT EXISTS groups (   -- keys of the anomalies / manufacturing_jobs dicts
+    section TEXT NOT NULL,
+    name TEXT NOT NULL,
+    pos INTEGER NOT NULL,
+    PRIMARY KEY (section, name)
+);
+CREATE TABLE IF NOT EXISTS anomalies (
+    system TEXT NOT NULL,
+    pos INTEGER NOT NULL,
+    type TEXT,
+    expires_at REAL,
+    body TEXT NOT NULL,
+    PRIMARY KEY (system, pos)
+);
+CREATE TABLE IF NOT EXISTS scanned_systems (
+    pos INTEGER PRIMARY KEY,
+    system TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS scanned_by_system ON scanned_systems (system);
+CREATE TABLE IF NOT EXISTS jobs (
+    station TEXT NOT NULL,
+    pos INTEGER NOT NULL,
+    item TEXT,
+    finishes_at REAL,
+    body TEXT NOT NULL,
+    PRIMARY KEY (station, pos)
+);
+CREATE INDEX IF NOT EXISTS jobs_by_finish ON jobs (finishes_at);
+"""
+
+ITEM_SECTIONS = ("inventory", "storage")
+GROUPED_SECTIONS = {
+    # section: (table, group column, indexed columns taken from each row)
+    # (stored seeded anomalies are deltas without type or timestamp: NULL, and not queried)
+    "anomalies": ("anomalies", "system",
+                  lambda a: (a.get("type"),
+                             a["timestamp"] + a.get("duration", 48 * 3600) if "timestamp" in a else None)),
+    "manufacturing_jobs": ("jobs", "station",
+                           lambda j: (j.get("item"), j.get("start_time", 0) + j.get("craft_time", 0))),
+}
+
+
+def _dumps(value):
+    return json.dumps(value, separators=(',', ':'), ensure_ascii=False)
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _fits_table(name, value):
+    """True if a section can be stored in its table"""
+    if name in ITEM_SECTIONS:
+        return isinstance(value, dict) and all(_is_number(qty) for qty in value.values())
+    if name in GROUPED_SECTIONS:
+        return isinstance(value, dict) and all(
+            isinstance(rows, list) and all(isinstance(row, dict) for row in rows) for rows in value.values())
+    if name == "scanned_systems":
+        return isinstance(value, list) and all(isinstance(system, str) for system in value)
+    return False
+
+
+class SqliteSaveStore:
+    """One save.db file
+
+    The connection is opened on first use and kept until close(); calls from
+    different threads (the save worker and the game) are serialized.
+
+    Args:
+        path: Location of save.db (created on first write)
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._conn = None
+        self._lock = threading.RLock()
+
+    def _connection(self):
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA synchronous = FULL")
+            self._conn.executescript(SCHEMA)
+        return self._conn
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    @contextmanager
+    def _transaction(self):
+        """Connection for a block that commits on success and rolls back on error"""
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                yield conn
+
+    def _query(self, sql, params=()):
+        with self._lock:
+            return self._connection().execute(sql, params).fetchall()
+
+    # --- Whole-save import/export ---
+
+    def import_data(self, data):
+        """Replace the stored save with data"""
+        with self._transaction() as conn:
+            for table in ("sections", "items", "groups", "anomalies", "scanned_systems", "jobs"):
+                conn.execute(f"DELETE FROM {table}")
+            for pos, (name, value) in enumerate(data.items()):
+                self._write_section(conn, name, pos, value)
+
+    def export(self):
+        """The stored save as a dict, in the layout and order it was saved in"""
+        with self._lock:
+            conn = self._connection()
+            data = {}
+            for name, value in conn.execute("SELECT name, value FROM sections ORDER BY pos").fetchall():
+                data[name] = json.loads(value) if value is not None else self._read_table(conn, name)
+            return data
+
+    # --- Row-level updates ---
+
+    def update(self, old, new, dirty, removed):
+        """Write the dirty sections of a save, touching only the rows that changed
+
+        Args:
+            old: {section: value} as last written (at least the dirty sections present in it)
+            new: {section: value} of every section, in save order
+            dirty: Sections of new that differ from old
+            removed: Sections of old that no longer exist
+        """
+        with self._transaction() as conn:
+            positions = dict(conn.execute("SELECT name, pos FROM sections ORDER BY pos"))
+            if not keeps_order(positions, new):
+                # Top-level order changed: renumber every section
+                for pos, name in enumerate(new):
+                    conn.execute("UPDATE sections SET pos = ? WHERE name = ?", (pos, name))
+                positions = {name: pos for pos, name in enumerate(new)}
+            next_pos = max(positions.values(), default=-1) + 1
+
+            for name in removed:
+                self._clear_section(conn, name)
+                conn.execute("DELETE FROM sections WHERE name = ?", (name,))
+            for name in dirty:
+                value = new[name]
+                pos = positions.get(name)
+                if pos is None:
+                    pos, next_pos = next_pos, next_pos + 1
+                stored_as_table = name in old and _fits_table(name, old[name])
+                if stored_as_table and _fits_table(name, value):
+                    self._update_table(conn, name, old[name], value)
+                else:
+                    self._write_section(conn, name, pos, value)
+
+    # --- Indexed queries (for reading save.db without loading the save; unused by the game) ---
+
+    def jobs_finished_by(self, now):
+        """[(station, job)] for every manufacturing job finished at time now"""
+        rows = self._query("SELECT station, body FROM jobs WHERE finishes_at <= ? ORDER BY finishes_at", (now,))
+        return [(station, json.loads(body)) for station, body in rows]
+
+    def is_scanned(self, system):
+        return bool(self._query("SELECT 1 FROM scanned_systems WHERE system = ? LIMIT 1", (system,)))
+
+    def item_quantity(self, section, item):
+        rows = self._query("SELECT qty FROM items WHERE section = ? AND item = ?", (section, item))
+        return rows[0][0] if rows else 0
+
+    # --- Internals ---
+
+    def _write_section(self, conn, name, pos, value):
+        """Store a whole section, replacing whatever was stored for it"""
+        self._clear_section(conn, name)
+        if _fits_table(name, value):
+            conn.execute("INSERT OR REPLACE INTO sections VALUES (?, ?, NULL)", (name, pos))
+            self._insert_table(conn, name, value)
+        else:
+            conn.execute("INSERT OR REPLACE INTO sections VALUES (?, ?, ?)", (name, pos, _dumps(value)))
+
+    def _clear_section(self, conn, name):
+        if name in ITEM_SECTIONS:
+            conn.execute("DELETE FROM items WHERE section = ?", (name,))
+        elif name in GROUPED_SECTIONS:
+            conn.execute(f"DELETE FROM {GROUPED_SECTIONS[name][0]}")
+            conn.execute("DELETE FROM groups WHERE section = ?", (name,))
+        elif name == "scanned_systems":
+            conn.execute("DELETE FROM scanned_systems")
+
+    def _insert_table(self, conn, name, value):
+        if name in ITEM_SECTIONS:
+            conn.executemany("INSERT INTO items VALUES (?, ?, ?, ?)",
+                             ((name, item, pos, qty) for pos, (item, qty) in enumerate(value.items())))
+        elif name in GROUPED_SECTIONS:
+            for group_pos, (group, rows) in enumerate(value.items()):
+                self._insert_group(conn, name, group, group_pos, rows)
+        elif name == "scanned_systems":
+            conn.executemany("INSERT INTO scanned_systems VALUES (?, ?)", enumerate(value))
+
+    def _insert_group(self, conn, name, group, group_pos, rows):
+        table, _, extra = GROUPED_SECTIONS[name]
+        conn.execute("INSERT OR REPLACE INTO groups VALUES (?, ?, ?)", (name, group, group_pos))
+        conn.executemany(f"INSERT INTO {table} VALUES (?, ?, ?, ?, ?)",
+                         ((group, pos, *extra(row), _dumps(row)) for pos, row in enumerate(rows)))
+
+    def _update_table(self, conn, name, old, new):
+        """Row-level update of a table-backed section (old and new both fit the table)"""
+        if not keeps_order(old, new):
+            self._clear_section(conn, name)
+            self._insert_table(conn, name, new)
+            return
+
+        if name == "scanned_systems":
+            if new[:len(old)] == old:
+                conn.executemany("INSERT INTO scanned_systems VALUES (?, ?)",
+                                 ((pos, system) for pos, system in enumerate(new) if pos >= len(old)))
+            else:
+                self._clear_section(conn, name)
+                self._insert_table(conn, name, new)
+            return
+
+        if name in ITEM_SECTIONS:
+            conn.executemany("DELETE FROM items WHERE section = ? AND item = ?",
+                             ((name, item) for item in old if item not in new))
+            next_pos = conn.execute("SELECT COALESCE(MAX(pos), -1) + 1 FROM items WHERE section = ?",
+                                    (name,)).fetchone()[0]
+            for item, qty in new.items():
+                if item not in old:
+                    conn.execute("INSERT INTO items VALUES (?, ?, ?, ?)", (name, item, next_pos, qty))
+                    next_pos += 1
+                elif old[item] != qty:
+                    conn.execute("UPDATE items SET qty = ? WHERE section = ? AND item = ?", (qty, name, item))
+            return
+
+        table, group_column, _ = GROUPED_SECTIONS[name]
+        gone = [group for group in old if group not in new]
+        conn.executemany(f"DELETE FROM {table} WHERE {group_column} = ?", ((group,) for group in gone))
+        conn.executemany("DELETE FROM groups WHERE section = ? AND name = ?", ((name, group) for group in gone))
+        next_pos = conn.execute("SELECT COALESCE(MAX(pos), -1) + 1 FROM groups WHERE section = ?",
+                                (name,)).fetchone()[0]
+        for group, rows in new.items():
+            if group in old:
+                if old[group] == rows:
+                    continue
+                group_pos = conn.execute("SELECT pos FROM groups WHERE section = ? AND name = ?",
+                                         (name, group)).fetchone()[0]
+                conn.execute(f"DELETE FROM {table} WHERE {group_column} = ?", (group,))
+            else:
+                group_pos, next_pos = next_pos, next_pos + 1
+            self._insert_group(conn, name, group, group_pos, rows)
+
+    def _read_table(self, conn, name):
+        if name in ITEM_SECTIONS:
+            return dict(conn.execute("SELECT item, qty FROM items WHERE section = ? ORDER BY pos", (name,)))
+        if name in GROUPED_SECTIONS:
+            table, group_column, _ = GROUPED_SECTIONS[name]
+            value = {group: [] for group, in conn.execute(
+                "SELECT name FROM groups WHERE section = ? ORDER BY pos", (name,))}
+            for group, body in conn.execute(f"SELECT {group_column}, body FROM {table} "
+                                            f"ORDER BY {group_column}, pos"):
+                value[group].append(json.loads(body))
+            return value
+        if name == "scanned_systems":
+            return [system for system, in conn.execute("SELECT system FROM scanned_systems ORDER BY pos")]
+        raise ValueError(f"Section '{name}' is not stored in a table")
+
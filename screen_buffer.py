@@ -0,0 +1,132 @@
+"""
+Frame-oriented terminal output.
+
+Screens are drawn with plain print() calls. Inside a screen_frame() block
+those prints go to an in-memory buffer, and the whole screen is written to
+the terminal in one write (plus one flush) when the block ends, instead of one
+write per line - or per character - as before. capture_frame() is the same
+buffer without the final write, for screens whose text is handed to
+arrow_menu() as previous_content.
+
+clear_screen() is frame-aware: inside a screen_frame() it throws away what
+the frame has drawn so far and makes the frame start with a clear, so the
+clear and the new screen reach the terminal together.
+
+draw_changed_lines() is for live screens that are redrawn in place: given
+the lines currently on screen, it rewrites only the ones that changed.
+"""
+import os
+import sys
+from io import StringIO
+
+# Same bytes `clear` writes: home cursor, erase screen, erase scrollback
+CLEAR_SEQUENCE = "\033[H\033[2J\033[3J"
+
+_active_frames = []
+
+
+class ScreenFrame:
+    """Buffers everything printed while active
+
+    Args:
+        emit: Write the buffered screen to the real stdout when the frame ends
+        flush: Flush stdout after that write (emit frames only). Leave False
+            when the screen is immediately followed by input(), which flushes.
+    """
+
+    def __init__(self, emit=True, flush=True):
+        self.emit = emit
+        self.flush = flush
+        self.buffer = StringIO()
+        self._clear_first = False
+        self._stream = None
+
+    def __enter__(self):
+        self._stream = sys.stdout
+        sys.stdout = self.buffer
+        _active_frames.append(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        _active_frames.remove(self)
+        sys.stdout = self._stream
+        # Emit even when the screen raised, so whatever was drawn is still shown
+        if self.emit:
+            self._write_to(self._stream)
+        return False
+
+    def _write_to(self, stream):
+        output = self.buffer.getvalue()
+        if self._clear_first:
+            if os.name == 'nt':
+                os.system('cls')
+            else:
+                output = CLEAR_SEQUENCE + output
+        if output:
+            stream.write(output)
+        if self.flush:
+            stream.flush()
+
+    def clear(self):
+        """Discard everything drawn so far; the frame will start with a screen clear"""
+        self.buffer.seek(0)
+        self.buffer.truncate()
+        self._clear_first = True
+
+    def getvalue(self):
+        """Everything printed into the frame so far"""
+        return self.buffer.getvalue()
+
+
+def screen_frame(flush=True):
+    """Collect a whole screen and write it to the terminal in one go"""
+    return ScreenFrame(emit=True, flush=flush)
+
+
+def capture_frame():
+    """Collect printed output without displaying it (read it with getvalue())"""
+    return ScreenFrame(emit=False)
+
+
+def draw_changed_lines(lines, previous=None):
+    """Bring the screen from previous to lines, rewriting only changed lines
+
+    Both are lists of screen lines starting at the top-left corner, as
+    returned by capture_frame().getvalue().split("\n"). Without previous (or
+    if the number of lines changed) the screen is cleared and drawn in full.
+
+    Returns:
+        int: Number of lines written
+    """
+    if previous is None or len(previous) != len(lines):
+        with screen_frame():
+            clear_screen()
+            sys.stdout.write("\n".join(lines))
+        return len(lines)
+
+    changed = [(row, line) for row, line in enumerate(lines, 1) if previous[row - 1] != line]
+    if changed:
+        # Lines are printed with \033[K already; move to each and rewrite it
+        stream = sys.stdout
+        stream.write("".join(f"\033[{row};1H{line}\033[K" for row, line in changed))
+        stream.write(f"\033[{len(lines)};1H")
+        stream.flush()
+    return len(changed)
+
+
+def clear_screen():
+    """Clear the terminal screen"""
+    # The innermost displaying frame absorbs the clear; capture frames are skipped
+    # because their content is not on screen yet.
+    for frame in reversed(_active_frames):
+        if frame.emit:
+            frame.clear()
+            return
+
+    if os.name == 'nt':
+        os.system('cls')
+        return
+
+    stream = _active_frames[0]._stream if _active_frames else sys.stdout
+    stream.write(CLEAR_SEQUENCE)
+    stream.flush()
@@ -0,0 +1,137 @@
+"""
+ANSI-aware text layout helpers used by every boxed screen.
+
+The combat and mining screens redraw many times a second, and each redraw
+used to re-scan every string for escape codes just to work out how wide it
+is on screen. Everything here is memoized instead: the escape-code pattern is
+compiled once, visual widths are cached per string, and finished box lines
+and bars are cached by their arguments, so a frame that shows the same
+values as the last one costs only dictionary lookups.
+"""
+import re
+import unicodedata
+from functools import lru_cache
+
+from colors import get_color
+
+RESET_COLOR = "\033[0m"
+
+# CSI sequences (colors, cursor movement, erase) and two-character escapes
+ANSI_ESCAPE = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
+
+# Bar colors used by create_health_bar
+BAR_COLORS = {
+    "green": "\033[32m",
+    "cyan": "\033[36m",
+    "yellow": "\033[33m",
+    "red": "\033[31m",
+}
+
+
+@lru_cache(maxsize=8192)
+def strip_ansi(text):
+    """Remove ANSI color codes from text for length calculation"""
+    if '\x1b' not in text:
+        return text
+    return ANSI_ESCAPE.sub('', text)
+
+
+@lru_cache(maxsize=4096)
+def _char_width(char):
+    """Terminal cell width of a single character"""
+    if unicodedata.combining(char) or unicodedata.category(char) in ('Mn', 'Me', 'Cf'):
+        return 0
+    if unicodedata.east_asian_width(char) in ('W', 'F'):
+        return 2
+    return 1
+
+
+@lru_cache(maxsize=8192)
+def visual_width(text):
+    """Number of terminal cells text occupies, ignoring ANSI codes
+
+    Box-drawing characters and block elements count as one cell; wide
+    (East Asian / emoji) characters count as two.
+    """
+    plain = strip_ansi(text)
+    if plain.isascii():
+        return len(plain)
+    return sum(_char_width(c) for c in plain)
+
+
+@lru_cache(maxsize=4096)
+def box_line(content, width=60, border_color=None, text_color=None):
+    """Format a line to fit exactly in a box with proper padding
+
+    Args:
+        content: The text content (may contain ANSI codes)
+        width: Interior width of the box (default 60 for standard box)
+        border_color: Color for the border characters (║) - optional
+        text_color: Color for the text content - optional
+
+    Returns:
+        Formatted string: "║  content..." with proper padding "  ║"
+    """
+    # Calculate padding needed (account for the 2 spaces at start: "║  ")
+    padding_needed = width - visual_width(content) - 2
+
+    # Apply text color if specified
+    formatted_content = content
+    if text_color:
+        formatted_content = f"{get_color(text_color)}{content}{get_color('reset')}"
+
+    # Build the line with optional border color
+    if border_color:
+        border = f"{get_color(border_color)}║{get_color('reset')}"
+        return f"{border}  {formatted_content}{' ' * padding_needed}{border}"
+    return f"║  {formatted_content}{' ' * padding_needed}║"
+
+
+@lru_cache(maxsize=1024)
+def wrap_text(text, max_width=60):
+    """Wrap text to a maximum width, breaking only at word boundaries"""
+    if not text:
+        return ""
+
+    words = text.split()
+    lines = []
+    current_line = []
+    current_length = 0
+
+    for word in words:
+        word_length = visual_width(word)
+        # +1 for the space before the word (except for first word)
+        space_needed = word_length + (1 if current_line else 0)
+
+        if current_length + space_needed <= max_width:
+            current_line.append(word)
+            current_length += space_needed
+        else:
+            if current_line:
+                lines.append(' '.join(current_line))
+            current_line = [word]
+            current_length = word_length
+
+    if current_line:
+        lines.append(' '.join(current_line))
+
+    return '\n'.join(lines)
+
+
+@lru_cache(maxsize=2048)
+def _bar(filled, width, color):
+    color_code = BAR_COLORS.get(color, "\033[32m")
+    return f"{color_code}{'█' * filled}{RESET_COLOR}{'░' * (width - filled)}"
+
+
+def create_health_bar(current, maximum, width, color="green"):
+    """Create a colored health bar
+
+    Bars are cached by (filled cells, width, color), so any two values that
+    fill the same number of cells share one string.
+    """
+    if maximum == 0:
+        filled = 0
+    else:
+        filled = int((current / maximum) * width)
+    return _bar(filled, width, color)
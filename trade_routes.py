@@ -0,0 +1,227 @@
+"""
+Trade route planning across the galaxy's stations.
+
+A plan is a loop from the player's system and back that sells the cargo
+the player holds: optionally refine at a refinery, sell at a marketplace,
+return. Within a cargo limit (the most valuable units are carried) and a
+jump budget, plans are ranked by their gain over the best sale in the
+player's own system, per jump; loops that gain nothing are dropped.
+
+Every plan needs the jump distance between two station systems, so the
+distances between all 672 station systems are computed once and kept (one
+bytearray row per system). They come from a single breadth-first pass
+that carries every source at once: each system holds an integer bitmask of
+the station systems that have reached it, and each level ORs the masks
+across the gate connections. Bits that are new at a station system at
+level k are the sources k jumps away. Distances to and from the player's
+system, which may have no station, take one forward and one backward
+search per plan.
+
+With the distances in hand a plan takes one pass over the marketplaces
+(selling held cargo, with the closest refinery detour for refining it).
+
+Buying to resell is not planned: items sell for half their buy price and
+station prices differ by at most market.LOCAL_SPREAD, so no marketplace
+pays more for an item than another charges.
+"""
+from refinery import REFINING_RULES, SCRAP_ITEM, SCRAP_MATERIALS, SCRAP_SUCCESS_CHANCE
+
+MARKETPLACE = "General Marketplace"
+REFINERY = "Refinery"
+UNREACHABLE = 255
+DEFAULT_CARGO_LIMIT = 100
+DEFAULT_MAX_JUMPS = 20
+
+
+def refined_yield(item_name):
+    """Expected materials from refining one unit of an item ({material: quantity})"""
+    if item_name == SCRAP_ITEM:
+        total_weight = sum(weight for _, weight in SCRAP_MATERIALS)
+        return {material: SCRAP_SUCCESS_CHANCE * weight / total_weight for material, weight in SCRAP_MATERIALS}
+    if item_name in REFINING_RULES:
+        material, yield_amount = REFINING_RULES[item_name]
+        return {material: yield_amount}
+    return {}
+
+
+class TradePlanner:
+    """Ranks trade loops over the stations of system_data.json
+
+    Args:
+        systems: The system_data.json dict ({name: {"Connections": [...], "Stations": [...]}})
+    """
+
+    def __init__(self, systems):
+        self.system_names = list(systems)
+        self._system_index = {name: i for i, name in enumerate(self.system_names)}
+        self._out = [[self._system_index[c] for c in dict.fromkeys(info.get("Connections", []))
+                      if c in self._system_index] for info in systems.values()]
+        self._in = [[] for _ in self.system_names]
+        for u, neighbors in enumerate(self._out):
+            for v in neighbors:
+                self._in[v].append(u)
+
+        # Station systems (the rows and columns of the distance table) and their stations
+        self.station_systems = [name for name, info in systems.items()
+                                if info.get("Stations") and not info.get("hidden", False)]
+        self._station_index = {name: i for i, name in enumerate(self.station_systems)}
+        self.stations = []
+        for name in self.station_systems:
+            for station in systems[name]["Stations"]:
+                facilities = station.get("Facilities", [])
+                self.stations.append((station.get("Name", name), name,
+                                      MARKETPLACE in facilities, REFINERY in facilities))
+        self._distances = None
+
+    def distances(self):
+        """Jumps between every two station systems: rows[from][to] (UNREACHABLE if none)"""
+        if self._distances is None:
+            count = len(self.station_systems)
+            rows = [bytearray([UNREACHABLE]) * count for _ in range(count)]
+            station_at = [-1] * len(self.system_names)
+            reached = [0] * len(self.system_names)
+            for i, name in enumerate(self.station_systems):
+                station_at[self._system_index[name]] = i
+                reached[self._system_index[name]] = 1 << i
+                rows[i][i] = 0
+
+            frontier = [u for u, mask in enumerate(reached) if mask]
+            jumps = 0
+            while frontier:
+                jumps += 1
+                if jumps >= UNREACHABLE:
+                    break
+                new = {}
+                for u in frontier:
+                    mask = reached[u]
+                    for v in self._out[u]:
+                        new[v] = new.get(v, 0) | mask
+                frontier = []
+                for v, mask in new.items():
+                    mask &= ~reached[v]
+                    if not mask:
+                        continue
+                    reached[v] |= mask
+                    frontier.append(v)
+                    to = station_at[v]
+                    if to >= 0:
+                        while mask:
+                            low = mask & -mask
+                            rows[low.bit_length() - 1][to] = jumps
+                            mask ^= low
+            self._distances = rows
+        return self._distances
+
+    def _search(self, start, edges):
+        # Jumps from start (over edges) to every station system
+        dist = [-1] * len(self.system_names)
+        dist[start] = 0
+        frontier = [start]
+        jumps = 0
+        while frontier:
+            jumps += 1
+            next_frontier = []
+            for u in frontier:
+                for v in edges[u]:
+                    if dist[v] < 0:
+                        dist[v] = jumps
+                        next_frontier.append(v)
+            frontier = next_frontier
+        return [dist[self._system_index[name]] if dist[self._system_index[name]] >= 0 else UNREACHABLE
+                for name in self.station_systems]
+
+    def legs_from(self, system):
+        """Jumps from a system to every station system, and from every station system back"""
+        rows = self.distances()
+        i = self._station_index.get(system)
+        if i is not None:
+            return list(rows[i]), [row[i] for row in rows]
+        start = self._system_index[system]
+        return self._search(start, self._out), self._search(start, self._in)
+
+    def plan(self, system, holdings, prices, cargo_limit=DEFAULT_CARGO_LIMIT, max_jumps=DEFAULT_MAX_JUMPS, limit=10):
+        """The best trade loops from a system, by gain per jump over selling where the player is
+
+        Args:
+            system: Where the loop starts and ends
+            holdings: {item: quantity} carried (sold or refined along the way)
+            prices: A market.Market (station prices: sell_price(item, station))
+            cargo_limit: Units that can be carried (the most valuable ones are taken)
+            max_jumps: Longest loop considered
+
+        Returns:
+            list: Plans, best first; each a dict with "stops" ([(station, system, action)]),
+            "jumps", "profit", "gain" (profit over the best sale in this system) and "gain_per_jump"
+        """
+        rows = self.distances()
+        out, back = self.legs_from(system)
+        station_row = [self._station_index[name] for _, name, _, _ in self.stations]
+        markets = [s for s, (_, _, market, _) in enumerate(self.stations) if market]
+        refineries = [s for s, (_, _, _, refinery) in enumerate(self.stations) if refinery]
+
+        holdings = {item: quantity for item, quantity in holdings.items() if quantity > 0}
+        yields = {item: refined_yield(item) for item in holdings}
+
+        # What a marketplace pays per unit of an item, sold as is or refined first
+        def unit_value(item, station, refine):
+            sell = prices.sell_price(item, station) or 0
+            if refine and yields[item]:
+                refined = sum(quantity * (prices.sell_price(material, station) or 0)
+                              for material, quantity in yields[item].items())
+                return max(sell, refined)
+            return sell
+
+        # What the cargo fetches at one marketplace, carrying its most valuable units
+        def cargo_value(station, refine):
+            room = cargo_limit
+            total = 0
+            for value, quantity in sorted(((unit_value(item, station, refine), quantity)
+                                           for item, quantity in holdings.items()), reverse=True):
+                carried = min(room, quantity)
+                total += carried * value
+                room -= carried
+                if not room:
+                    break
+            return total
+
+        plans = []
+
+        def add(stops, jumps, profit):
+            if profit > 0 and jumps <= max_jumps:
+                plans.append({"stops": stops, "jumps": jumps, "profit": round(profit)})
+
+        # Sell held cargo, as is or after the closest refinery detour
+        for b in markets:
+            station, name, _, has_refinery = self.stations[b]
+            to_b, from_b = out[station_row[b]], back[station_row[b]]
+            if to_b == UNREACHABLE or from_b == UNREACHABLE:
+                continue
+            raw = cargo_value(station, False)
+            add([(station, name, "sell")], to_b + from_b, raw)
+
+            refined = cargo_value(station, True)
+            if refined > raw:
+                if has_refinery:
+                    add([(station, name, "refine"), (station, name, "sell")], to_b + from_b, refined)
+                    continue
+                row_b = station_row[b]
+                best = None
+                for r in refineries:
+                    detour = out[station_row[r]] + rows[station_row[r]][row_b]
+                    if best is None or detour < best[0]:
+                        best = (detour, r)
+                if best is not None and best[0] < UNREACHABLE:
+                    r_station, r_name, _, _ = self.stations[best[1]]
+                    add([(r_station, r_name, "refine"), (station, name, "sell")], best[0] + from_b, refined)
+
+        # A loop is only worth flying if it beats selling (or refining) without leaving
+        baseline = max((plan["profit"] for plan in plans if plan["jumps"] == 0), default=0)
+        trips = []
+        for plan in plans:
+            gain = plan["profit"] - baseline
+            if plan["jumps"] and gain > 0:
+                plan["gain"] = gain
+                plan["gain_per_jump"] = gain / plan["jumps"]
+                trips.append(plan)
+        trips.sort(key=lambda plan: (-plan["gain_per_jump"], plan["jumps"]))
+        return trips[:limit]
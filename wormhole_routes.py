@@ -0,0 +1,201 @@
+"""
+Routing over stargates and the player's known wormholes.
+
+The gate network never changes, but wormholes the player has scanned are
+shortcuts that last until timestamp + duration. WormholeRouter keeps them as
+temporary directed edges (from the system the scanned end is in to its
+destination) next to the gate connections, with an expiry heap so edges
+disappear on time.
+
+Routes come from cached breadth-first trees (distance and parent of every
+reachable system) for the last few start systems. Adding or removing an edge
+repairs the cached trees instead of discarding them: an added edge only
+relaxes the systems it brings closer, and a removed edge only recomputes the
+part of a tree that was reached through it.
+"""
+import heapq
+from collections import OrderedDict, deque
+from time import time
+
+# Number of start systems whose route trees are kept
+CACHED_TREES = 8
+
+
+def known_wormholes(anomalies, now=None):
+    """Wormholes the player has scanned and that are still open
+
+    Args:
+        anomalies: The save's anomaly map ({system: [anomaly, ...]})
+
+    Returns:
+        dict: {(wormhole_id, system): (system, destination_system, expires_at)}
+    """
+    if now is None:
+        now = time()
+    edges = {}
+    for system, system_anomalies in anomalies.items():
+        for anomaly in system_anomalies:
+            if anomaly.get("type") != "WH" or not anomaly.get("wormhole_scanned"):
+                continue
+            destination = anomaly.get("destination_system")
+            expires_at = anomaly.get("timestamp", now) + anomaly.get("duration", 48 * 3600)
+            if destination and expires_at > now:
+                # Both ends share the id, so each scanned end is its own edge
+                edges[(anomaly.get("wormhole_id"), system)] = (system, destination, expires_at)
+    return edges
+
+
+class WormholeRouter:
+    """Shortest routes (in jumps) over gates plus temporary wormhole edges
+
+    Args:
+        systems: The system_data.json dict ({name: {"Connections": [...]}})
+    """
+
+    def __init__(self, systems):
+        self._gates = {name: set(info.get("Connections", [])) for name, info in systems.items()}
+        self._out = {name: list(dict.fromkeys(info.get("Connections", []))) for name, info in systems.items()}
+        self._in = {name: [] for name in systems}
+        for name, neighbors in self._out.items():
+            for neighbor in neighbors:
+                self._in.setdefault(neighbor, []).append(name)
+        self._edges = {}
+        self._expiry = []
+        self._trees = OrderedDict()
+        self.tree_builds = 0
+
+    def _neighbors(self, system):
+        return self._out.get(system, ())
+
+    def _sources(self, system):
+        return self._in.get(system, ())
+
+    def _build(self, start):
+        """Breadth-first tree from start: ({system: jumps}, {system: previous system})"""
+        self.tree_builds += 1
+        dist = {start: 0}
+        parent = {start: None}
+        queue = deque([start])
+        while queue:
+            current = queue.popleft()
+            jumps = dist[current] + 1
+            for neighbor in self._neighbors(current):
+                if neighbor not in dist:
+                    dist[neighbor] = jumps
+                    parent[neighbor] = current
+                    queue.append(neighbor)
+        return dist, parent
+
+    def _tree(self, start):
+        tree = self._trees.get(start)
+        if tree is None:
+            tree = self._trees[start] = self._build(start)
+            if len(self._trees) > CACHED_TREES:
+                self._trees.popitem(last=False)
+        else:
+            self._trees.move_to_end(start)
+        return tree
+
+    def add_edge(self, key, system, destination, expires_at):
+        """Add a wormhole edge and relax the cached trees it shortens"""
+        if key in self._edges:
+            return
+        self._edges[key] = (system, destination, expires_at)
+        self._out.setdefault(system, []).append(destination)
+        self._in.setdefault(destination, []).append(system)
+        heapq.heappush(self._expiry, (expires_at, key))
+
+        for dist, parent in self._trees.values():
+            if system not in dist or dist[system] + 1 >= dist.get(destination, float("inf")):
+                continue
+            dist[destination] = dist[system] + 1
+            parent[destination] = system
+            queue = deque([destination])
+            while queue:
+                current = queue.popleft()
+                jumps = dist[current] + 1
+                for neighbor in self._neighbors(current):
+                    if jumps < dist.get(neighbor, float("inf")):
+                        dist[neighbor] = jumps
+                        parent[neighbor] = current
+                        queue.append(neighbor)
+
+    def remove_edge(self, key):
+        """Remove a wormhole edge and repair the cached trees that used it"""
+        edge = self._edges.pop(key, None)
+        if edge is None:
+            return
+        system, destination, _ = edge
+        self._out[system].remove(destination)
+        self._in[destination].remove(system)
+        if destination in self._out[system]:
+            # Another edge (a gate or wormhole) still joins the same systems
+            return
+
+        for dist, parent in self._trees.values():
+            if parent.get(destination) != system:
+                continue
+            # Everything reached through the removed edge loses its distance...
+            affected = {destination}
+            queue = deque([destination])
+            while queue:
+                current = queue.popleft()
+                for neighbor in self._neighbors(current):
+                    if neighbor not in affected and parent.get(neighbor) == current:
+                        affected.add(neighbor)
+                        queue.append(neighbor)
+            for node in affected:
+                del dist[node]
+                del parent[node]
+
+            # ...then is reached again from the rest of the tree, closest first
+            frontier = []
+            for node in affected:
+                for source in self._sources(node):
+                    if source in dist:
+                        heapq.heappush(frontier, (dist[source] + 1, node, source))
+            while frontier:
+                jumps, node, source = heapq.heappop(frontier)
+                if node in dist:
+                    continue
+                dist[node] = jumps
+                parent[node] = source
+                for neighbor in self._neighbors(node):
+                    if neighbor in affected and neighbor not in dist:
+                        heapq.heappush(frontier, (jumps + 1, neighbor, node))
+
+    def expire(self, now=None):
+        """Remove wormhole edges that have closed by now"""
+        if now is None:
+            now = time()
+        while self._expiry and self._expiry[0][0] <= now:
+            expires_at, key = heapq.heappop(self._expiry)
+            edge = self._edges.get(key)
+            if edge is not None and edge[2] == expires_at:
+                self.remove_edge(key)
+
+    def sync(self, wormholes):
+        """Make the wormhole edges match known_wormholes(), changing only the difference"""
+        for key in [key for key in self._edges if key not in wormholes]:
+            self.remove_edge(key)
+        for key, (system, destination, expires_at) in wormholes.items():
+            if key not in self._edges:
+                self.add_edge(key, system, destination, expires_at)
+
+    def is_wormhole_jump(self, system, destination):
+        """True if the jump from system to destination needs a wormhole (no gate joins them)"""
+        return destination not in self._gates.get(system, ())
+
+    def route(self, start, end, now=None):
+        """Shortest route from start to end (list of systems), or None if there is none"""
+        self.expire(now)
+        if start == end:
+            return [start]
+        dist, parent = self._tree(start)
+        if end not in dist:
+            return None
+        route = [end]
+        while route[-1] != start:
+            route.append(parent[route[-1]])
+        route.reverse()
+        return route